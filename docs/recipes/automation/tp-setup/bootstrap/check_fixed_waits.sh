@@ -0,0 +1,22 @@
+#!/bin/bash
+#
+# Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+#
+
+# Fail if a page object, case or e2e test uses a fixed page.wait_for_timeout() sleep.
+# Use the condition based waits in utils/page_wait.py (PageWait.visible, PageWait.network_quiet, ...) instead.
+# utils/ is not checked, it holds the wait primitives.
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+cd "$SCRIPT_DIR" || { echo "❌ Failed to change to bootstrap directory."; exit 1; }
+
+# commented out lines are skipped
+matches=$(grep -rn --include="*.py" "wait_for_timeout(" page_object case e2e page_*.py | grep -v -E "^[^:]+:[0-9]+:[[:space:]]*#")
+
+if [ -n "$matches" ]; then
+  echo "❌ Fixed waits found, replace them with PageWait condition based waits:"
+  echo "$matches"
+  exit 1
+fi
+
+echo "✅ No fixed waits found."
@@ -8,6 +8,7 @@ from page_object.po_o11y import PageObjectO11y
 
 import pytest
 from utils.helper import Helper
+from utils.page_wait import PageWait
 
 # TODO: this code should be moved when feature is released.
 def pytest_collection_modifyitems(config, items):
@@ -72,6 +73,6 @@ def add_custom_card(setup_refresh_o11y):
         po_o11y.add_widget(level1_menu, level2_menu, middle_menu, data_plane_type)
         if is_click_filter:
             po_o11y.click_widget_card_button(middle_menu, "Filters")
-        page.wait_for_timeout(1000)
+        PageWait.network_quiet(page, 1)
         return page, po_o11y
     return _add_custom_card
@@ -12,7 +12,6 @@ def test_widget_action_buttons_visibility(setup_refresh_o11y):
     expect(page.locator(".dashboard-actions-row button", has_text='Add Card')).to_be_visible()
     expect(page.locator(".dashboard-actions-row button.test-reset-layout")).to_be_visible()
     page.locator(".dashboard-actions-row button.test-reset-layout").click()
-    page.wait_for_timeout(500)
     expect(page.locator(".dashboard-actions-row .p-menuitem-link span", has_text='Save Snapshot')).to_be_visible()
     expect(page.locator(".dashboard-actions-row .p-menuitem-link span", has_text='Revert to Snapshot')).to_be_visible()
     expect(page.locator(".dashboard-actions-row .p-menuitem-link span", has_text='Reset Layout')).to_be_visible()
@@ -10,6 +10,7 @@ import urllib.request
 import urllib.parse
 import urllib.error
 import logging
+import time
 from http.client import IncompleteRead
 from typing import Dict, Any, Optional
 
@@ -18,6 +19,34 @@ from .server_lifecycle import ensure_server_ready
 
 logger = logging.getLogger('tibco-platform-provisioner-executor')
 
+AUTOMATION_SERVER_URL = "https://automation.localhost.dataplanes.pro"
+# /run-gui-script streams '<pre>\n' + the job log + '</pre>\n'
+JOB_STREAM_PREFIX = b"<pre>\n"
+
+def resume_job_log(job_id: str, offset: int, max_retries: int = 3) -> bytes:
+    """Read the rest of a job log from the bootstrap server, from byte offset until the job is finished.
+
+    The job keeps running on the server when the /run-gui-script stream is lost, so it is not started again.
+    """
+    data = b""
+    for attempt in range(1, max_retries + 1):
+        log_url = f"{AUTOMATION_SERVER_URL}/jobs/{job_id}/log?offset={offset + len(data)}&follow=true"
+        logger.info("Resuming job %s log from offset %d (attempt %d/%d)", job_id, offset + len(data), attempt, max_retries)
+        try:
+            with urllib.request.urlopen(log_url, timeout=1800) as response:
+                while True:
+                    chunk = response.read(8192)
+                    if not chunk:
+                        return data
+                    data += chunk
+        except IncompleteRead as e:
+            data += e.partial
+            logger.warning("IncompleteRead while resuming job %s log: %s", job_id, str(e))
+        except (urllib.error.URLError, ConnectionError) as e:
+            logger.warning("Failed to resume job %s log: %s", job_id, str(e))
+        time.sleep(2)
+    return data
+
 async def run_automation_task(case: str, params: Optional[Dict[str, Any]] = None) -> str:
     """Run an automation task by making an API call to the bootstrap server.
 
@@ -65,7 +94,7 @@ async def run_automation_task(case: str, params: Optional[Dict[str, Any]] = None
     query_params = urllib.parse.urlencode(request_params)
 
     # Local flask server URL (using port 3120 as seen in server.py)
-    flask_url = f"https://automation.localhost.dataplanes.pro/run-gui-script?{query_params}"
+    flask_url = f"{AUTOMATION_SERVER_URL}/run-gui-script?{query_params}"
 
     logger.info("Running automation task: %s", case)
     logger.info("API URL: %s", flask_url)
@@ -108,6 +137,10 @@ async def run_automation_task(case: str, params: Optional[Dict[str, Any]] = None
                         response_data += partial_data
                     else:
                         response_data = partial_data
+                    # the job is still running on the server, continue from its log instead of running it again
+                    job_id = response.headers.get("one_click_job_id")
+                    if job_id and response_data.startswith(JOB_STREAM_PREFIX):
+                        response_data += resume_job_log(job_id, len(response_data) - len(JOB_STREAM_PREFIX))
                     output = response_data.decode('utf-8', errors='replace')
                     
                 except UnicodeDecodeError as e:
@@ -144,7 +177,6 @@ async def run_automation_task(case: str, params: Optional[Dict[str, Any]] = None
                 return f"Error: {error_msg} after {max_retries} attempts"
             else:
                 logger.info("Retrying request in 2 seconds...")
-                import time
                 time.sleep(2)  # Wait before retry
                 continue
                 
@@ -2,6 +2,7 @@
 
 from pathlib import Path
 from utils.util import Util
+from utils.browser_session import BrowserSessionManager
 from utils.env import ENV
 from page_object.po_user_management import PageObjectUserManagement
 from page_object.po_auth import PageObjectAuth
@@ -13,6 +14,62 @@ from page_object.po_dp_flogo import PageObjectDataPlaneFlogo
 from page_object.po_dp_pulsar import PageObjectDataPlanePulsar
 from page_object.po_dp_tibcohub import PageObjectDataPlaneTibcoHub
 
+def provision_flogo(page):
+    # for provision Flogo capability, connector, app, and start app
+    po_dp_flogo = PageObjectDataPlaneFlogo(page)
+    po_dp_flogo.goto_left_navbar_dataplane()
+    po_dp_flogo.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
+
+    po_dp_flogo.flogo_provision_capability(ENV.TP_AUTO_K8S_DP_NAME)
+    po_dp_flogo.flogo_provision_connector(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
+    po_dp_flogo.flogo_app_build_and_deploy(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_FILE_NAME, ENV.FLOGO_APP_NAME)
+    po_dp_flogo.flogo_app_deploy(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
+
+    po_dp_flogo.flogo_app_config(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
+    if ENV.TP_AUTO_START_FLOGO_APP:
+        po_dp_flogo.flogo_app_start(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
+        po_dp_flogo.flogo_app_test_endpoint(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
+
+def provision_bwce(page):
+    # for provision BWCE or BW5CE capability
+    # default capability is bwce, if TP_AUTO_IS_PROVISION_BW5CE is set, then use bw5ce
+    capability = "bw5ce" if ENV.TP_AUTO_IS_PROVISION_BW5CE else "bwce"
+
+    po_dp_bwce = PageObjectDataPlaneBWCE(page, capability)
+    po_dp_bwce.goto_left_navbar_dataplane()
+    po_dp_bwce.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
+
+    po_dp_bwce.bwce_provision_capability(ENV.TP_AUTO_K8S_DP_NAME)
+    po_dp_bwce.bwce_provision_connector(ENV.TP_AUTO_K8S_DP_NAME)
+    po_dp_bwce.bwce_app_build_and_deploy(ENV.TP_AUTO_K8S_DP_NAME)
+    po_dp_bwce.bwce_app_deploy(ENV.TP_AUTO_K8S_DP_NAME)
+
+    po_dp_bwce.bwce_app_config(ENV.TP_AUTO_K8S_DP_NAME)
+    if ENV.TP_AUTO_START_BWCE_APP or ENV.TP_AUTO_START_BW5CE_APP:
+        po_dp_bwce.bwce_app_start(ENV.TP_AUTO_K8S_DP_NAME)
+        po_dp_bwce.bwce_app_test_endpoint(ENV.TP_AUTO_K8S_DP_NAME)
+
+def provision_ems(page):
+    po_dp_ems = PageObjectDataPlaneEMS(page)
+    po_dp_ems.goto_left_navbar_dataplane()
+    po_dp_ems.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
+
+    po_dp_ems.ems_provision_capability(ENV.TP_AUTO_K8S_DP_NAME, ENV.TP_AUTO_EMS_CAPABILITY_SERVER_NAME)
+
+def provision_pulsar(page):
+    po_dp_pulsar = PageObjectDataPlanePulsar(page)
+    po_dp_pulsar.goto_left_navbar_dataplane()
+    po_dp_pulsar.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
+
+    po_dp_pulsar.pulsar_provision_capability(ENV.TP_AUTO_K8S_DP_NAME, ENV.TP_AUTO_PULSAR_CAPABILITY_SERVER_NAME)
+
+def provision_tibcohub(page):
+    po_dp_tibcohub = PageObjectDataPlaneTibcoHub(page)
+    po_dp_tibcohub.goto_left_navbar_dataplane()
+    po_dp_tibcohub.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
+
+    po_dp_tibcohub.tibcohub_provision_capability(ENV.TP_AUTO_K8S_DP_NAME, ENV.TP_AUTO_TIBCOHUB_CAPABILITY_HUB_NAME)
+
 if __name__ == "__main__":
     ENV.pre_check()
 
@@ -21,6 +78,7 @@ if __name__ == "__main__":
         po_auth = PageObjectAuth(page)
         po_dp = PageObjectDataPlane(page)
         po_dp_config = PageObjectDataPlaneConfiguration(page)
+        Util.start_step("login")
         po_auth.login()
         po_auth.login_check()
 
@@ -28,11 +86,13 @@ if __name__ == "__main__":
         po_user_management.set_user_permission()
 
         # config global dataplane
+        Util.start_step("global-dataplane-o11y")
         po_dp_config.o11y_config_dataplane_resource(ENV.TP_AUTO_DP_NAME_GLOBAL)
         po_dp_config.o11y_config_activation(ENV.TP_AUTO_DP_NAME_GLOBAL)
 
         if ENV.TP_AUTO_IS_CREATE_DP:
             # for create dataplane and config dataplane resources
+            Util.start_step("create-dataplane")
             po_dp.goto_left_navbar_dataplane()
             po_dp.k8s_create_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
             po_dp.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
@@ -67,65 +127,30 @@ if __name__ == "__main__":
             po_dp_config.o11y_config_switch_to_global(ENV.TP_AUTO_K8S_DP_NAME)
             po_dp_config.o11y_config_activation(ENV.TP_AUTO_K8S_DP_NAME)
 
-            # for provision Flogo capability, connector, app, and start app
+            # capabilities are independent, provision them in parallel browser sessions, each session logs in with the saved login state
+            capability_tasks = {}
             if ENV.TP_AUTO_IS_PROVISION_FLOGO:
-                po_dp_flogo = PageObjectDataPlaneFlogo(page)
-                po_dp_flogo.goto_left_navbar_dataplane()
-                po_dp_flogo.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
-
-                po_dp_flogo.flogo_provision_capability(ENV.TP_AUTO_K8S_DP_NAME)
-                po_dp_flogo.flogo_provision_connector(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
-                po_dp_flogo.flogo_app_build_and_deploy(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_FILE_NAME, ENV.FLOGO_APP_NAME)
-                po_dp_flogo.flogo_app_deploy(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
-
-                po_dp_flogo.flogo_app_config(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
-                if ENV.TP_AUTO_START_FLOGO_APP:
-                    po_dp_flogo.flogo_app_start(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
-                    po_dp_flogo.flogo_app_test_endpoint(ENV.TP_AUTO_K8S_DP_NAME, ENV.FLOGO_APP_NAME)
-
-            # for provision BWCE or BW5CE capability
+                capability_tasks["flogo"] = provision_flogo
             if ENV.TP_AUTO_IS_PROVISION_BWCE or ENV.TP_AUTO_IS_PROVISION_BW5CE:
-                # default capability is bwce, if TP_AUTO_IS_PROVISION_BW5CE is set, then use bw5ce
-                capability = "bw5ce" if ENV.TP_AUTO_IS_PROVISION_BW5CE else "bwce"
-
-                po_dp_bwce = PageObjectDataPlaneBWCE(page, capability)
-                po_dp_bwce.goto_left_navbar_dataplane()
-                po_dp_bwce.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
-
-                po_dp_bwce.bwce_provision_capability(ENV.TP_AUTO_K8S_DP_NAME)
-                po_dp_bwce.bwce_provision_connector(ENV.TP_AUTO_K8S_DP_NAME)
-                po_dp_bwce.bwce_app_build_and_deploy(ENV.TP_AUTO_K8S_DP_NAME)
-                po_dp_bwce.bwce_app_deploy(ENV.TP_AUTO_K8S_DP_NAME)
-
-                po_dp_bwce.bwce_app_config(ENV.TP_AUTO_K8S_DP_NAME)
-                if ENV.TP_AUTO_START_BWCE_APP or ENV.TP_AUTO_START_BW5CE_APP:
-                    po_dp_bwce.bwce_app_start(ENV.TP_AUTO_K8S_DP_NAME)
-                    po_dp_bwce.bwce_app_test_endpoint(ENV.TP_AUTO_K8S_DP_NAME)
-
-            # for provision EMS capability
+                capability_tasks["bw5ce" if ENV.TP_AUTO_IS_PROVISION_BW5CE else "bwce"] = provision_bwce
             if ENV.TP_AUTO_IS_PROVISION_EMS:
-                po_dp_ems = PageObjectDataPlaneEMS(page)
-                po_dp_ems.goto_left_navbar_dataplane()
-                po_dp_ems.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
-
-                po_dp_ems.ems_provision_capability(ENV.TP_AUTO_K8S_DP_NAME, ENV.TP_AUTO_EMS_CAPABILITY_SERVER_NAME)
-
-            # for provision Pulsar capability
+                capability_tasks["ems"] = provision_ems
             if ENV.TP_AUTO_IS_PROVISION_PULSAR:
-                po_dp_pulsar = PageObjectDataPlanePulsar(page)
-                po_dp_pulsar.goto_left_navbar_dataplane()
-                po_dp_pulsar.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
-
-                po_dp_pulsar.pulsar_provision_capability(ENV.TP_AUTO_K8S_DP_NAME, ENV.TP_AUTO_PULSAR_CAPABILITY_SERVER_NAME)
-
-            # for provision TibcoHub capability
+                capability_tasks["pulsar"] = provision_pulsar
             if ENV.TP_AUTO_IS_PROVISION_TIBCOHUB:
-                po_dp_tibcohub = PageObjectDataPlaneTibcoHub(page)
-                po_dp_tibcohub.goto_left_navbar_dataplane()
-                po_dp_tibcohub.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
-
-                po_dp_tibcohub.tibcohub_provision_capability(ENV.TP_AUTO_K8S_DP_NAME, ENV.TP_AUTO_TIBCOHUB_CAPABILITY_HUB_NAME)
-
+                capability_tasks["tibcohub"] = provision_tibcohub
+
+            if ENV.TP_AUTO_MAX_BROWSER_SESSIONS > 1 and len(capability_tasks) > 1:
+                Util.start_step("provision-capabilities")
+                failed_capabilities = BrowserSessionManager(setup=lambda session_page: PageObjectAuth(session_page).login()).run_all(capability_tasks)
+                if failed_capabilities:
+                    Util.exit_error(f"Provision capabilities {failed_capabilities} failed.", page, "provision_capabilities.png")
+            else:
+                for capability_name, provision_capability in capability_tasks.items():
+                    Util.start_step(capability_name)
+                    provision_capability(page)
+
+        Util.start_step("finish")
         po_dp.goto_left_navbar_dataplane()
         po_dp.goto_dataplane(ENV.TP_AUTO_K8S_DP_NAME)
         Util.screenshot_page(page, f"success-{ENV.TP_AUTO_K8S_DP_NAME}.png")
@@ -1,20 +1,27 @@
-import sys
+import contextlib
+import io
 from utils.env import ENV
 from utils.color_logger import ColorLogger
 from utils.util import Util
+from utils.report import ReportYaml
+from utils.report_renderer import ReportRenderer
 
 if __name__ == "__main__":
-    Util.print_cp_info()
-    Util.print_env_info()
+    # Collect the output once, then print it and save it to file, instead of querying the cluster twice
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        Util.print_cp_info()
+        Util.print_env_info()
+    print(output.getvalue(), end="")
 
     output_file = f"{ENV.TP_AUTO_REPORT_PATH}/{ENV.TP_AUTO_REPORT_TXT_FILE}"
     with open(output_file, "w", encoding="utf-8") as f:
-        # Redirect stdout to file
-        sys.stdout = f
-        Util.print_cp_info()  # This output goes to the file
-        Util.print_env_info()  # This output goes to the file
+        f.write(output.getvalue())
 
-        # Restore stdout to terminal
-        sys.stdout = sys.__stdout__
+    report_renderer = ReportRenderer(ReportYaml.get_report())
+    with open(f"{ENV.TP_AUTO_REPORT_PATH}/{ENV.TP_AUTO_REPORT_JSON_FILE}", "w", encoding="utf-8") as f:
+        f.write(report_renderer.to_json())
+    with open(f"{ENV.TP_AUTO_REPORT_PATH}/{ENV.TP_AUTO_REPORT_HTML_FILE}", "w", encoding="utf-8") as f:
+        f.write(report_renderer.to_html())
 
     ColorLogger.success(f"Final report information saved to file: {output_file}")
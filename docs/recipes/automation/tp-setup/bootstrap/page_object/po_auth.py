@@ -1,6 +1,8 @@
 #  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
 
+from utils.auth_state import AuthState
 from utils.color_logger import ColorLogger
+from utils.page_wait import PageWait
 from utils.util import Util
 from utils.env import ENV
 from utils.report import ReportYaml
@@ -44,7 +46,7 @@ class PageObjectAuth:
             Util.exit_error(f"Active Email for {email} is not found.", self.page, "active_user_in_mail.png")
 
         email_selector.click()
-        self.page.wait_for_timeout(1000)
+        PageWait.network_quiet(self.page, 1)
         iframe = self.page.frame_locator(".main-container iframe.preview-iframe").nth(0)
         iframe.locator("a.btn-activate", has_text="Sign in").wait_for(state="visible")
 
@@ -56,7 +58,7 @@ class PageObjectAuth:
         print("New window detected and captured.")
 
         new_page.wait_for_load_state()
-        new_page.wait_for_timeout(5000)
+        PageWait.visible(new_page.locator("#emailNameInput"), 5)
         is_email_input_visible = Util.refresh_until_success(new_page,
                                                             new_page.locator("#emailNameInput"),
                                                             new_page.locator("#emailNameInput"),
@@ -89,7 +91,7 @@ class PageObjectAuth:
 
     def reset_admin_password(self, new_page):
         ColorLogger.info("Reset admin password in new page...")
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(new_page.locator(".title", has_text="Reset Password"), 1)
         if Util.check_dom_visibility(new_page, new_page.locator(".title", has_text="Reset Password"), 3, 6):
             new_page.fill("#passwordInput", ENV.CP_ADMIN_PASSWORD)
             new_page.fill("#confirmPasswordInput", ENV.CP_ADMIN_PASSWORD)
@@ -105,10 +107,10 @@ class PageObjectAuth:
         admin_login_btn_text = "Sign in with Default IdP"
         Util.click_button_until_enabled(self.page, self.page.locator("#ta-sign-in-button", has_text=admin_login_btn_text))
         print(f"Clicked '{admin_login_btn_text}' button")
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(self.page.locator(".forgot-password"), 1)
         Util.click_button_until_enabled(self.page, self.page.locator(".forgot-password"))
         print(f"Clicked 'Forgot password?' link button")
-        self.page.wait_for_timeout(2000)
+        PageWait.visible(self.page.locator(".reset-link-title", has_text="Forgot your password?"), 2)
         self.page.locator(".reset-link-title", has_text="Forgot your password?").wait_for(state="visible")
         self.page.fill("#emailNameInput", ENV.CP_ADMIN_EMAIL)
         request_reset_link_btn_text = "Request Reset Link"
@@ -128,7 +130,7 @@ class PageObjectAuth:
         reset_password_email_selector = self.page.locator(".email-list .email-item-link", has_text=reset_password_email_title).nth(0)
         if reset_password_email_selector.is_visible():
             reset_password_email_selector.click()
-            self.page.wait_for_timeout(1000)
+            PageWait.network_quiet(self.page, 1)
 
             iframe = self.page.frame_locator(".main-container iframe.preview-iframe").nth(0)
             iframe.locator("a.btn-activate", has_text="Reset password").wait_for(state="visible")
@@ -169,7 +171,8 @@ class PageObjectAuth:
             ColorLogger.warning(f"Admin user {ENV.CP_ADMIN_EMAIL}, {ENV.CP_ADMIN_PASSWORD} login failed.")
             return False
 
-        self.page.wait_for_timeout(1000)
+        # wait until the login request is done, then check if the sign in button is shown again
+        PageWait.network_quiet(self.page, 1)
         # Note: if the "Sign in with Default IdP" button is still visible, click it again
         # It is a bug when admin login path is "/admin/login"
         # If login path is "/admin", it will not show the "Sign in with Default IdP" button again
@@ -193,7 +196,7 @@ class PageObjectAuth:
         self.page.locator(".pl-dropdown-menu .pl-dropdown-menu__link", has_text="Sign Out").click()
         self.page.locator(".pl-modal__container .pl-modal__footer button", has_text="Sign Out").click()
         print(f"Clicked Sign Out button, Admin user {ENV.CP_ADMIN_EMAIL} logout.")
-        self.page.wait_for_timeout(1000)
+        PageWait.hidden(self.page.locator(".pl-modal__container .pl-modal__footer button", has_text="Sign Out"), 1)
 
     def admin_provision_user(self, email, host_prefix):
         ColorLogger.info(f"Provision user {email} with Host prefix: {host_prefix}...")
@@ -201,7 +204,7 @@ class PageObjectAuth:
 
         self.page.locator("#nav-bar-menu-list-subscriptions", has_text="Subscriptions").click()
         print("Clicked 'Subscriptions' left sidebar menu")
-        self.page.wait_for_timeout(200)
+        PageWait.visible(self.page.locator(".subscription-card-header .name", has_text=host_prefix), 0.2)
         if self.page.locator(".subscription-card-header .name", has_text=host_prefix).is_visible():
             ColorLogger.success(f"Subscription for {email} with Host prefix: {host_prefix} is already created.")
         else:
@@ -234,7 +237,7 @@ class PageObjectAuth:
             # step 3: Preview
             self.page.locator(".footer button", has_text="Ok").wait_for(state="visible")
             self.page.locator(".footer button", has_text="Ok").click()
-            self.page.wait_for_timeout(2000)
+            PageWait.visible(self.page.locator(".provision-success__subtext"), 2)
             print("Clicked 'Ok' button")
             if self.page.locator(".provision-success__subtext", has_text="host_prefix has been used in another account").is_visible():
                 print("Error: host_prefix has been used in another account")
@@ -257,7 +260,7 @@ class PageObjectAuth:
                 return False
 
             print("Wait to see Welcome page...")
-            self.page.wait_for_timeout(500)
+            PageWait.visible(self.page.locator(".title", has_text="Welcome"), 0.5)
             if self.page.locator(".title", has_text="Welcome").is_visible():
                 self.logout()
                 ColorLogger.success(f"Host prefix {host_prefix} is already exist.")
@@ -277,7 +280,7 @@ class PageObjectAuth:
                 return False
 
             print("Wait to see Admin Welcome page...")
-            self.page.wait_for_timeout(500)
+            PageWait.visible(self.page.locator(".pcp-page-title", has_text="Welcome"), 0.5)
             if self.page.locator(".pcp-page-title", has_text="Welcome").is_visible():
                 self.logout_admin_user()
                 return True
@@ -289,6 +292,9 @@ class PageObjectAuth:
             return False
 
     def login(self):
+        if self.login_with_saved_state():
+            return True
+
         ColorLogger.info(f"Navigating to login page {ENV.TP_AUTO_LOGIN_URL}...")
         self.page.goto(ENV.TP_AUTO_LOGIN_URL)
         print("Wait for login page is visible...")
@@ -315,11 +321,34 @@ class PageObjectAuth:
             print(f"User {ENV.DP_USER_EMAIL} profile is displayed...")
             ReportYaml.set(".ENV.REPORT_AUTO_ACTIVE_USER", True)
             ColorLogger.success("Login successful!")
-            self.page.wait_for_timeout(1000)
+            PageWait.network_quiet(self.page, 1)
+            AuthState.save(self.page.context, ENV.TP_AUTO_LOGIN_URL, ENV.DP_USER_EMAIL)
         else:
             ColorLogger.warning(f"Login may successful, but user profile is not visible.")
         return True
 
+    def login_with_saved_state(self):
+        state = AuthState.load(ENV.TP_AUTO_LOGIN_URL, ENV.DP_USER_EMAIL)
+        if not state:
+            return False
+
+        ColorLogger.info(f"Restoring saved login state of user {ENV.DP_USER_EMAIL}...")
+        AuthState.restore(self.page.context, state)
+        # without login path, CP opens the home page for a valid session, and redirects to the login page for an expired one
+        home_url = ENV.TP_AUTO_LOGIN_URL.rsplit("/login", 1)[0]
+        self.page.goto(home_url)
+        user_profile = self.page.locator("#user-profile")
+        PageWait.visible(user_profile.or_(self.page.locator("#ta-sign-in-button")), 30)
+        if user_profile.is_visible():
+            ColorLogger.success(f"User {ENV.DP_USER_EMAIL} login with saved state successful!")
+            PageWait.network_quiet(self.page, 1)
+            return True
+
+        ColorLogger.warning(f"Saved login state of user {ENV.DP_USER_EMAIL} is expired, login again.")
+        AuthState.invalidate(ENV.TP_AUTO_LOGIN_URL, ENV.DP_USER_EMAIL)
+        self.page.context.clear_cookies()
+        return False
+
     def login_check(self):
         ColorLogger.info(f"Checking if user {ENV.DP_USER_EMAIL} is login...")
         try:
@@ -331,10 +360,17 @@ class PageObjectAuth:
             print(f"An error occurred while accessing {ENV.TP_AUTO_LOGIN_URL}: {e}")
             Util.exit_error(f"An error occurred while verify login in {ENV.TP_AUTO_LOGIN_URL}: {ENV.DP_USER_EMAIL}, {ENV.DP_USER_PASSWORD}", self.page, "login_check_e.png")
 
-    def logout(self):
+    def logout(self, keep_session=None):
+        keep_session = ENV.TP_AUTO_LOGIN_KEEP_SESSION if keep_session is None else keep_session
+        if keep_session and AuthState.load(ENV.TP_AUTO_LOGIN_URL, ENV.DP_USER_EMAIL):
+            # e.g. a chain of server jobs, the next case restores the saved login state instead of the login flow
+            ColorLogger.info(f"Keep session of user {ENV.DP_USER_EMAIL} for the next case, skip logout.")
+            return
+        # signing out ends the session on CP, the saved login state can not be restored any more
+        AuthState.invalidate(ENV.TP_AUTO_LOGIN_URL, ENV.DP_USER_EMAIL)
         ColorLogger.info(f"Logging out user {ENV.DP_USER_EMAIL}...")
         self.page.locator("#nav-bar-menu-list-signout").click()
         self.page.locator(".nav-bar-display-block #confirm-button", has_text="Sign Out").wait_for(state="visible")
         self.page.locator(".nav-bar-display-block #confirm-button", has_text="Sign Out").click()
         ColorLogger.success(f"Clicked Sign Out button, User {ENV.DP_USER_EMAIL} logout.")
-        self.page.wait_for_timeout(1000)
+        PageWait.hidden(self.page.locator("#user-profile"), 1)
@@ -1,6 +1,7 @@
 #  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
 
 from utils.color_logger import ColorLogger
+from utils.page_wait import PageWait
 from utils.util import Util
 from utils.helper import Helper
 from utils.env import ENV
@@ -17,13 +18,13 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
         self.page.locator("#ct-dp-config-link").wait_for(state="visible")
         self.page.locator("#ct-dp-config-link").click()
         print("Clicked 'BMDP configuration' button")
-        self.page.wait_for_timeout(500)
+        PageWait.network_quiet(self.page, 0.5)
 
     def goto_dataplane_config_sub_menu(self, sub_menu_name = ""):
         ColorLogger.info(f"Going to Data plane config -> '{sub_menu_name}' side menu")
         self.page.locator("#left-sub-menu .menu-item-text", has_text=sub_menu_name).click()
         print(f"Clicked '{sub_menu_name}' left side menu")
-        self.page.wait_for_timeout(500)
+        PageWait.network_quiet(self.page, 0.5)
 
     def goto_products(self, product_name):
         ColorLogger.info("Going to Products page...")
@@ -54,7 +55,7 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
             self.page.fill("#rvDaemon-input", ENV.TP_AUTO_K8S_BMDP_BW5_RVDM_RV_DAEMON)
             print(f"Filled RV Service: {ENV.TP_AUTO_K8S_BMDP_BW5_RVDM_RV_SERVICE}, RV Network: {ENV.TP_AUTO_K8S_BMDP_BW5_RVDM_RV_NETWORK}, RV Daemon: {ENV.TP_AUTO_K8S_BMDP_BW5_RVDM_RV_DAEMON}")
             self.page.locator(".pl-button.pl-button--primary", has_text="Add Domain").click()
-            self.page.wait_for_timeout(5000)
+            PageWait.visible(self.page.locator(".pl-notification__message"), 5)
             domain_banner = self.page.locator(".pl-notification__message").inner_text()
             if self.page.locator(".pl-notification__message", has_text="successfully").is_visible():
                 ColorLogger.success(domain_banner)
@@ -81,7 +82,7 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
             self.page.fill("#emsPassword-input", ENV.TP_AUTO_K8S_BMDP_BW5_EMS_PASSWORD)
             print(f"Filled EMS Server URL: {ENV.TP_AUTO_K8S_BMDP_BW5_EMS_SERVER_URL}, EMS User: {ENV.TP_AUTO_K8S_BMDP_BW5_EMS_USERNAME}, EMS Password: {ENV.TP_AUTO_K8S_BMDP_BW5_EMS_PASSWORD}")
             self.page.locator(".pl-button.pl-button--primary", has_text="Add Domain").click()
-            self.page.wait_for_timeout(5000)
+            PageWait.visible(self.page.locator(".pl-notification__message"), 5)
             domain_banner = self.page.locator(".pl-notification__message").inner_text()
             if self.page.locator(".pl-notification__message", has_text="successfully").is_visible():
                 ColorLogger.success(domain_banner)
@@ -95,7 +96,7 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
         ColorLogger.info(f"Checking domain status for '{domain_name}'")
         domain_row = self.page.locator("tr.pl-table__row", has=self.page.locator('td.pl-table__cell', has_text=domain_name))
         if domain_row.is_visible():
-            if Util.check_dom_visibility(self.page, domain_row.locator("td.pl-table__cell img[src*='/connected.svg']"), 10, max_retries):
+            if Util.wait_for_dom(self.page, domain_row.locator("td.pl-table__cell img[src*='/connected.svg']"), max_retries):
                 ColorLogger.success(f"Domain '{domain_name}' is connected.")
                 ReportYaml.set_capability(ENV.TP_AUTO_K8S_BMDP_NAME, capability)
                 ReportYaml.set_capability_info(ENV.TP_AUTO_K8S_BMDP_NAME, capability, domain_name, "Connected")
@@ -107,7 +108,7 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
 
     def check_bmdp_app_status_by_app_name(self, product_name, domain_name, app_name):
         ColorLogger.info(f"Checking {product_name} application - {app_name} status in '{domain_name}'")
-        self.page.wait_for_timeout(1000)
+        PageWait.network_quiet(self.page, 1)
         # check bw5 application status
         if product_name == "BW5":
             print("Checking if new domain card layout is available...")
@@ -168,7 +169,7 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
         ColorLogger.info(f"Checking BW6 application - {app_type} status")
         # hover over the app type icon to click it
         self.page.locator(f".bw6-icons .pl-tooltip__trigger", has=self.page.locator(f"img[alt='{app_type}']")).hover()
-        self.page.wait_for_timeout(500)
+        PageWait.network_quiet(self.page, 0.5)
         self.page.locator(f".bw6-icons .pl-tooltip__trigger", has=self.page.locator(f"img[alt='{app_type}']")).click()
         app_row = self.page.locator("tr.pl-table__row", has=self.page.locator('td.pl-table__cell', has_text=app_name))
         if Util.check_dom_visibility(self.page, app_row.locator("td.pl-table__cell img[src*='/running.svg']"), 2, 5):
@@ -201,7 +202,7 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
                     ColorLogger.success("BW6Agent connection is successful.")
                     self.page.locator("agent-config-modal button", has_text="Register").click()
                     print("Clicked 'Register' button")
-                    self.page.wait_for_timeout(3000)
+                    PageWait.visible(self.page.locator(".pl-notification__message"), 3)
                     if self.page.locator(".pl-notification__message", has_text="successfully").is_visible():
                         agent_banner = self.page.locator(".pl-notification__message").inner_text()
                         ColorLogger.success(agent_banner)
@@ -338,9 +339,8 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
             Util.exit_error(f"Data Plane '{dp_title}' Observability config load failed.", self.page, "o11y_config_dataplane_resource.png")
 
         print("Checking if 'Add new resource' button is exist...")
-        self.page.wait_for_timeout(2000)
-
         add_new_resource_button = self.o11y_get_new_resource(dp_name)
+        PageWait.visible(add_new_resource_button, 2)
         if not add_new_resource_button.is_visible():
             print("'Add new resource' button is not exist...")
             ColorLogger.success(f"Data plane '{dp_title}' Observability Resources is already configured.")
@@ -352,7 +352,7 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
 
         print("Waiting for O11y config o11y page is loaded")
         self.page.locator(".configuration").wait_for(state="visible")
-        self.page.wait_for_timeout(2000)
+        PageWait.network_quiet(self.page, 2)
         print("O11y config o11y page is loaded")
 
         # Step 1: Configure Log Server
@@ -367,8 +367,8 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
         if system_toggle.is_visible() and system_toggle.get_attribute("aria-checked") == "true":
             print("Metrics System Config is enabled")
             self.page.locator("label[for='metrics-toggle-system-config']").click()
-            print("Clicked 'Metrics System Config' toggle button, then wait for 1 second.")
-            self.page.wait_for_timeout(1000)
+            print("Clicked 'Metrics System Config' toggle button, then wait for it is disabled.")
+            PageWait.visible(self.page.locator("#metrics-toggle-system-config[aria-checked='false']"), 1)
 
         # Add or Select Metrics -> Query Service configurations
         menu_name = "Metrics"
@@ -391,8 +391,8 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
         if system_toggle.is_visible() and system_toggle.get_attribute("aria-checked") == "true":
             print("Traces System Config is enabled")
             self.page.locator("label[for='traces-toggle-system-config']").click()
-            print("Clicked 'Traces System Config' toggle button, then wait for 1 second.")
-            self.page.wait_for_timeout(1000)
+            print("Clicked 'Traces System Config' toggle button, then wait for it is disabled.")
+            PageWait.visible(self.page.locator("#traces-toggle-system-config[aria-checked='false']"), 1)
 
         # Add or Select Traces -> Query Service configurations
         menu_name = "Traces"
@@ -412,7 +412,7 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
             self.o11y_config_table_add_or_select_item(dp_name, menu_name, tab_name, "", "#add-traces-exporter-btn")
         self.page.locator("#save-observability").click()
         print(f"Data plane '{dp_title}' 'Configure Traces Server' Step 3 is configured.")
-        self.page.wait_for_timeout(1000)
+        PageWait.hidden(self.page.locator("#save-observability"), 1)
         if self.page.locator(".pl-notification--error").is_visible():
             Util.warning_screenshot(f"Data Plane '{dp_title}' Observability Resources configuration failed.", self.page, "o11y_config_dataplane_resource.png")
             self.page.locator("#cancel-observability-add-traces").click()
@@ -423,8 +423,8 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
 
         ColorLogger.success(f"Data plane '{dp_title}' Observability Resources is configured.")
         ReportYaml.set_dataplane_info(dp_name, "o11yConfig", True)
-        print(f"Wait 5 seconds for Data plane '{dp_title}' configuration page redirect.")
-        self.page.wait_for_timeout(15000)
+        print(f"Wait for Data plane '{dp_title}' configuration page redirect.")
+        PageWait.hidden(self.page.locator(".configuration"), 15)
 
     def o11y_config_table_add_or_select_item(self, dp_name, menu_name, tab_name, tab_sub_name, add_button_selector):
         ColorLogger.info("O11y start to add or select item...")
@@ -471,7 +471,8 @@ class PageObjectBMDPConfiguration(PageObjectDataPlane):
             self.o11y_fill_prometheus_or_elastic("ElasticSearch", ENV.TP_AUTO_ELASTIC_URL, ENV.TP_AUTO_ELASTIC_USER, ENV.TP_AUTO_ELASTIC_PASSWORD)
 
         self.page.locator("configuration-modal .pl-modal__footer-left button.pl-button--primary", has_text="Save").click()
-        self.page.wait_for_timeout(10000)
+        # the modal is closed when it is saved, an error notification is shown and the modal stays open when it fails
+        PageWait.hidden(self.page.locator("configuration-modal .pl-modal__footer-left button.pl-button--primary", has_text="Save"), 10)
         if self.page.locator(".pl-notification--error").is_visible():
             Util.exit_error(f"Add {name_input} for Data Plane '{dp_title}' Observability -> {menu_name} -> {tab_name} failed.", self.page, f"o11y_new_resource_fill_form-{name_input}.png")
 
@@ -2,6 +2,7 @@
 
 from page_object.po_global import PageObjectGlobal
 from utils.color_logger import ColorLogger
+from utils.page_wait import PageWait
 from utils.util import Util
 from utils.helper import Helper
 from utils.env import ENV
@@ -16,7 +17,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         self.page.locator(".nav-bar-pointer", has_text=item_name).wait_for(state="visible")
         self.page.locator(".nav-bar-pointer", has_text=item_name).click()
         print(f"Clicked left side menu '{item_name}'")
-        self.page.wait_for_timeout(500)
+        PageWait.network_quiet(self.page, 0.5)
 
     def goto_left_navbar_dataplane(self):
         self.goto_left_navbar("Data Planes")
@@ -26,8 +27,7 @@ class PageObjectDataPlane(PageObjectGlobal):
     def goto_global_dataplane(self):
         ColorLogger.info(f"Going to Global Data Plane...")
         self.page.click("#nav-bar-menu-list-dataPlanes")
-        # wait for 1 second
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(self.page.locator(".global-configuration button"), 1)
 
         self.page.locator(".global-configuration button").click()
         print("Clicked 'Global configuration' button")
@@ -37,7 +37,7 @@ class PageObjectDataPlane(PageObjectGlobal):
     def goto_dataplane(self, dp_name):
         ColorLogger.info(f"Going to k8s Data Plane '{dp_name}'...")
         self.page.click("#nav-bar-menu-list-dataPlanes")
-        self.page.wait_for_timeout(2000)
+        PageWait.visible(self.page.locator('.data-plane-name', has_text=dp_name), 2)
         is_dataplane_visible = Util.refresh_until_success(self.page,
                                                           self.page.locator('.data-plane-name', has_text=dp_name),
                                                           self.page.locator(".data-planes-content"),
@@ -46,7 +46,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         if is_dataplane_visible:
             self.page.locator('data-plane-card', has=self.page.locator('.data-plane-name', has_text=dp_name)).locator('button', has_text="Go to Data Plane").click()
             print("Clicked 'Go to Data Plane' button")
-            self.page.wait_for_timeout(2000)
+            PageWait.visible(self.page.locator('.domain-data-title', has_text=dp_name), 2)
             is_dataplane_detail_visible = Util.refresh_until_success(self.page,
                                                                      self.page.locator('.domain-data-title', has_text=dp_name),
                                                                      self.page.locator('.domain-data-title', has_text=dp_name),
@@ -54,7 +54,7 @@ class PageObjectDataPlane(PageObjectGlobal):
             if is_dataplane_detail_visible:
                 print(f"Navigated to Data Plane '{dp_name}' detail page")
                 ReportYaml.set_dataplane(dp_name)
-                self.page.wait_for_timeout(1000)
+                PageWait.network_quiet(self.page, 1)
             else:
                 Util.exit_error(f"DataPlane {dp_name} detail page is not load.", self.page, "goto_dataplane.png")
 
@@ -74,7 +74,7 @@ class PageObjectDataPlane(PageObjectGlobal):
             if not is_check_status or is_capability_success:
                 self.page.locator(f"capability-card #{card_id} .image-name").click()
                 print(f"Clicked '{capability}' capability")
-                self.page.wait_for_timeout(3000)
+                PageWait.visible(self.page.locator(capability_selector_path), 3)
                 if not is_check_status:
                     print(f"Ignore check '{capability}' capability status, get into '{capability}' capability page")
                 if is_capability_success:
@@ -86,7 +86,7 @@ class PageObjectDataPlane(PageObjectGlobal):
                                                                   f"{capability} capability detail page is loaded")
                 if is_capability_loaded:
                     print(f"Navigated to {capability} capability detail page")
-                    self.page.wait_for_timeout(1000)
+                    PageWait.network_quiet(self.page, 1)
                 else:
                     Util.exit_error(f"{capability} capability page is not loaded.", self.page, f"{card_id}_goto_capability.png")
             else:
@@ -106,7 +106,7 @@ class PageObjectDataPlane(PageObjectGlobal):
             print(f"Clicked app '{app_name}'")
             self.page.locator(app_selector_path, has_text=app_name).wait_for(state="visible")
             print(f"Navigated to app '{app_name}' detail page")
-            self.page.wait_for_timeout(500)
+            PageWait.network_quiet(self.page, 0.5)
         else:
             Util.exit_error(f"The app '{app_name}' is not deployed yet.", self.page, "goto_app_detail.png")
 
@@ -115,7 +115,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         try:
             print(f"Checking if '{capability}' is already provisioned...")
             card_id = capability.lower()
-            self.page.wait_for_timeout(3000)
+            PageWait.visible(self.page.locator(f"capability-card #{card_id}"), 3)
             if self.page.locator(f"capability-card #{card_id}").is_visible():
                 ColorLogger.success(f"'{capability}' is already provisioned.")
                 if capability_name == "":
@@ -139,7 +139,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         try:
             print(f"Checking if {capability} app '{app_name}' is already created...")
             self.page.locator("apps-list").wait_for(state="visible")
-            self.page.wait_for_timeout(3000)
+            PageWait.visible(self.page.locator("#app-list-table tr.pl-table__row td.app-name", has_text=app_name), 3)
             if self.page.locator("#app-list-table tr.pl-table__row td.app-name", has_text=app_name).is_visible():
                 ColorLogger.success(f"{capability} app '{app_name}' is already created.")
                 return True
@@ -155,7 +155,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         try:
             self.goto_dataplane(dp_name)
             print(f"Checking if {capability} app '{app_name}' is already running...")
-            self.page.wait_for_timeout(3000)
+            PageWait.visible(self.page.locator(f"#app-list-table tr.{capability.upper()}", has=self.page.locator("td.app-name", has_text=app_name)).locator("td", has_text="Running"), 3)
             if self.page.locator(f"#app-list-table tr.{capability.upper()}", has=self.page.locator("td.app-name", has_text=app_name)).locator("td", has_text="Running").is_visible():
                 ColorLogger.success(f"{capability} app '{app_name}' is already running.")
                 ReportYaml.set_capability_app_info(dp_name, capability, app_name, "status", "Running")
@@ -216,7 +216,7 @@ class PageObjectDataPlane(PageObjectGlobal):
             return
 
         ColorLogger.info(f"Creating k8s Data Plane '{dp_name}'...")
-        self.page.wait_for_timeout(2000)
+        PageWait.network_quiet(self.page, 2)
 
         if self.page.locator(".data-plane-name").count() > ENV.TP_AUTO_MAX_DATA_PLANE:
             Util.exit_error("Too many data planes, please delete some data planes first.", self.page, "k8s_create_dataplane.png")
@@ -280,7 +280,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         # step Preview (for 1.4 and above)
         if Util.check_dom_visibility(self.page, self.page.locator(".pl-secondarynav a.is-active", has_text="Preview"), 3, 9):
             print("Step 4: 'Preview' page is loaded")
-            self.page.wait_for_timeout(1000)
+            PageWait.visible(self.page.locator("#data-plane-preview-btn"), 1)
             if self.page.locator("#data-plane-preview-btn").is_visible():
                 self.page.click("#data-plane-preview-btn")
                 print("Clicked Next button, Finish step 4 Preview")
@@ -311,7 +311,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         self.page.locator('#confirm-button', has_text="Yes").click()
 
         # verify data plane is created in the list
-        self.page.wait_for_timeout(2000)
+        PageWait.hidden(self.page.locator('#confirm-button', has_text="Yes"), 2)
         print(f"Verifying Data Plane {dp_name} is created in the list")
         self.k8s_wait_tunnel_connected(dp_name)
 
@@ -321,7 +321,7 @@ class PageObjectDataPlane(PageObjectGlobal):
             return
 
         ColorLogger.info(f"Creating k8s Data Plane '{dp_name}'...")
-        self.page.wait_for_timeout(2000)
+        PageWait.network_quiet(self.page, 2)
 
         if self.page.locator(".data-plane-name").count() > ENV.TP_AUTO_MAX_DATA_PLANE:
             Util.exit_error("Too many data planes, please delete some data planes first.", self.page, "k8s_create_dataplane.png")
@@ -437,7 +437,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         # step 6 Preview (for 1.4 and above)
         if Util.check_dom_visibility(self.page, self.page.locator(".pl-secondarynav a.is-active", has_text="Preview"), 3, 9):
             print("'Preview' page is loaded")
-            self.page.wait_for_timeout(1000)
+            PageWait.visible(self.page.locator("#data-plane-preview-create-btn").or_(self.page.locator("#data-plane-config-prev-btn")), 1)
             if self.page.locator("#data-plane-preview-create-btn").is_visible():
                 self.page.click("#data-plane-preview-create-btn")
                 print("Clicked Next button, Finish Preview")
@@ -479,7 +479,7 @@ class PageObjectDataPlane(PageObjectGlobal):
         self.page.locator('#confirm-button', has_text="Yes").click()
 
         # verify data plane is created in the list
-        self.page.wait_for_timeout(2000)
+        PageWait.hidden(self.page.locator('#confirm-button', has_text="Yes"), 2)
         print(f"Verifying Data Plane {dp_name} is created in the list")
         self.k8s_wait_tunnel_connected(dp_name, False)
         self.k8s_wait_bmdp_ready(dp_name)
@@ -511,13 +511,14 @@ class PageObjectDataPlane(PageObjectGlobal):
 
         print(f"Run command for: {step_name}")
         Helper.run_shell_file(file_path)
-        print(f"Command for step: {step_name} is executed, wait for 3 seconds.")
-        self.page.wait_for_timeout(3000)
+        print(f"Command for step: {step_name} is executed, wait for the page to refresh the status.")
+        PageWait.network_quiet(self.page, 3)
 
     def k8s_wait_bmdp_ready(self, dp_name):
         ColorLogger.info(f"Wait for '{dp_name}' getting ready...")
         self.goto_dataplane(dp_name)
-        if not Util.check_dom_visibility(self.page, self.page.locator(".domain-data-status__text.green"), 20, 300, True):
+        # the Data Plane page polls its status, it is only reloaded when no status response arrives for 60 seconds
+        if not Util.wait_for_dom(self.page, self.page.locator(".domain-data-status__text.green"), 300, 60, PageWait.is_api_response):
             Util.exit_error(f"Data Plane '{dp_name}' is not ready.", self.page, "dp_config_bmdp_status.png")
 
         ColorLogger.success(f"Data Plane '{dp_name}' is ready.")
@@ -537,7 +538,7 @@ class PageObjectDataPlane(PageObjectGlobal):
             ReportYaml.set_dataplane(dp_name)
         data_plane_card = self.page.locator(".data-plane-card", has=self.page.locator('.data-plane-name', has_text=dp_name))
         print(f"Waiting for DataPlane {dp_name} tunnel connected...")
-        if not Util.check_dom_visibility(self.page, data_plane_card.locator('.tunnel-status svg.green'), 10, 180):
+        if not Util.wait_for_dom(self.page, data_plane_card.locator('.tunnel-status svg.green'), 180):
             Util.exit_error(f"DataPlane {dp_name} tunnel is not connected, exit program and recheck again.", self.page, "k8s_wait_tunnel_connected_2.png")
 
         ColorLogger.success(f"DataPlane {dp_name} tunnel is connected.")
@@ -546,8 +547,8 @@ class PageObjectDataPlane(PageObjectGlobal):
     def k8s_delete_app(self, dp_name, capability, app_name):
         ColorLogger.info(f"Deleting {capability} app '{app_name}' in DataPlane {dp_name}")
         self.goto_dataplane(dp_name)
-        self.page.wait_for_timeout(3000)
         app_row = self.page.locator(f"#app-list-table tr.{capability.upper()}", has=self.page.locator("td.app-name", has_text=app_name))
+        PageWait.visible(app_row, 3)
         if app_row.is_visible():
             app_row.locator(".actions a:has(svg[id^='delete'])").click()
             print(f"Clicked 'Delete' icon in app '{app_name}' row")
@@ -555,7 +556,7 @@ class PageObjectDataPlane(PageObjectGlobal):
             print(f"Delete confirmation dialog is displayed.")
             self.page.locator(".confirmation #confirm-button", has_text="Yes").click()
             print("Clicked 'Yes' button in confirmation dialog")
-            self.page.wait_for_timeout(2000)
+            PageWait.hidden(app_row, 2)
             if not self.page.locator(f"#app-list-table tr.{capability.upper()}", has=self.page.locator("td.app-name", has_text=app_name)).is_visible():
                 ColorLogger.success(f"Deleted {capability} app '{app_name}' in DataPlane {dp_name}")
                 ReportYaml.remove_capability_app(dp_name, capability, app_name)
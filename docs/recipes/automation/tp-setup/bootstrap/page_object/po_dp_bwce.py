@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Dict
 
 from utils.color_logger import ColorLogger
+from utils.page_wait import PageWait
 from utils.util import Util
 from utils.helper import Helper
 from utils.env import ENV
@@ -92,7 +93,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
             ColorLogger.success(f"Data Plane '{dp_name}' status is running.")
             self.page.locator('button', has_text="Provision a capability").click()
             print("Clicked 'Provision a capability' button")
-            self.page.wait_for_timeout(2000)
+            PageWait.visible(self.page.locator(".capability-select-container"), 2)
             print(f"Waiting for capability list is loaded")
             self.page.locator(".capability-select-container").wait_for(state="visible")
             selected_card_title = self.page.locator('capability-select-card', has=self.page.locator(f'#{self.capability_upper}-capability-select-button')).locator('.capability-title').inner_text().strip()
@@ -103,7 +104,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
             print(f"Waiting for {self.capability_upper} capability page is loaded")
             self.page.locator(".resources-content").wait_for(state="visible")
             print(f"{self.capability_upper} capability page is loaded")
-            self.page.wait_for_timeout(3000)
+            PageWait.network_quiet(self.page, 3)
 
             if self.page.locator('#storage-class-resource-table').is_visible():
                 print(f"Checking Storage Class table has '{ENV.TP_AUTO_STORAGE_CLASS}' visible...")
@@ -144,7 +145,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
             print(f"Clicked {self.capability_upper} 'Next' button, finished step 1")
             self.page.locator(".resource-agree label").click()
             print(f"Clicked {self.capability_upper} 'EUA' checkbox")
-            self.page.wait_for_timeout(500)
+            PageWait.enabled(self.page, self.page.locator("#btnNextCapabilityProvision"), 0.5)
             self.page.locator("#btnNextCapabilityProvision").click()
             print(f"Clicked '{self.capability_upper} Provision Capability' button, waiting for {self.capability_upper} Capability Provision Request Completed")
             if Util.check_dom_visibility(self.page, self.page.locator(".resource-success .title", has_text="Capability Provision Request Completed"), 5, 120):
@@ -182,7 +183,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
 
         self.page.locator(capability_selector_path).wait_for(state="visible")
         print(f"{self.capability_upper} capability page loaded, Checking Plugins...")
-        self.page.wait_for_timeout(3000)
+        PageWait.visible(self.page.locator("#pkgsTbl-table-listPkg td:first-child").or_(self.page.locator("#capContainer-cont-appPackages .caret-icon")), 3)
 
         if self.page.locator("#capContainer-cont-appPackages .caret-icon").is_visible():
             self.page.locator("#capContainer-cont-appPackages .caret-icon").click()
@@ -197,7 +198,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
             Util.refresh_page(self.page)
             self.page.locator(capability_selector_path).wait_for(state="visible")
             print(f"{self.capability_upper} capability page loaded, Checking Plugins...")
-            self.page.wait_for_timeout(3000)
+            PageWait.visible(self.page.locator("#pkgsTbl-table-listPkg td:first-child"), 3)
             plugins = [text.strip() for text in self.page.locator("#pkgsTbl-table-listPkg td:first-child").all_inner_texts()]
 
         print(f"{self.capability_upper} Plugins: {plugins}")
@@ -251,7 +252,6 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
         print(f"{self.capability_upper} Checking app build...")
         # self.page.locator("#capContainer-cont-appBuilds").wait_for(state="visible")
         # print(f"{self.capability_upper} capability page loaded, Checking {self.capability_upper} App Builds...")
-        # self.page.wait_for_timeout(3000)
 
         is_app_build_created = Util.refresh_until_success(self.page,
                                                           self.page.locator("#capContainer-cont-appBuilds td", has_text=app_name),
@@ -287,13 +287,13 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
 
         # step2: Select Versions
         self.page.locator("#bldConf-tblBody-txt-appBuildName-text-input").wait_for(state="visible")
-        self.page.wait_for_timeout(2000)
+        PageWait.network_quiet(self.page, 2)
         active_title = self.page.locator("ul.pl-secondarynav__menu .is-active a").inner_text()
         print(f"{self.capability_upper} 'App Build & Deploy' Step 2: '{active_title}' page is loaded")
         if self.page.locator("#bldConf-tblBody-btn-refreshProvBWCEList", has_text="Refresh").is_visible():
             self.page.locator("#bldConf-tblBody-btn-refreshProvBWCEList", has_text="Refresh").click()
             print("Clicked 'Refresh' button to refresh BWCE versions list")
-            self.page.wait_for_timeout(2000)
+            PageWait.network_quiet(self.page, 2)
         self.page.locator("#bldConf-tblBody-txt-appBuildName-text-input").fill(app_name)
         print(f"Filled App Build Name: {app_name}")
 
@@ -302,7 +302,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
         print("Clicked 'Create Build' button")
 
         # step3:
-        self.page.wait_for_timeout(2000)
+        PageWait.visible(self.page.locator("ul.pl-secondarynav__menu .is-active a", has_not_text=active_title), 2)
         active_title = self.page.locator("ul.pl-secondarynav__menu .is-active a").inner_text()
         print(f"{self.capability_upper} 'App Build & Deploy' Step 3: '{active_title}' page is loaded")
         # if step3 is "App Build", will deploy app later, it is for 1.5 version
@@ -344,7 +344,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
         print(f"App Resource Configuration' page loaded")
         self.page.locator("#nameSpace input").click()
         print(f"Clicked 'Namespace' dropdown, and waiting for namespace: {ENV.TP_AUTO_K8S_DP_NAMESPACE}")
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(self.page.locator("#nameSpace .pl-select-menu li", has_text=ENV.TP_AUTO_K8S_DP_NAMESPACE), 1)
         if not self.page.locator("#nameSpace .pl-select-menu li", has_text=ENV.TP_AUTO_K8S_DP_NAMESPACE).is_visible():
             Util.exit_error(f"Namespace '{ENV.TP_AUTO_K8S_DP_NAMESPACE}' is not list in the dropdown.", self.page, f"{self.capability}_app_build_and_deploy.png")
 
@@ -358,7 +358,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
 
         self.page.locator("label[for='eula-checkbox']").click()
         print("Clicked 'EUA' checkbox")
-        self.page.wait_for_timeout(1000)
+        PageWait.network_quiet(self.page, 1)
 
     def bwce_app_deploy(self, dp_name, app_name = None):
         app_name = app_name or self.app_name
@@ -397,7 +397,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
         self.page.locator("#bldTbl-table-buildsList tr", has=self.page.locator("td", has_text=app_name)).nth(0).locator('.pl-dropdown .pl-dropdown-menu__item button', has_text="Deploy").click()
         print(f"Clicked 'Deploy' from action menu list for {app_name}")
 
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(self.page.locator('#appMngModal-btn-deployBWprov', has_text="Deploy"), 1)
         # Deploy App dialog is for 1.4, 1.5 version
         if Util.check_dom_visibility(self.page, self.page.locator('#appMngModal-btn-deployBWprov', has_text="Deploy"), 3, 6):
             print("Deploy App Dialog popup")
@@ -480,10 +480,10 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
             print("Navigating to 'Engine Variables' tab menu")
             self.page.locator(".pl-primarynav__menu .pl-primarynav__item", has_text="Environmental Controls").click()
             print("Clicked 'Environmental Controls' tab menu")
-            self.page.wait_for_timeout(1000)
+            PageWait.network_quiet(self.page, 1)
             self.page.locator("#evnCtlEngineVarsTab", has_text="Engine Variables").wait_for(state="visible")
             self.page.locator("#evnCtlEngineVarsTab", has_text="Engine Variables").click()
-            self.page.wait_for_timeout(1000)
+            PageWait.visible(self.page.locator(".engine-variables"), 1)
             print("Clicked 'Engine Variables' left side menu")
             self.page.locator(".engine-variables").wait_for(state="visible")
             print("'Engine Variables' table is loaded.")
@@ -498,7 +498,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
                 traces_row.locator("#engVars-btn-valTrue").wait_for(state="visible")
                 traces_row.locator("#engVars-btn-valTrue").click()
                 print("Set BW_OTEL_TRACES_ENABLED to true")
-                self.page.wait_for_timeout(1000)
+                PageWait.enabled(self.page, self.page.locator("#engVars-btn-pushUpdates"), 1)
                 self.page.locator("#engVars-btn-pushUpdates").click()
                 print("Clicked 'Push Updates' button")
                 if Util.wait_for_success_message(self.page, 5):
@@ -551,7 +551,7 @@ class PageObjectDataPlaneBWCE(PageObjectDataPlane):
         print("Clicked 'Endpoints' tab")
         self.page.locator(".endpoint-menu-dropdown").wait_for(state="visible")
         print("Endpoint tab is loaded.")
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(self.page.locator("#appDtls-appName-cont .status_label"), 1)
 
         is_app_running = self.page.locator("#appDtls-appName-cont .status_label", has_text="Running").is_visible()
         if not is_app_running:
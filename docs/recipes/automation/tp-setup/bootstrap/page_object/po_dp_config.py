@@ -1,6 +1,7 @@
 #  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
 
 from utils.color_logger import ColorLogger
+from utils.page_wait import PageWait
 from utils.util import Util
 from utils.helper import Helper
 from utils.env import ENV
@@ -16,7 +17,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
         self.page.locator("#ct-dp-config-link").wait_for(state="visible")
         self.page.locator("#ct-dp-config-link").click()
         print("Clicked 'Data Plane configuration' button")
-        self.page.wait_for_timeout(500)
+        PageWait.network_quiet(self.page, 0.5)
 
     def goto_dataplane_config_sub_menu(self, sub_menu_name, child_menu_name=""):
         ColorLogger.info(f"Going to Data plane config -> '{sub_menu_name}' side menu")
@@ -26,7 +27,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
             self.page.locator(".menu-item-list .pl-leftnav-menu__nested .pl-leftnav-menu__link", has_text=child_menu_name).wait_for(state="visible")
             self.page.locator(".menu-item-list .pl-leftnav-menu__nested .pl-leftnav-menu__link", has_text=child_menu_name).click()
             print(f"Clicked '{child_menu_name}' left side menu")
-        self.page.wait_for_timeout(500)
+        PageWait.network_quiet(self.page, 0.5)
 
     def o11y_get_new_resource(self, dp_name):
         # For 1.4 version
@@ -106,7 +107,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
             Util.exit_error(f"Data Plane '{dp_title}' Observability config load failed.", self.page, "o11y_config_dataplane_resource.png")
     
         print("Checking if 'Add new resource' button is exist...")
-        self.page.wait_for_timeout(2000)
+        PageWait.network_quiet(self.page, 2)
     
         add_new_resource_button = self.o11y_get_new_resource(dp_name)
         if not add_new_resource_button.is_visible():
@@ -120,7 +121,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
     
         print("Waiting for O11y config o11y page is loaded")
         self.page.locator(".configuration").wait_for(state="visible")
-        self.page.wait_for_timeout(2000)
+        PageWait.network_quiet(self.page, 2)
         print("O11y config o11y page is loaded")
     
         # Step 1: Configure Log Server
@@ -152,7 +153,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
         if self.page.locator("label[for='services-exporter-toggle']", has_text=f"{tab_name} enabled").is_visible():
             self.o11y_config_table_add_or_select_item(dp_name, menu_name, tab_name, "Services Exporter", "#add-services-exporter-btn")
     
-        self.page.wait_for_timeout(500)
+        PageWait.enabled(self.page, self.page.locator("#go-to-metrics-server-configuration"), 0.5)
         self.page.locator("#go-to-metrics-server-configuration").click()
         print("Clicked 'Next' button")
         print(f"Data plane '{dp_title}' 'Configure Log Server' Step 1 is configured.")
@@ -170,8 +171,8 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
             if is_system_toggle_enabled:
                 print("Metrics System Config is enabled")
                 self.page.locator("label[for='metrics-toggle-system-config']").click()
-                print("Clicked 'Metrics System Config' toggle button, then wait for 1 second.")
-                self.page.wait_for_timeout(1000)
+                print("Clicked 'Metrics System Config' toggle button, then wait for it to be disabled.")
+                PageWait.visible(self.page.locator("#metrics-toggle-system-config[aria-checked='false']"), 1)
 
             # Add or Select Metrics -> Query Service configurations
             menu_name = "Metrics"
@@ -202,8 +203,8 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
             if is_system_toggle_enabled:
                 print("Traces System Config is enabled")
                 self.page.locator("label[for='traces-toggle-system-config']").click()
-                print("Clicked 'Traces System Config' toggle button, then wait for 1 second.")
-                self.page.wait_for_timeout(1000)
+                print("Clicked 'Traces System Config' toggle button, then wait for it to be disabled.")
+                PageWait.visible(self.page.locator("#traces-toggle-system-config[aria-checked='false']"), 1)
 
             # Add or Select Traces -> Query Service configurations
             menu_name = "Traces"
@@ -223,7 +224,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
                 self.o11y_config_table_add_or_select_item(dp_name, menu_name, tab_name, "", "#add-traces-exporter-btn")
         self.page.locator("#save-observability").click()
         print(f"Data plane '{dp_title}' 'Configure Traces Server' Step 3 is configured.")
-        self.page.wait_for_timeout(1000)
+        PageWait.network_quiet(self.page, 1)
         if self.page.locator(".pl-notification--error").is_visible():
             Util.warning_screenshot(f"Data Plane '{dp_title}' Observability Resources configuration failed.", self.page, "o11y_config_dataplane_resource.png")
             self.page.locator("#cancel-observability-add-traces").click()
@@ -234,8 +235,8 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
     
         ColorLogger.success(f"Data plane '{dp_title}' Observability Resources is configured.")
         ReportYaml.set_dataplane_info(dp_name, "o11yConfig", True)
-        print(f"Wait 5 seconds for Data plane '{dp_title}' configuration page redirect.")
-        self.page.wait_for_timeout(5000)
+        print(f"Wait for Data plane '{dp_title}' configuration page redirect.")
+        PageWait.hidden(self.page.locator("#save-observability"), 5)
     
     def o11y_config_table_add_or_select_item(self, dp_name, menu_name, tab_name, tab_sub_name, add_button_selector):
         ColorLogger.info("O11y start to add or select item...")
@@ -281,7 +282,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
             self.o11y_fill_prometheus_or_elastic("ElasticSearch", ENV.TP_AUTO_ELASTIC_URL, ENV.TP_AUTO_ELASTIC_USER, ENV.TP_AUTO_ELASTIC_PASSWORD)
     
         self.page.locator("configuration-modal .pl-modal__footer-left button.pl-button--primary", has_text="Save").click()
-        self.page.wait_for_timeout(1000)
+        PageWait.network_quiet(self.page, 1)
         if self.page.locator(".pl-notification--error").is_visible():
             Util.exit_error(f"Add {name_input} for Data Plane '{dp_title}' Observability -> {menu_name} -> {tab_name} failed.", self.page, f"o11y_new_resource_fill_form-{name_input}.png")
     
@@ -314,7 +315,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
         self.page.locator("#resources-menu-item .menu-item-text", has_text="Resources").click()
         print("Clicked 'Resources' left side menu")
         print(f"Resource Name: {resource_name}")
-        self.page.wait_for_timeout(5000)
+        PageWait.network_quiet(self.page, 5)
         if self.page.locator("#storage-resource-table tr td:first-child", has_text=resource_name).is_visible():
             ColorLogger.success(f"Storage '{resource_name}' is already created.")
             ReportYaml.set_dataplane_info(ENV.TP_AUTO_K8S_DP_NAME, "storage", True)
@@ -349,13 +350,13 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
         self.page.locator("#resources-menu-item .menu-item-text", has_text="Resources").wait_for(state="visible")
         self.page.locator("#resources-menu-item .menu-item-text", has_text="Resources").click()
         print("Clicked 'Resources' left side menu")
-        self.page.wait_for_timeout(5000)
+        PageWait.network_quiet(self.page, 5)
         self.page.locator("#toggle-ingress-expansion svg use").wait_for(state="visible")
         expected_icon = 'pl-icon-caret-right'
         if expected_icon in (self.page.query_selector("#toggle-ingress-expansion svg use") or {}).get_attribute("xlink:href"):
             self.page.locator("#toggle-ingress-expansion").click()
             print("Clicked expand Icon, and wait for Ingress Controller table")
-            self.page.wait_for_timeout(3000)
+            PageWait.visible(self.page.locator("#ingress-resource-table"), 3)
     
         print(f"Check if Ingress Controller '{resource_name}' is exist...")
         if self.page.locator("#ingress-resource-table tr td:first-child", has_text=resource_name).is_visible():
@@ -370,7 +371,7 @@ class PageObjectDataPlaneConfiguration(PageObjectDataPlane):
     
             # Add Ingress Controller dialog popup
             self.add_ingress_controller(ingress_controller, resource_name, ingress_class_name, fqdn)
-            self.page.wait_for_timeout(1000)
+            PageWait.network_quiet(self.page, 1)
             if self.page.locator(".pl-notification--error").is_visible():
                 error_content = self.page.locator(".pl-notification__message").text_content()
                 Util.warning_screenshot(f"Config Data Plane Resources Ingress Error: {error_content}", self.page, "dp_config_resources_ingress.png")
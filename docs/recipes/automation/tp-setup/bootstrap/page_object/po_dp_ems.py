@@ -1,6 +1,7 @@
 #  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
 
 from utils.color_logger import ColorLogger
+from utils.page_wait import PageWait
 from utils.util import Util
 from utils.env import ENV
 from utils.report import ReportYaml
@@ -30,7 +31,7 @@ class PageObjectDataPlaneEMS(PageObjectDataPlane):
             ColorLogger.success(f"Data Plane '{dp_name}' status is running.")
             self.page.locator('button', has_text="Provision a capability").click()
             print("Clicked 'Provision a capability' button")
-            self.page.wait_for_timeout(2000)
+            PageWait.visible(self.page.locator(".capability-select-container"), 2)
             print(f"Waiting for capability list is loaded")
             self.page.locator(".capability-select-container").wait_for(state="visible")
             if not Util.check_dom_visibility(self.page, self.page.locator('#EMS-capability-select-button'), 5, 5):
@@ -42,7 +43,7 @@ class PageObjectDataPlaneEMS(PageObjectDataPlane):
             print("Waiting for EMS capability page is loaded")
             self.page.locator(".resources-content").wait_for(state="visible")
             print("EMS capability page is loaded")
-            self.page.wait_for_timeout(3000)
+            PageWait.network_quiet(self.page, 3)
 
             # step1: Resources
             if self.page.locator('#message-storage-resource-table').is_visible():
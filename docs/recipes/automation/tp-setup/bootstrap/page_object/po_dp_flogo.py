@@ -1,6 +1,7 @@
 #  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
 
 from utils.color_logger import ColorLogger
+from utils.page_wait import PageWait
 from utils.util import Util
 from utils.helper import Helper
 from utils.env import ENV
@@ -33,7 +34,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
             ColorLogger.success(f"Data Plane '{dp_name}' status is running.")
             self.page.locator('button', has_text="Provision a capability").click()
             print("Clicked 'Provision a capability' button")
-            self.page.wait_for_timeout(2000)
+            PageWait.visible(self.page.locator(".capability-select-container"), 2)
             print(f"Waiting for capability list is loaded")
             self.page.locator(".capability-select-container").wait_for(state="visible")
             Util.click_button_until_enabled(self.page, self.page.locator('#FLOGO-capability-select-button'))
@@ -42,7 +43,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
             print("Waiting for Flogo capability page is loaded")
             self.page.locator(".resources-content").wait_for(state="visible")
             print("Flogo capability page is loaded")
-            self.page.wait_for_timeout(3000)
+            PageWait.network_quiet(self.page, 3)
 
             if self.page.locator('#storage-class-resource-table').is_visible():
                 print(f"Checking Storage Class table has '{ENV.TP_AUTO_STORAGE_CLASS}' visible...")
@@ -89,7 +90,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
             if is_eula_loaded:
                 self.page.locator(".eula-container input").click()
                 print("Clicked Flogo 'EUA' checkbox")
-                self.page.wait_for_timeout(500)
+                PageWait.enabled(self.page, self.page.locator("#qaProvisionFlogo"), 0.5)
                 self.page.locator("#qaProvisionFlogo").click()
                 print("Clicked 'Flogo Provision Capability' button, waiting for Flogo Capability Provision Request Completed")
                 # TODO: success message may not pop up, need to handle this case
@@ -132,7 +133,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
     
         self.page.locator(capability_selector_path).wait_for(state="visible")
         print("Flogo capability page loaded, Checking connectors...")
-        self.page.wait_for_timeout(3000)
+        PageWait.visible(self.page.locator(".capability-connectors-container td:first-child"), 3)
     
         connectors = [text.strip() for text in self.page.locator(".capability-connectors-container td:first-child").all_inner_texts()]
         # Note: check 2 times, because sometimes Flogo connectors cannot be loaded in time
@@ -143,7 +144,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
             Util.refresh_page(self.page)
             self.page.locator(capability_selector_path).wait_for(state="visible")
             print("Flogo capability page loaded, Checking connectors...")
-            self.page.wait_for_timeout(3000)
+            PageWait.visible(self.page.locator(".capability-connectors-container td:first-child"), 3)
             connectors = [text.strip() for text in self.page.locator(".capability-connectors-container td:first-child").all_inner_texts()]
     
         print(f"Flogo Connectors: {connectors}")
@@ -193,7 +194,6 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
         print("Flogo Checking app build...")
         # self.page.locator(".app-build-container").wait_for(state="visible")
         # print("Flogo capability page loaded, Checking Flogo App Builds...")
-        # self.page.wait_for_timeout(3000)
         # is_app_build_created = self.page.locator(".app-build-container td", has_text=app_name).is_visible()
         # # Note: check 3 times, because sometimes Flogo App Builds can not be loaded in time
         # # if not Flogo App Builds, reload page, and check again, only check 3 times, if still empty, exit for loop
@@ -203,7 +203,6 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
         #     Util.refresh_page(page)
         #     self.page.locator(".app-build-container").wait_for(state="visible")
         #     print("Flogo capability page loaded, Checking Flogo App Builds...")
-        #     self.page.wait_for_timeout(3000)
         #     is_app_build_created = self.page.locator(".app-build-container td", has_text=app_name).is_visible()
     
         is_app_build_created = Util.refresh_until_success(self.page,
@@ -240,7 +239,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
     
         # step2: Select Versions
         self.page.locator("#build-name").wait_for(state="visible")
-        self.page.wait_for_timeout(2000)
+        PageWait.network_quiet(self.page, 2)
         active_title = self.page.locator("ul.items .is-active .step-text").inner_text()
         print(f"Flogo 'App Build & Deploy' Step 2: '{active_title}' page is loaded")
         if self.page.locator(".version-field-container .provision-link").is_visible():
@@ -257,10 +256,9 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
             new_page.locator("#qaPluginProvision").click()
             new_page.close()
             ColorLogger.success("Provision Flogo & Connectors successful.")
-            print("Wait for 5 seconds, then clicked 'Refresh List' button")
-            self.page.wait_for_timeout(5000)
             self.page.locator(".refresh-link", has_text="Refresh List").click()
-            self.page.wait_for_timeout(1000)
+            print("Clicked 'Refresh List' button, then wait for Flogo version is loaded")
+            PageWait.has_value(self.page, self.page.locator(".flogo-version-container flogo-tp-dropdown input"), 6)
             # check if Flogo version and Connectors General version is loaded
             for _ in range(3):
                 flogo_version_value = self.page.locator(".flogo-version-container flogo-tp-dropdown input").input_value().strip()
@@ -271,8 +269,8 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
                     break
                 print("Flogo or Connectors General version is not loaded, will click 'Refresh List' button")
                 self.page.locator(".refresh-link", has_text="Refresh List").click()
-                print("Clicked 'Refresh List' button, then wait for 5 seconds")
-                self.page.wait_for_timeout(5000)
+                print("Clicked 'Refresh List' button, then wait for Flogo version is loaded")
+                PageWait.has_value(self.page, self.page.locator(".flogo-version-container flogo-tp-dropdown input"), 5)
     
         # namespace picker is for 1.4 and 1.3
         if self.page.locator("flogo-namespace-picker input").is_visible():
@@ -283,7 +281,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
         print("Clicked 'Next' button")
     
         # step3:
-        self.page.wait_for_timeout(2000)
+        PageWait.visible(self.page.locator("ul.items .is-active .step-text", has_not_text=active_title), 2)
         active_title = self.page.locator("ul.items .is-active .step-text").inner_text()
         print(f"Flogo 'App Build & Deploy' Step 3: '{active_title}' page is loaded")
         # if step3 is "Finished", will deploy app later, it is for 1.5 version
@@ -329,7 +327,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
     def flogo_app_build_and_deploy_select_namespace(self):
         self.page.locator("flogo-namespace-picker input").click()
         print(f"Clicked 'Namespace' dropdown, and waiting for namespace: {ENV.TP_AUTO_K8S_DP_NAMESPACE}")
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(self.page.locator("flogo-namespace-picker .namespace-dropdown li", has_text=ENV.TP_AUTO_K8S_DP_NAMESPACE), 1)
         if not self.page.locator("flogo-namespace-picker .namespace-dropdown li", has_text=ENV.TP_AUTO_K8S_DP_NAMESPACE).is_visible():
             Util.exit_error(f"Namespace '{ENV.TP_AUTO_K8S_DP_NAMESPACE}' is not list in the dropdown.", self.page, "flogo_app_build_and_deploy.png")
     
@@ -374,7 +372,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
         self.page.locator(".app-build-container tr", has=self.page.locator("td", has_text=app_name)).nth(0).locator('flogo-app-build-actions .action-menu button', has_text="Deploy").click()
         print(f"Clicked 'Deploy' from action menu list for {app_name}")
     
-        self.page.wait_for_timeout(1000)
+        PageWait.network_quiet(self.page, 1)
         # .app-managed-container is for 1.5 version
         if Util.check_dom_visibility(self.page, self.page.locator('.app-managed-container .deploy-app button', has_text="Deploy App").nth(0), 3, 6):
             print("Deploy App Dialog popup")
@@ -406,7 +404,7 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
     
             self.page.locator(".pl-modal__footer-right button", has_text="Deploy App Build").click()
             print("Clicked 'Deploy App Build' button")
-            self.page.wait_for_timeout(1000)
+            PageWait.hidden(self.page.locator(".pl-modal__footer-right button", has_text="Deploy App Build"), 1)
     
             self.page.locator("flogo-capability-header .dp-sec-name", has_text=dp_name).click()
             print(f"Clicked menu navigator Data Plane '{dp_name}', go back to Data Plane detail page")
@@ -479,10 +477,10 @@ class PageObjectDataPlaneFlogo(PageObjectDataPlane):
             print("Navigating to 'Engine Variables' tab menu")
             self.page.locator(".pl-primarynav__menu .pl-primarynav__item", has_text="Environmental Controls").click()
             print("Clicked 'Environmental Controls' tab menu")
-            self.page.wait_for_timeout(1000)
+            PageWait.network_quiet(self.page, 1)
             self.page.locator(".environment-container .left-navigation li a", has_text="Engine Variables").wait_for(state="visible")
             self.page.locator(".environment-container .left-navigation li a", has_text="Engine Variables").click()
-            self.page.wait_for_timeout(1000)
+            PageWait.visible(self.page.locator(".appVars-table"), 1)
             print("Clicked 'Engine Variables' left side menu")
             self.page.locator(".appVars-table tr.pl-table__row", has=self.page.locator("td", has_text="FLOGO_OTEL_TRACE")).wait_for(state="visible")
             flogo_otel_trace_selector = self.page.locator(".appVars-table tr.pl-table__row", has=self.page.locator("td", has_text="FLOGO_OTEL_TRACE")).locator("select")
@@ -1,5 +1,6 @@
 from utils.color_logger import ColorLogger
 from utils.env import ENV
+from utils.page_wait import PageWait
 
 class PageObjectGlobal:
     def __init__(self, page):
@@ -11,4 +12,4 @@ class PageObjectGlobal:
         self.page.locator(".nav-bar-pointer", has_text=item_name).wait_for(state="visible")
         self.page.locator(".nav-bar-pointer", has_text=item_name).click()
         print(f"Clicked left side menu '{item_name}'")
-        self.page.wait_for_timeout(500)
+        PageWait.network_quiet(self.page, 0.5)
@@ -3,6 +3,7 @@
 from page_object.po_global import PageObjectGlobal
 from utils.color_logger import ColorLogger
 from utils.e2e_util import E2EUtils
+from utils.page_wait import PageWait
 
 class PageObjectO11y(PageObjectGlobal):
     def __init__(self, page):
@@ -59,7 +60,7 @@ class PageObjectO11y(PageObjectGlobal):
         if confirmation:
             self.page.locator("p-confirmdialog button", has_text="Yes").click()
             print(f"Clicked 'Yes' button in '{action_item}' confirmation dialog")
-        self.page.wait_for_timeout(500)
+        PageWait.network_quiet(self.page, 0.5)
 
     def click_add_widget_button(self):
         self.get_add_card_button().click()
@@ -5,6 +5,7 @@ import json, base64
 from utils.color_logger import ColorLogger
 from utils.env import ENV
 from utils.helper import Helper
+from utils.page_wait import PageWait
 from utils.report import ReportYaml
 from utils.util import Util
 
@@ -56,7 +57,7 @@ class PageObjectSettings:
 
         self.page.locator("#generate-token-btn").wait_for(state="visible")
         print("'OAuth Token' page is visible")
-        self.page.wait_for_timeout(1000)
+        PageWait.network_quiet(self.page, 1)
         token_row = self.page.locator("oauth-token table tr", has=self.page.locator("td:first-child", has_text=ENV.TP_AUTO_TOKEN_NAME))
         if token_row.is_visible():
             ColorLogger.success(f"OAuth Token '{ENV.TP_AUTO_TOKEN_NAME}' exists in table.")
@@ -154,7 +155,7 @@ class PageObjectSettings:
             self.page.locator(".mcp-header-row .select-button", has_text="Select all").wait_for(state="visible")
             self.page.locator(".mcp-header-row .select-button", has_text="Select all").click()
             print("Clicked 'Select all' button to select all MCP servers")
-            self.page.wait_for_timeout(1000)
+            PageWait.enabled(self.page, self.page.locator(".settings-mcp-servers .mcp-footer button", has_text="Save"), 1)
 
             if self.page.locator(".settings-mcp-servers .mcp-footer button", has_text="Save").is_disabled():
                 ColorLogger.info(f"'Save' button is disabled, no changes to save for MCP server settings.")
@@ -164,7 +165,7 @@ class PageObjectSettings:
 
             self.page.locator(".settings-mcp-servers .mcp-footer button", has_text="Save").click()
             print("Clicked 'Save' button to save MCP server settings")
-            self.page.wait_for_timeout(1000)
+            PageWait.visible(self.page.locator(".pl-modal__heading", has_text="Update MCP Servers Configuration"), 1)
 
             if self.page.locator(".pl-modal__heading", has_text="Update MCP Servers Configuration").is_visible():
                 ColorLogger.success(f"'Update MCP Server' confirmation dialog is visible")
@@ -2,6 +2,7 @@
 
 from utils.color_logger import ColorLogger
 from utils.env import ENV
+from utils.page_wait import PageWait
 from utils.report import ReportYaml
 
 class PageObjectUserManagement:
@@ -36,7 +37,7 @@ class PageObjectUserManagement:
         self.page.locator(".pl-dropdown-menu__action", has_text="Update permissions").click()
         print(f"Clicked 'Update permissions' from dropdown list")
 
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(self.page.locator(".policy-selector-container"), 1)
         print(f"Assign Permissions for {ENV.DP_USER_EMAIL}")
 
         self.grant_permission("Data plane Manager")
@@ -92,7 +93,7 @@ class PageObjectUserManagement:
         self.page.locator(".pl-dropdown-menu__action", has_text="Update permissions").click()
         print(f"Clicked 'Update permissions' from dropdown list")
 
-        self.page.wait_for_timeout(1000)
+        PageWait.visible(self.page.locator(".policy-selector-container"), 1)
         print(f"Assign Permissions for {ENV.DP_USER_EMAIL}")
         # if it has 8 green icons, then exit this function
         if self.page.locator(".policy-selector-container .green-check-icon").count() >= 8:
@@ -18,4 +18,12 @@ fi
 export TP_AUTO_TASK_FROM_LOCAL_SOURCE=${TP_AUTO_TASK_FROM_LOCAL_SOURCE:-""}
 export TP_AUTO_KUBECONFIG=${TP_AUTO_KUBECONFIG:-""}
 
-uv run -m waitress --host=0.0.0.0 --port=3120 server:app
+# every streamed job log (/run-gui-script, /jobs/<id>/log?follow=true, /jobs/<id>/events) holds a waitress thread until the job ends,
+# size the thread pool from the jobs which run at the same time (see TP_AUTO_MAX_JOBS), plus the waitress default of 4 for the other requests
+TP_AUTO_MAX_JOBS_OR_DEFAULT=${TP_AUTO_MAX_JOBS:-$(( $(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 2) / 2 ))}
+if [ "${TP_AUTO_MAX_JOBS_OR_DEFAULT}" -lt 1 ]; then
+  TP_AUTO_MAX_JOBS_OR_DEFAULT=1
+fi
+export TP_AUTO_SERVER_THREADS=${TP_AUTO_SERVER_THREADS:-$(( TP_AUTO_MAX_JOBS_OR_DEFAULT * 4 + 4 ))}
+
+uv run -m waitress --host=0.0.0.0 --port=3120 --threads="${TP_AUTO_SERVER_THREADS}" server:app
@@ -1,25 +1,29 @@
 #  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
 
-import subprocess
-import sys
+import json
 import os
 import time
 import shutil
-import uuid
 from flask_cors import CORS
 from flask import Flask, render_template, Response, request, jsonify, stream_with_context
-from typing import Dict
 
+from utils.env import ENV
+from utils.job_manager import Job, JobManager
 from utils.streaming_runner import StreamingRunner
 from utils.tibcop_cli import TibcopCliHandler
 from utils.util import Util
 
 app = Flask(__name__, template_folder="templates")
 HEADER_ONE_CLICK_JOB_ID = "one_click_job_id"
-CORS(app, expose_headers=[HEADER_ONE_CLICK_JOB_ID])
+HEADER_JOB_STATE = "job_state"
+HEADER_LOG_OFFSET = "log_offset"
+JOB_WORKSPACE_FOLDER = "jobs"
+CORS(app, expose_headers=[HEADER_ONE_CLICK_JOB_ID, HEADER_JOB_STATE, HEADER_LOG_OFFSET])
 app.config['TEMPLATES_AUTO_RELOAD'] = True
 
-running_processes: Dict[str, subprocess.Popen] = {}
+job_manager = JobManager(ENV.TP_AUTO_MAX_JOBS, ENV.TP_AUTO_JOB_LOG_PATH, ENV.TP_AUTO_JOB_HISTORY_SIZE,
+                         ENV.TP_AUTO_CASE_WORKER_MAX_JOBS, ENV.TP_AUTO_CASE_WORKER_WARM_MODULES.split(","),
+                         os.path.join(ENV.TP_AUTO_REPORT_PATH, JOB_WORKSPACE_FOLDER), ENV.TP_AUTO_JOB_HISTORY_TTL)
 
 def set_env_vars_from_request(request_args, include_system_env=True):
     # Set request parameters as environment variables
@@ -30,7 +34,7 @@ def set_env_vars_from_request(request_args, include_system_env=True):
 
     env_vars["PYTHONIOENCODING"] = "utf-8"
     for key, value in request_args.items():
-        if key != "case":
+        if key not in ("case", "priority"):
             env_vars[key] = value
 
     env_vars_to_print = {}
@@ -60,15 +64,7 @@ def home():
 def stop_script():
     """ Stop the currently running script """
     job_id = request.args.get("jobId")
-    process = running_processes.get(job_id)
-    if process and process.poll() is None:  # Ensure the process is assigned
-        print(f"[INFO] Stopping process (PID: {process.pid})...")
-        process.terminate()  # Try to terminate gracefully
-        try:
-            process.wait(timeout=2)  # Wait up to 2 seconds
-        except subprocess.TimeoutExpired:
-            process.kill()  # Force kill if termination fails
-        running_processes.pop(job_id, None)
+    if job_manager.cancel(job_id):
         return jsonify({"status": "stopped", "message": "Process terminated successfully"})
 
     return jsonify({"status": "no_process", "message": "No process running"})
@@ -81,59 +77,180 @@ def run_gui_script():
     is_clean_report = request.args.get('IS_CLEAN_REPORT')
     if not auto_case:
         return "Error: Missing 'case' parameter", 400
-
-    report_folder = os.path.join(os.getcwd(), "report")
-    if is_clean_report == "true":
-        if os.path.exists(report_folder) and os.path.isdir(report_folder):
-            shutil.rmtree(report_folder)
-            print(f"Removed {report_folder}")
-    else:
-        report_yaml_file = os.path.join(report_folder, "report.yaml")
-        report_txt_file = os.path.join(report_folder, "report.txt")
-        if os.path.exists(report_yaml_file):
-            os.remove(report_yaml_file)
-            print(f"Removed {report_yaml_file}")
-        if os.path.exists(report_txt_file):
-            os.remove(report_txt_file)
-            print(f"Removed {report_txt_file}")
+    try:
+        priority = int(request.args.get('priority') or 0)
+    except ValueError:
+        return "Error: 'priority' must be an integer", 400
+
+    def prepare_report(job):
+        # run when the job starts, not when it is queued, so the report of a running job is not removed
+        if ENV.TP_AUTO_JOB_WORKSPACE:
+            prepare_job_workspace(job, is_clean_report == "true")
+            return
+        report_folder = os.path.join(os.getcwd(), "report")
+        if is_clean_report == "true":
+            clean_report_folder(report_folder, job)
+        else:
+            for report_file_name in ["report.yaml", "report.txt", "report-env.json", "report-env.html"]:
+                report_file = os.path.join(report_folder, report_file_name)
+                if os.path.exists(report_file):
+                    os.remove(report_file)
+                    print(f"Removed {report_file}")
 
     # Set request parameters as environment variables
     env_vars = set_env_vars_from_request(request.args)
+    merge_report = merge_job_report if ENV.TP_AUTO_JOB_WORKSPACE and ENV.TP_AUTO_JOB_REPORT_MERGE else None
+    job = job_manager.submit(auto_case, env_vars, priority, prepare_report, merge_report)
 
-    job_id = str(uuid.uuid4())
     def generate():
-        # Start the script using unbuffered output
-        print(f'{sys.executable}, "-u", "-m", {auto_case}')
-        process = subprocess.Popen(
-            [sys.executable, "-u", "-m", auto_case],  # `-u` ensures unbuffered output
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            env=env_vars
-        )
-        running_processes[job_id] = process
-
-        # Stream output line by line
-        try:
-            yield '<pre>\n'
-            for line in iter(lambda: process.stdout.readline() if process and process.poll() is None else None, None):
-                if line and line.strip():
-                    yield Util.clean_ansi_escape(line) + '\n'
-            yield '</pre>\n'
-
-        except Exception as e:
-            print(f"[ERROR] Exception in generate(): {e}")
-
-        finally:
-            if process:
-                process.stdout.close()
-                process.wait()
-            running_processes.pop(job_id, None)
+        # The stream is '<pre>\n' + the job log + '</pre>\n', a client which lost the connection
+        # continues from /jobs/<id>/log?offset=<received bytes - 6>&follow=true, the job keeps running meanwhile
+        yield '<pre>\n'
+        yield from follow_job_log(job, 0)
+        if job.state == Job.CANCELLED:
+            yield f'Job {job.id} is cancelled\n'
+        yield '</pre>\n'
 
     headers = {
-        HEADER_ONE_CLICK_JOB_ID: job_id
+        HEADER_ONE_CLICK_JOB_ID: job.id
     }
     return Response(generate(), headers=headers, content_type='text/html; charset=utf-8')
 
+def prepare_job_workspace(job, is_clean_report):
+    """ The job writes its report, screenshots, videos, traces and dp_commands to report/jobs/<job id> """
+    shared_report_folder = ENV.TP_AUTO_REPORT_PATH
+    if is_clean_report:
+        clean_report_folder(shared_report_folder, job)
+    job.workspace = os.path.join(shared_report_folder, JOB_WORKSPACE_FOLDER, job.id)
+    os.makedirs(job.workspace, exist_ok=True)
+    job.env_vars["TP_AUTO_REPORT_PATH"] = job.workspace
+    job.env_vars["TP_AUTO_SHARED_REPORT_PATH"] = shared_report_folder
+    print(f"Job {job.id} workspace: {job.workspace}")
+
+def is_shared_report_file(file_name):
+    """ Files in the report folder which all jobs use: job workspaces, caches, login state, telemetry, and temp files of atomic writes """
+    shared_file_names = [JOB_WORKSPACE_FOLDER, ENV.TP_AUTO_TELEMETRY_FOLDER, ENV.TP_AUTO_CLUSTER_FACTS_FILE,
+                         ENV.TP_AUTO_DNS_CACHE_FILE, ENV.TP_AUTO_LOGIN_STATE_FOLDER]
+    return file_name.startswith(".") or file_name in shared_file_names
+
+def clean_report_folder(report_folder, job):
+    """ Remove the report of earlier runs, the shared files are kept, and report.yaml is kept while other jobs are running """
+    if not os.path.isdir(report_folder):
+        return
+    is_other_job_running = any(other_job.state == Job.RUNNING and other_job.id != job.id for other_job in list(job_manager.jobs.values()))
+    for file_name in os.listdir(report_folder):
+        if is_shared_report_file(file_name) or (file_name == ENV.TP_AUTO_REPORT_YAML_FILE and is_other_job_running):
+            continue
+        file_path = os.path.join(report_folder, file_name)
+        if os.path.isdir(file_path):
+            shutil.rmtree(file_path, ignore_errors=True)
+        elif os.path.exists(file_path):
+            os.remove(file_path)
+    print(f"Removed {report_folder}, except the files shared by all jobs" + (" and report.yaml of the running jobs" if is_other_job_running else ""))
+
+def merge_job_report(job):
+    """ Merge the report.yaml of the job into the shared report.yaml, and copy its report files to the shared report folder """
+    from utils.report import ReportYaml
+    if not job.workspace:
+        return
+    job_report_file = os.path.join(job.workspace, ENV.TP_AUTO_REPORT_YAML_FILE)
+    if os.path.exists(job_report_file):
+        ReportYaml.merge_file(job_report_file)
+    for report_file_name in [ENV.TP_AUTO_REPORT_TXT_FILE, ENV.TP_AUTO_REPORT_JSON_FILE, ENV.TP_AUTO_REPORT_HTML_FILE]:
+        report_file = os.path.join(job.workspace, report_file_name)
+        if os.path.exists(report_file):
+            shutil.copy2(report_file, os.path.join(ENV.TP_AUTO_REPORT_PATH, report_file_name))
+
+def follow_job_log(job, offset):
+    for data in job.iter_log(offset, ENV.TP_AUTO_LOG_BATCH_BYTES, ENV.TP_AUTO_LOG_BATCH_INTERVAL):
+        if data:
+            yield data.decode("utf-8", errors="replace")
+
+@app.route('/jobs')
+def list_jobs():
+    """ Show all queued, running and recently finished jobs """
+    return jsonify({
+        "maxWorkers": job_manager.max_workers,
+        "jobs": job_manager.list(),
+    })
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """ Show the state of one job """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"message": f"Job {job_id} not found"}), 404
+    return jsonify(dict(job.to_dict(), position=job_manager.get_position(job.id)))
+
+@app.route('/jobs/<job_id>/log')
+def get_job_log(job_id):
+    """ Read the log of a job from a byte offset, follow=true streams the log until the job is finished """
+    try:
+        offset = int(request.args.get("offset") or 0)
+        log_file = JobManager.get_log_file(job_manager.log_folder, job_id)
+    except ValueError:
+        return "Error: invalid job id or offset", 400
+    if offset < 0:
+        return "Error: offset must not be negative", 400
+    job = job_manager.get(job_id)
+    if job is None and not os.path.exists(log_file):
+        return f"Job {job_id} not found", 404
+
+    if job is not None and request.args.get("follow") == "true":
+        headers = {HEADER_JOB_STATE: job.state}
+        return Response(follow_job_log(job, offset), headers=headers, content_type='text/plain; charset=utf-8')
+
+    # a job of a previous server run only has its log file
+    end = job.log_size if job is not None else None
+    data = JobManager.read_log_file(log_file, offset, end)
+    headers = {
+        HEADER_JOB_STATE: job.state if job is not None else "unknown",
+        HEADER_LOG_OFFSET: str(offset + len(data)),
+    }
+    return Response(data, headers=headers, content_type='text/plain; charset=utf-8')
+
+@app.route('/jobs/<job_id>/events')
+def get_job_events(job_id):
+    """
+    Stream the log of a job as Server-Sent Events, from the offset query parameter or the Last-Event-ID header.
+
+    event: log, id: next log offset, data: {"seq", "offset", "lines"}, several lines are sent in one event
+    event: end, data: {"seq", "offset", "state", "returnCode"}, sent after the whole log was sent
+    A ': keepalive' comment is sent when there is no output, EventSource reconnects from the last received id.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"message": f"Job {job_id} not found, use /jobs/{job_id}/log to read its log"}), 404
+    try:
+        offset = int(request.headers.get("Last-Event-ID") or request.args.get("offset") or 0)
+    except ValueError:
+        return "Error: invalid offset", 400
+    if offset < 0:
+        return "Error: offset must not be negative", 400
+
+    def generate():
+        seq = 0
+        next_offset = offset
+        yield 'retry: 3000\n\n'
+        for data in job.iter_log(offset, ENV.TP_AUTO_LOG_BATCH_BYTES, ENV.TP_AUTO_LOG_BATCH_INTERVAL):
+            if not data:
+                yield ': keepalive\n\n'
+                continue
+            seq += 1
+            lines = data.decode("utf-8", errors="replace").splitlines()
+            event = {"seq": seq, "offset": next_offset, "lines": lines}
+            next_offset += len(data)
+            yield f'id: {next_offset}\nevent: log\ndata: {json.dumps(event)}\n\n'
+        seq += 1
+        event = {"seq": seq, "offset": next_offset, "state": job.state, "returnCode": job.return_code}
+        yield f'event: end\ndata: {json.dumps(event)}\n\n'
+
+    headers = {
+        HEADER_ONE_CLICK_JOB_ID: job.id,
+        "X-Accel-Buffering": "no",  # the ingress must not buffer the event stream
+    }
+    return Response(generate(), headers=headers, content_type='text/event-stream; charset=utf-8')
+
 @app.route('/run-cli-script')
 def run_cli_script():
     auto_case = request.args.get('case')
@@ -188,6 +305,17 @@ def get_env():
     merged = {**env_vars, **env_dict}
     return jsonify(merged)
 
+@app.route('/cluster-facts')
+def cluster_facts():
+    """ Show cached cluster facts, refresh=true will invalidate the cache and discover again """
+    from utils.cluster_discovery import ClusterDiscovery
+    if request.args.get("refresh") == "true":
+        ClusterDiscovery.invalidate()
+    return jsonify({
+        "cacheKey": ClusterDiscovery.get_cache_key(),
+        "facts": ClusterDiscovery.redact(ClusterDiscovery.discover()),
+    })
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     file = request.files.get('file')
@@ -0,0 +1,15 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import os
+import shutil
+import tempfile
+
+# utils.env reads these when it is imported, so they are set before the test modules are collected,
+# a test run writes its report, caches, telemetry and job logs to a temp folder instead of the working tree
+_TEST_OUTPUT_FOLDER = tempfile.mkdtemp(prefix="tp-auto-tests-")
+os.environ["TP_AUTO_REPORT_PATH"] = os.path.join(_TEST_OUTPUT_FOLDER, "report")
+os.environ["TP_AUTO_SHARED_REPORT_PATH"] = os.environ["TP_AUTO_REPORT_PATH"]
+os.environ["TP_AUTO_JOB_LOG_PATH"] = os.path.join(_TEST_OUTPUT_FOLDER, "job-logs")
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_TEST_OUTPUT_FOLDER, ignore_errors=True)
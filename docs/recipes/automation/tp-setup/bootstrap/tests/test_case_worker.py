@@ -0,0 +1,150 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import os
+import sys
+import textwrap
+import types
+
+import pytest
+
+from utils import case_worker as case_worker_module
+from utils.case_worker import PROJECT_PATH, CaseWorker
+
+@pytest.fixture
+def write_case(tmp_path, monkeypatch):
+    """Write a case module to tmp_path, the case worker imports it from PYTHONPATH."""
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+
+    def write(name, source):
+        (tmp_path / f"{name}.py").write_text(textwrap.dedent(source))
+        return name
+    return write
+
+@pytest.fixture
+def case_worker():
+    worker = CaseWorker(5)
+    yield worker
+    worker.stop()
+
+def run(case_worker, case, env_vars=None):
+    """Run case in the worker like JobManager does, return (pid, output lines, return code)."""
+    if not case_worker.is_available():
+        case_worker.start()
+    pid = case_worker.process.pid
+    case_worker.submit(case, {**os.environ, **(env_vars or {})})
+    lines = [line.decode("utf-8").rstrip("\n") for line in case_worker.read_output() if line.strip()]
+    return pid, lines, case_worker.return_code
+
+def test_worker_is_replaced_after_playwright_is_left_running(case_worker, write_case):
+    pytest.importorskip("playwright.sync_api")
+    leave_playwright = write_case("leave_playwright", """
+        from playwright.sync_api import sync_playwright
+        sync_playwright().start()
+        print("started")
+    """)
+    use_playwright = write_case("use_playwright", """
+        from playwright.sync_api import sync_playwright
+        with sync_playwright():
+            print("playwright works")
+    """)
+
+    first_pid, lines, return_code = run(case_worker, leave_playwright)
+    assert return_code == 0 and "started" in lines
+    assert not case_worker.is_available()
+
+    second_pid, lines, return_code = run(case_worker, use_playwright)
+    assert second_pid != first_pid
+    assert (lines, return_code) == (["playwright works"], 0)
+    # Playwright was stopped, the worker is kept for the next job
+    assert case_worker.is_available()
+
+def test_jobs_get_their_own_environment(case_worker, write_case):
+    print_env = write_case("print_env", """
+        import os
+        print(f"job={os.environ.get('JOB_NAME')} leaked={os.environ.get('LEAKED_BY_JOB')}")
+        os.environ["LEAKED_BY_JOB"] = os.environ["JOB_NAME"]
+    """)
+
+    first_pid, first_lines, _ = run(case_worker, print_env, {"JOB_NAME": "a"})
+    second_pid, second_lines, _ = run(case_worker, print_env, {"JOB_NAME": "b"})
+    assert first_pid == second_pid
+    assert first_lines == ["job=a leaked=None"]
+    assert second_lines == ["job=b leaked=None"]
+
+def test_output_after_the_end_of_a_job_does_not_go_to_the_next_job(case_worker, write_case):
+    leave_thread = write_case("leave_thread", """
+        import threading
+        import time
+
+        def print_later():
+            time.sleep(3)
+            print("late output of thread")
+        threading.Thread(target=print_later, daemon=True).start()
+    """)
+    leave_child_process = write_case("leave_child_process", """
+        import subprocess
+        subprocess.Popen(["sh", "-c", "sleep 2; echo late output of child process"])
+    """)
+    finish_thread = write_case("finish_thread", """
+        import threading
+        import time
+
+        def print_soon():
+            time.sleep(0.2)
+            print("output of thread")
+        threading.Thread(target=print_soon).start()
+    """)
+    print_done = write_case("print_done", """
+        import time
+        time.sleep(3)
+        print("done")
+    """)
+
+    for case in (leave_thread, leave_child_process):
+        first_pid, lines, return_code = run(case_worker, case)
+        assert return_code == 0
+        assert any("Case worker is replaced after this job" in line for line in lines)
+        second_pid, lines, return_code = run(case_worker, print_done)
+        assert second_pid != first_pid
+        assert (lines, return_code) == (["done"], 0)
+
+    # a thread which ends in the grace period writes to its own job, the worker is kept
+    first_pid, lines, _ = run(case_worker, finish_thread)
+    assert lines == ["output of thread"]
+    assert case_worker.is_available() and case_worker.process.pid == first_pid
+
+def test_unload_keeps_packages_of_a_venv_inside_the_project(monkeypatch):
+    venv_path = os.path.join(PROJECT_PATH, ".venv")
+    library_module = types.ModuleType("fake_library")
+    library_module.__file__ = os.path.join(venv_path, "lib", "python3.13", "site-packages", "fake_library", "__init__.py")
+    project_module = types.ModuleType("utils.fake_project_module")
+    project_module.__file__ = os.path.join(PROJECT_PATH, "utils", "fake_project_module.py")
+    monkeypatch.setattr(sys, "prefix", venv_path)
+    monkeypatch.setitem(sys.modules, "fake_library", library_module)
+    monkeypatch.setitem(sys.modules, "utils.fake_project_module", project_module)
+
+    case_worker_module._unload_project_modules()
+
+    assert sys.modules.get("fake_library") is library_module
+    assert "utils.fake_project_module" not in sys.modules
+
+def test_atexit_handlers_of_a_job_run_when_the_job_ends(case_worker, write_case):
+    register_handlers = write_case("register_handlers", """
+        import atexit
+
+        def unregistered():
+            print("unregistered")
+        atexit.register(print, "first registered")
+        atexit.register(unregistered)
+        atexit.register(print, "last registered")
+        atexit.unregister(unregistered)
+        print("job")
+    """)
+    print_done = write_case("print_done", """
+        print("done")
+    """)
+
+    first_pid, lines, _ = run(case_worker, register_handlers)
+    assert lines == ["job", "last registered", "first registered"]
+    second_pid, lines, _ = run(case_worker, print_done)
+    assert (second_pid, lines) == (first_pid, ["done"])
@@ -0,0 +1,37 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import asyncio
+import threading
+import time
+
+from utils.command_executor import AsyncCommandExecutor
+from utils.helper import Helper
+
+def test_run_all_sync_can_be_called_again_with_a_new_event_loop():
+    executor = AsyncCommandExecutor(max_concurrency=2, timeout=10)
+    for _ in range(3):
+        results = executor.run_all_sync(["echo a", "echo b", "echo c"])
+        assert [result.stdout for result in results] == ["a", "b", "c"]
+        assert all(result.is_success for result in results)
+
+def test_run_all_sync_inside_running_event_loop():
+    async def main():
+        return AsyncCommandExecutor(timeout=10).run_all_sync(["echo a"])
+    assert asyncio.run(main())[0].stdout == "a"
+
+def test_timeout_kills_command():
+    start_time = time.time()
+    results = AsyncCommandExecutor(timeout=1).run_all_sync(["sleep 30", "echo done"])
+    assert results[0].is_timeout and not results[0].is_success
+    assert results[1].stdout == "done"
+    assert time.time() - start_time < 10
+
+def test_cancel_from_another_thread():
+    executor = AsyncCommandExecutor(timeout=30)
+    threading.Timer(0.5, executor.cancel).start()
+    results = executor.run_all_sync(["sleep 30"])
+    assert results[0].is_cancelled
+
+def test_default_timeout_is_finite():
+    assert Helper.COMMAND_TIMEOUT and Helper.SCRIPT_TIMEOUT
+    assert AsyncCommandExecutor().timeout == Helper.COMMAND_TIMEOUT
@@ -0,0 +1,43 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import os
+import time
+import uuid
+
+from utils.job_manager import JobManager
+
+def create_job_files(folder, count, suffix, age=0):
+    paths = []
+    for index in range(count):
+        path = folder / f"{uuid.uuid4()}{suffix}"
+        if suffix:
+            path.write_text("log")
+        else:
+            path.mkdir()
+            (path / "report.yaml").write_text("report")
+        mtime = time.time() - age - index
+        os.utime(path, (mtime, mtime))
+        paths.append(path)
+    return paths
+
+def test_startup_removes_old_job_logs_and_workspaces(tmp_path):
+    log_folder, workspace_folder = tmp_path / "job-logs", tmp_path / "jobs"
+    log_folder.mkdir()
+    workspace_folder.mkdir()
+    logs = create_job_files(log_folder, 5, ".log")
+    expired_logs = create_job_files(log_folder, 2, ".log", age=3600)
+    workspaces = create_job_files(workspace_folder, 5, "")
+    other_file = log_folder / "server.log"
+    other_file.write_text("not a job log")
+
+    JobManager(1, str(log_folder), history_size=3, workspace_folder=str(workspace_folder), history_ttl=600)
+
+    assert [path.exists() for path in logs] == [True, True, True, False, False]
+    assert not any(path.exists() for path in expired_logs)
+    assert [path.exists() for path in workspaces] == [True, True, True, False, False]
+    assert other_file.exists()
+
+def test_remove_old_files_without_age_limit(tmp_path):
+    logs = create_job_files(tmp_path, 3, ".log", age=30 * 24 * 3600)
+    assert JobManager.remove_old_files(str(tmp_path), ".log", 2) == 1
+    assert [path.exists() for path in logs] == [True, True, False]
@@ -0,0 +1,118 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import yaml
+
+from utils.helper import Helper
+from utils.k8s_client import KubernetesClient, KubernetesClientError
+
+TOKEN = "test-token"
+RESPONSES = {
+    "/version": {"major": "1", "minor": "31"},
+    "/api/v1/nodes": {"items": [
+        {"metadata": {"name": "node-1.example.com"}, "status": {"conditions": [{"type": "Ready", "status": "True"}]}},
+        {"metadata": {"name": "node-2"}, "status": {"conditions": [{"type": "Ready", "status": "False"}]}},
+        {"metadata": {"name": "node-3"}, "spec": {"unschedulable": True}, "status": {"conditions": [{"type": "Ready", "status": "True"}]}},
+    ]},
+    "/api/v1/namespaces/elastic-system/secrets/dp-config-es-es-elastic-user": {
+        "data": {"elastic": base64.b64encode(b"elastic-password").decode()},
+    },
+}
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Authorization")))
+        if self.headers.get("Authorization") != f"Bearer {TOKEN}":
+            self._send(401, {"kind": "Status", "code": 401})
+        elif self.path in RESPONSES:
+            self._send(200, RESPONSES[self.path])
+        else:
+            self._send(404, {"kind": "Status", "code": 404})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def fake_api_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def write_kubeconfig(tmp_path, server, user):
+    kubeconfig = tmp_path / "kubeconfig.yaml"
+    kubeconfig.write_text(yaml.safe_dump({
+        "current-context": "test",
+        "contexts": [{"name": "test", "context": {"cluster": "test", "user": "test"}}],
+        "clusters": [{"name": "test", "cluster": {"server": server}}],
+        "users": [{"name": "test", "user": user}],
+    }))
+    return str(kubeconfig)
+
+def test_queries_fake_api_server_with_keep_alive(tmp_path, fake_api_server):
+    server_url = f"http://127.0.0.1:{fake_api_server.server_port}"
+    client = KubernetesClient.from_kubeconfig(write_kubeconfig(tmp_path, server_url, {"token": TOKEN}))
+    try:
+        assert client.get_version()["minor"] == "31"
+        assert len(client.list_nodes()) == 3
+        assert client.get_secret("elastic-system", "dp-config-es-es-elastic-user")["data"]["elastic"]
+        assert all(authorization == f"Bearer {TOKEN}" for _, authorization in fake_api_server.requests)
+        # all requests reused one pooled connection
+        assert client._pool.qsize() == 1
+    finally:
+        client.close()
+
+def test_not_found_raises_error_with_status(tmp_path, fake_api_server):
+    server_url = f"http://127.0.0.1:{fake_api_server.server_port}"
+    client = KubernetesClient.from_kubeconfig(write_kubeconfig(tmp_path, server_url, {"token": TOKEN}))
+    try:
+        with pytest.raises(KubernetesClientError) as error:
+            client.get_secret("automation", "missing")
+        assert error.value.status == 404
+    finally:
+        client.close()
+
+@pytest.mark.parametrize("user", [
+    {"client-certificate-data": "not base64!", "client-key-data": "not base64!"},
+    {"client-certificate-data": base64.b64encode(b"not a certificate").decode(),
+     "client-key-data": base64.b64encode(b"not a key").decode()},
+    {"client-certificate": "missing.crt", "client-key": "missing.key"},
+])
+def test_invalid_tls_settings_raise_client_error(tmp_path, user):
+    with pytest.raises(KubernetesClientError):
+        KubernetesClient.from_kubeconfig(write_kubeconfig(tmp_path, "https://127.0.0.1:6443", user))
+
+def test_unsupported_exec_user_raises_client_error(tmp_path):
+    with pytest.raises(KubernetesClientError):
+        KubernetesClient.from_kubeconfig(write_kubeconfig(tmp_path, "https://127.0.0.1:6443", {"exec": {"command": "aws"}}))
+
+def test_helper_queries_use_native_client(tmp_path, fake_api_server, monkeypatch):
+    server_url = f"http://127.0.0.1:{fake_api_server.server_port}"
+    monkeypatch.setenv("TP_AUTO_K8S_NATIVE_CLIENT", "true")
+    monkeypatch.setenv("TP_AUTO_KUBECONFIG", write_kubeconfig(tmp_path, server_url, {"token": TOKEN}))
+    assert Helper.get_node_name() == "node-1"
+    assert Helper.get_elastic_password() == "elastic-password"
+    assert ("/api/v1/nodes", f"Bearer {TOKEN}") in fake_api_server.requests
+
+def test_helper_falls_back_when_kubeconfig_has_invalid_certificate(tmp_path, monkeypatch):
+    user = {"client-certificate-data": "not base64!", "client-key-data": "not base64!"}
+    monkeypatch.setenv("TP_AUTO_K8S_NATIVE_CLIENT", "true")
+    monkeypatch.setenv("TP_AUTO_KUBECONFIG", write_kubeconfig(tmp_path, "https://127.0.0.1:6443", user))
+    assert Helper.get_k8s_client() is None
@@ -0,0 +1,137 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+from utils.report import ReportYamlHandler
+
+@pytest.fixture
+def report(tmp_path):
+    return ReportYamlHandler(SimpleNamespace(TP_AUTO_REPORT_PATH=str(tmp_path), TP_AUTO_REPORT_YAML_FILE="report.yaml"))
+
+def read_file(report):
+    with open(report.yaml_file_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+def test_set_and_get_dotted_keys(report):
+    report.set(".ENV.CP_URL", "https://cp.example.com")
+    report.set(".ENV.CP_PORT", 443)
+    report.set(".ENV.IS_READY", True)
+    report.set(".ENV.HOSTS", ["a", "b"])
+
+    assert report.get(".ENV.CP_URL") == "https://cp.example.com"
+    assert report.get(".ENV.CP_PORT") == "443"
+    assert report.get(".ENV.IS_READY") == "true"
+    assert report.get(".ENV.HOSTS") == "- a\n- b"
+    assert report.get(".ENV.MISSING") is None
+    assert report.get(".MISSING.KEY") is None
+    assert read_file(report)["ENV"]["IS_READY"] is True
+
+def test_set_replaces_a_scalar_parent(report):
+    report.set(".ENV", "scalar")
+    report.set(".ENV.CP_URL", "url")
+    assert report.get(".ENV.CP_URL") == "url"
+
+def test_to_text(report):
+    assert ReportYamlHandler._to_text(False) == "false"
+    assert ReportYamlHandler._to_text(1.5) == "1.5"
+    assert ReportYamlHandler._to_text(" text \n") == "text"
+    assert ReportYamlHandler._to_text([1, True]) == "- 1\n- true"
+    assert ReportYamlHandler._to_text({"name": "dp1"}) == "name: dp1"
+
+def test_reload_when_file_is_changed_by_another_process(report):
+    report.set(".ENV.CP_URL", "old")
+    other = ReportYamlHandler(SimpleNamespace(TP_AUTO_REPORT_PATH=report.yaml_folder, TP_AUTO_REPORT_YAML_FILE="report.yaml"))
+    other.set(".ENV.CP_URL", "new")
+    assert report.get(".ENV.CP_URL") == "new"
+
+def test_named_lists_are_upserted_by_name(report):
+    report.set_dataplane("dp1")
+    report.set_dataplane("dp1")
+    report.set_dataplane("dp2")
+    report.set_dataplane_info("dp1", "tunnelConnected", True)
+    report.set_capability("dp1", "flogo")
+    report.set_capability("dp1", "flogo")
+    report.set_capability_info("dp1", "flogo", "status", "ok")
+    report.set_capability_app("dp1", "flogo", "app1")
+    report.set_capability_app("dp1", "flogo", "app1")
+    report.set_capability_app_info("dp1", "flogo", "app1", "status", "Running")
+    # unknown parents are ignored
+    report.set_capability("missing", "flogo")
+    report.set_capability_app_info("dp1", "flogo", "missing", "status", "Running")
+
+    assert report.get_dataplanes() == ["dp1", "dp2"]
+    assert report.get_dataplane_info("dp1", "tunnelConnected") == "true"
+    assert report.get_capabilities("dp1") == ["flogo"]
+    assert report.get_capability_info("dp1", "flogo", "status") == "ok"
+    assert report.get_capability_apps("dp1", "flogo") == ["app1"]
+    assert report.get_capability_app_info("dp1", "flogo", "app1", "status") == "Running"
+    assert report.get_capabilities("missing") == []
+
+    report.remove_capability_app("dp1", "flogo", "app1")
+    report.remove_dataplane("dp2")
+    assert report.get_capability_apps("dp1", "flogo") == []
+    assert read_file(report)["dataPlane"] == [
+        {"name": "dp1", "tunnelConnected": True, "capability": [{"name": "flogo", "status": "ok", "app": []}]},
+    ]
+
+def test_transaction_writes_once_on_exit(report):
+    with report.transaction():
+        report.set(".ENV.A", "1")
+        report.set(".ENV.B", "2")
+        assert read_file(report) == {}
+        assert report.get(".ENV.A") == "1"
+    assert read_file(report) == {"ENV": {"A": "1", "B": "2"}}
+
+def test_transaction_rollback(report):
+    report.set(".ENV.A", "1")
+    with pytest.raises(RuntimeError):
+        with report.transaction():
+            report.set(".ENV.A", "changed")
+            report.set(".ENV.B", "2")
+            raise RuntimeError("failed")
+    assert report.get(".ENV.A") == "1"
+    assert report.get(".ENV.B") is None
+    assert read_file(report) == {"ENV": {"A": "1"}}
+
+def test_nested_transaction_rollback_keeps_outer_changes(report):
+    with report.transaction():
+        report.set(".ENV.A", "1")
+        try:
+            with report.transaction():
+                report.set(".ENV.A", "changed")
+                report.set(".ENV.B", "2")
+                raise RuntimeError("failed")
+        except RuntimeError:
+            pass
+        report.set(".ENV.C", "3")
+    assert read_file(report) == {"ENV": {"A": "1", "C": "3"}}
+
+def test_merge_file(report, tmp_path):
+    report.set(".ENV.CP_URL", "shared")
+    report.set_dataplane("dp1")
+    report.set_capability("dp1", "flogo")
+    report.set_capability_info("dp1", "flogo", "status", "old")
+    job_report_file = tmp_path / "job-report.yaml"
+    job_report_file.write_text(yaml.safe_dump({
+        "ENV": {"CP_URL": "job", "CP_USER": "user"},
+        "dataPlane": [
+            {"name": "dp1", "capability": [{"name": "flogo", "status": "new"}, {"name": "bwce"}]},
+            {"name": "dp2"},
+        ],
+    }))
+
+    report.merge_file(str(job_report_file))
+
+    assert read_file(report) == {
+        "ENV": {"CP_URL": "job", "CP_USER": "user"},
+        "dataPlane": [
+            {"name": "dp1", "capability": [{"name": "flogo", "status": "new"}, {"name": "bwce"}]},
+            {"name": "dp2"},
+        ],
+    }
+    # a missing job report changes nothing
+    report.merge_file(str(tmp_path / "missing.yaml"))
+    assert report.get_dataplanes() == ["dp1", "dp2"]
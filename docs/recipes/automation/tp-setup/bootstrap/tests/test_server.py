@@ -0,0 +1,31 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+from types import SimpleNamespace
+
+import pytest
+
+import server
+from utils.job_manager import Job
+
+SHARED_FILES = [".cluster-facts.json", ".dns-cache.json", ".auth-state", "telemetry", ".report-tmp.yaml", "jobs"]
+
+@pytest.fixture
+def report_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(server.job_manager, "jobs", {})
+    for name in [".auth-state", "telemetry", "jobs", "screenshots"]:
+        (tmp_path / name).mkdir()
+    for name in [".cluster-facts.json", ".dns-cache.json", ".report-tmp.yaml", "report.yaml", "report.txt"]:
+        (tmp_path / name).write_text("data")
+    return tmp_path
+
+def clean(report_folder, running_job_states):
+    for index, state in enumerate(running_job_states):
+        server.job_manager.jobs[f"other-{index}"] = SimpleNamespace(id=f"other-{index}", state=state)
+    server.clean_report_folder(str(report_folder), SimpleNamespace(id="job"))
+    return sorted(path.name for path in report_folder.iterdir())
+
+def test_clean_report_keeps_shared_files(report_folder):
+    assert clean(report_folder, [Job.SUCCEEDED]) == sorted(SHARED_FILES)
+
+def test_clean_report_keeps_report_yaml_while_other_jobs_run(report_folder):
+    assert clean(report_folder, [Job.RUNNING]) == sorted(SHARED_FILES + ["report.yaml"])
@@ -0,0 +1,55 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.util import Util
+
+class FakePage:
+    def __init__(self):
+        self.listeners = []
+
+    def on(self, event, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, event, listener):
+        self.listeners.remove(listener)
+
+class FakeLocator:
+    """Never visible, the page receives the responses of responses_per_wait[n] during the n-th wait."""
+    def __init__(self, page, responses_per_wait):
+        self.page = page
+        self.responses_per_wait = list(responses_per_wait)
+
+    def wait_for(self, state, timeout):
+        for response in (self.responses_per_wait.pop(0) if self.responses_per_wait else []):
+            for listener in self.page.listeners:
+                listener(response)
+        time.sleep(timeout / 1000)
+        raise PlaywrightTimeoutError("not visible")
+
+class FakeResponse:
+    def __init__(self, is_api):
+        self.url = "https://cp.example.com/api"
+        self.is_api = is_api
+
+def test_wait_for_dom_skips_reload_while_page_polls(monkeypatch):
+    reloads = []
+    monkeypatch.setattr(Util, "refresh_page", lambda page: reloads.append(page))
+    page = FakePage()
+    # 1st wait: a status response, no reload; 2nd wait: only other responses, reload
+    locator = FakeLocator(page, [[FakeResponse(True)], [FakeResponse(False)]])
+
+    is_visible = Util.wait_for_dom(page, locator, max_wait=0.5, reload_after=0.2, response_predicate=lambda response: response.is_api)
+
+    assert not is_visible
+    assert reloads == [page]
+    assert page.listeners == []
+
+def test_wait_for_dom_without_reload(monkeypatch):
+    reloads = []
+    monkeypatch.setattr(Util, "refresh_page", lambda page: reloads.append(page))
+    page = FakePage()
+    assert not Util.wait_for_dom(page, FakeLocator(page, []), max_wait=0.2)
+    assert reloads == []
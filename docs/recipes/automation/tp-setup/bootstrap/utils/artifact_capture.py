@@ -0,0 +1,107 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import os
+import re
+import shutil
+import tempfile
+from playwright.sync_api import ViewportSize
+
+from utils.color_logger import ColorLogger
+
+class ArtifactCapture:
+    """
+    Video and trace capture of one browser context, following a capture policy:
+
+    - off: no video, no trace
+    - always: keep the video, and save every trace chunk
+    - retain-on-failure: record to a temp folder, and only keep the video and the trace chunk of the failed step
+
+    Tracing is split into one chunk per step, see start_step(), saved as trace-<NN>-<step>.zip.
+    """
+    POLICY_OFF = "off"
+    POLICY_ALWAYS = "always"
+    POLICY_RETAIN_ON_FAILURE = "retain-on-failure"
+    POLICIES = (POLICY_OFF, POLICY_ALWAYS, POLICY_RETAIN_ON_FAILURE)
+
+    def __init__(self, output_dir, policy=POLICY_ALWAYS, is_trace=True, video_size="2000x1080"):
+        if policy not in ArtifactCapture.POLICIES:
+            ColorLogger.warning(f"Unknown capture policy '{policy}', use '{ArtifactCapture.POLICY_ALWAYS}', supported: {ArtifactCapture.POLICIES}")
+            policy = ArtifactCapture.POLICY_ALWAYS
+        self.output_dir = output_dir
+        self.policy = policy
+        self.is_trace = is_trace and policy != ArtifactCapture.POLICY_OFF
+        self.video_size = ArtifactCapture.parse_size(video_size)
+        self.video_dir = ""
+        if policy == ArtifactCapture.POLICY_ALWAYS:
+            self.video_dir = output_dir
+        elif policy == ArtifactCapture.POLICY_RETAIN_ON_FAILURE:
+            self.video_dir = tempfile.mkdtemp(prefix="tp-auto-video-")
+        self.is_failed = False
+        self._context = None
+        self._step_index = 0
+        self._step_name = ""
+
+    @staticmethod
+    def parse_size(size):
+        match = re.fullmatch(r"\s*(\d+)\s*[xX]\s*(\d+)\s*", size or "")
+        if not match:
+            ColorLogger.warning(f"Invalid video size '{size}', use 2000x1080")
+            return ViewportSize(width=2000, height=1080)
+        return ViewportSize(width=int(match.group(1)), height=int(match.group(2)))
+
+    def get_context_options(self):
+        if not self.video_dir:
+            return {}
+        return {"record_video_dir": self.video_dir, "record_video_size": self.video_size}
+
+    def start(self, context, step_name):
+        if not self.is_trace:
+            return
+        self._context = context
+        ColorLogger.info(f"Start tracing with screenshots, snapshots, and sources, capture policy: {self.policy}.")
+        context.tracing.start(screenshots=True, snapshots=True, sources=True)
+        self._start_chunk(step_name)
+
+    def start_step(self, step_name):
+        """End the trace chunk of the current step, and start a new chunk."""
+        if self._context is None:
+            return
+        self._stop_chunk(self.policy == ArtifactCapture.POLICY_ALWAYS)
+        self._start_chunk(step_name)
+
+    def mark_failed(self):
+        self.is_failed = True
+
+    def stop(self):
+        """Save the trace chunk of the current step and stop tracing, call it before the context is closed."""
+        if self._context is None:
+            return
+        self._stop_chunk(self.policy == ArtifactCapture.POLICY_ALWAYS or self.is_failed)
+        self._context.tracing.stop()
+        self._context = None
+
+    def finish(self):
+        """Keep or drop the recorded videos, call it after the context is closed."""
+        if self.policy != ArtifactCapture.POLICY_RETAIN_ON_FAILURE or not self.video_dir:
+            return
+        if self.is_failed and os.path.isdir(self.video_dir):
+            os.makedirs(self.output_dir, exist_ok=True)
+            for file_name in os.listdir(self.video_dir):
+                shutil.move(os.path.join(self.video_dir, file_name), os.path.join(self.output_dir, file_name))
+                ColorLogger.info(f"Video file saved to: {os.path.join(self.output_dir, file_name)}")
+        shutil.rmtree(self.video_dir, ignore_errors=True)
+        self.video_dir = ""
+
+    def _start_chunk(self, step_name):
+        self._step_index += 1
+        self._step_name = re.sub(r"[^A-Za-z0-9_.-]+", "-", step_name).strip("-") or "step"
+        self._context.tracing.start_chunk(title=step_name)
+
+    def _stop_chunk(self, is_save):
+        if not is_save:
+            self._context.tracing.stop_chunk()
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        trace_path = os.path.join(self.output_dir, f"trace-{self._step_index:02d}-{self._step_name}.zip")
+        self._context.tracing.stop_chunk(path=trace_path)
+        ColorLogger.info(f"Save tracing to file: {trace_path}")
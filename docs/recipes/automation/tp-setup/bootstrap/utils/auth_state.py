@@ -0,0 +1,88 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from utils.env import ENV
+
+class AuthState:
+    """
+    Save the browser storage state (cookies and localStorage) after a successful login, per CP login URL and user,
+    so the next case restores it into its new context instead of going through the login page.
+
+    A saved state is used for TP_AUTO_LOGIN_STATE_TTL seconds, or until one of its cookies expires.
+    """
+    # localStorage can only be set on the page origin, so it is restored by an init script before the page scripts run,
+    # only once per tab, later page loads keep what the app changed
+    RESTORE_LOCAL_STORAGE_SCRIPT = """
+        (origins) => {
+            const origin = origins.find((item) => item.origin === window.location.origin);
+            if (origin && !window.sessionStorage.getItem("tp-auto-restored")) {
+                window.sessionStorage.setItem("tp-auto-restored", "true");
+                for (const item of origin.localStorage) {
+                    window.localStorage.setItem(item.name, item.value);
+                }
+            }
+        }
+    """
+
+    @staticmethod
+    def is_enabled():
+        return ENV.TP_AUTO_LOGIN_STATE_TTL > 0
+
+    @staticmethod
+    def get_state_file(url, user):
+        key = hashlib.sha1(f"{url}|{user}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(ENV.TP_AUTO_SHARED_REPORT_PATH, ENV.TP_AUTO_LOGIN_STATE_FOLDER, f"{key}.json")
+
+    @staticmethod
+    def load(url, user):
+        """Return the saved storage state, or None if there is none, or it is expired."""
+        if not AuthState.is_enabled():
+            return None
+        state_file = AuthState.get_state_file(url, user)
+        try:
+            if time.time() - os.path.getmtime(state_file) > ENV.TP_AUTO_LOGIN_STATE_TTL:
+                AuthState.invalidate(url, user)
+                return None
+            with open(state_file, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # cookies with expires -1 are session cookies
+        cookies = state.get("cookies") or []
+        if not cookies or any(0 < cookie.get("expires", -1) < time.time() for cookie in cookies):
+            AuthState.invalidate(url, user)
+            return None
+        return state
+
+    @staticmethod
+    def save(context, url, user):
+        if not AuthState.is_enabled():
+            return
+        state_file = AuthState.get_state_file(url, user)
+        os.makedirs(os.path.dirname(state_file), exist_ok=True)
+        # the state holds session cookies, mkstemp creates the file only readable by the current user
+        fd, tmp_path = tempfile.mkstemp(prefix=".auth-state-", suffix=".json", dir=os.path.dirname(state_file))
+        with os.fdopen(fd, "w") as f:
+            json.dump(context.storage_state(), f)
+        os.replace(tmp_path, state_file)
+        print(f"Saved login state of user {user} to {state_file}")
+
+    @staticmethod
+    def restore(context, state):
+        context.add_cookies(state.get("cookies") or [])
+        origins = [origin for origin in state.get("origins") or [] if origin.get("localStorage")]
+        if origins:
+            context.add_init_script(f"({AuthState.RESTORE_LOCAL_STORAGE_SCRIPT})({json.dumps(origins)})")
+
+    @staticmethod
+    def invalidate(url, user):
+        try:
+            os.remove(AuthState.get_state_file(url, user))
+        except OSError:
+            pass
@@ -0,0 +1,159 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import hashlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.error import URLError
+
+from utils.color_logger import ColorLogger
+
+# do not import env.py or util.py in this file, the browser server runs as its own process
+class BrowserServer:
+    """
+    A long-lived Chromium which case processes attach to over CDP, so a case only opens a new context
+    instead of starting Chromium for every run.
+
+    BrowserServer.get_endpoint(args, is_headless) returns the endpoint of a running server with the same launch args,
+    or starts one in the background (python -m utils.browser_server). The server stops itself after
+    TP_AUTO_BROWSER_SERVER_IDLE_TIMEOUT seconds without any open page.
+    """
+    IDLE_TIMEOUT = int(os.environ.get("TP_AUTO_BROWSER_SERVER_IDLE_TIMEOUT") or 600)
+    START_TIMEOUT = 30
+    CHECK_INTERVAL = 5
+    DEFAULT_ARGS = ["--no-sandbox", "--disable-dev-shm-usage", "--no-first-run", "--no-default-browser-check", "--mute-audio"]
+
+    @staticmethod
+    def get_endpoint(args, is_headless):
+        """Return the CDP endpoint of a browser server launched with args, start it if it is not running, empty string on failure."""
+        state_file = BrowserServer.get_state_file(args, is_headless)
+        endpoint = BrowserServer._get_live_endpoint(state_file)
+        if endpoint:
+            return endpoint
+
+        print(f"Starting browser server, state file: {state_file}")
+        server_process = subprocess.Popen(
+            [sys.executable, "-m", "utils.browser_server", state_file, json.dumps({"args": args, "headless": is_headless})],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        start_time = time.time()
+        while time.time() - start_time < BrowserServer.START_TIMEOUT:
+            endpoint = BrowserServer._get_live_endpoint(state_file)
+            if endpoint:
+                return endpoint
+            if server_process.poll() is not None:
+                ColorLogger.warning(f"Browser server exited with code {server_process.returncode}.")
+                return ""
+            time.sleep(0.2)
+        ColorLogger.warning(f"Browser server did not start in {BrowserServer.START_TIMEOUT} seconds.")
+        return ""
+
+    @staticmethod
+    def get_state_file(args, is_headless):
+        key = hashlib.sha1(json.dumps([sorted(args), bool(is_headless)]).encode("utf-8")).hexdigest()[:12]
+        return os.path.join(tempfile.gettempdir(), f"tp-auto-browser-{key}.json")
+
+    @staticmethod
+    def serve(state_file, args, is_headless):
+        """Run Chromium with a CDP port, and stop it when it has no open page for IDLE_TIMEOUT seconds."""
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            executable_path = playwright.chromium.executable_path
+
+        user_data_dir = tempfile.mkdtemp(prefix="tp-auto-browser-")
+        command = [executable_path, f"--user-data-dir={user_data_dir}", "--remote-debugging-port=0", *BrowserServer.DEFAULT_ARGS, *args]
+        if is_headless:
+            command += ["--headless", "--hide-scrollbars"]
+        browser_process = subprocess.Popen(command + ["about:blank"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # on SIGTERM, run the cleanup in finally
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+        endpoint = ""
+        try:
+            endpoint = BrowserServer._wait_for_endpoint(user_data_dir, browser_process)
+            # another case process started a server with the same args at the same time, keep that one
+            if not endpoint or BrowserServer._get_live_endpoint(state_file):
+                return
+            BrowserServer._write_state(state_file, {"endpoint": endpoint, "pid": os.getpid(), "browserPid": browser_process.pid})
+
+            last_active_time = time.time()
+            while browser_process.poll() is None:
+                time.sleep(BrowserServer.CHECK_INTERVAL)
+                is_replaced = (BrowserServer._read_state(state_file) or {}).get("endpoint") != endpoint
+                if BrowserServer._has_open_page(endpoint):
+                    last_active_time = time.time()
+                elif is_replaced or time.time() - last_active_time > BrowserServer.IDLE_TIMEOUT:
+                    break
+        finally:
+            if browser_process.poll() is None:
+                browser_process.terminate()
+                try:
+                    browser_process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    browser_process.kill()
+            if endpoint and (BrowserServer._read_state(state_file) or {}).get("endpoint") == endpoint:
+                os.remove(state_file)
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    @staticmethod
+    def _wait_for_endpoint(user_data_dir, browser_process):
+        # with --remote-debugging-port=0 Chromium picks a free port and writes it to DevToolsActivePort
+        port_file = os.path.join(user_data_dir, "DevToolsActivePort")
+        start_time = time.time()
+        while time.time() - start_time < BrowserServer.START_TIMEOUT and browser_process.poll() is None:
+            if os.path.exists(port_file):
+                with open(port_file, "r") as f:
+                    port = f.readline().strip()
+                if port:
+                    return f"http://127.0.0.1:{port}"
+            time.sleep(0.1)
+        return ""
+
+    @staticmethod
+    def _get_live_endpoint(state_file):
+        endpoint = (BrowserServer._read_state(state_file) or {}).get("endpoint", "")
+        if endpoint and BrowserServer._get_json(f"{endpoint}/json/version") is not None:
+            return endpoint
+        return ""
+
+    @staticmethod
+    def _has_open_page(endpoint):
+        targets = BrowserServer._get_json(f"{endpoint}/json/list") or []
+        return any(target.get("type") == "page" and target.get("url") != "about:blank" for target in targets)
+
+    @staticmethod
+    def _get_json(url):
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except (URLError, OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _read_state(state_file):
+        try:
+            with open(state_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_state(state_file, state):
+        temp_file = f"{state_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_file, state_file)
+
+if __name__ == "__main__":
+    options = json.loads(sys.argv[2])
+    BrowserServer.serve(sys.argv[1], options["args"], options["headless"])
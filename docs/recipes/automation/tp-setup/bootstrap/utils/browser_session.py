@@ -0,0 +1,105 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from playwright.sync_api import sync_playwright
+
+from utils.color_logger import ColorLogger
+from utils.env import ENV
+from utils.page_wait import PageWait
+from utils.util import Util
+
+class BrowserSession:
+    """
+    An independent browser, context and page for one worker thread.
+
+    Playwright sync objects can not be shared between threads, so every session starts its own Playwright,
+    and launches a browser, or attaches to the browser server when TP_AUTO_BROWSER_SERVER is true.
+    Video and trace of a session are saved in its own folder under the run report folder.
+    """
+    def __init__(self, name, is_headless=ENV.IS_HEADLESS):
+        self.name = name
+        self.is_headless = is_headless
+        self.output_dir = os.path.join(ENV.TP_AUTO_REPORT_PATH, str(ENV.RETRY_TIME_FOLDER), re.sub(r"[^A-Za-z0-9_.-]+", "-", name))
+        self.capture = None
+        self.page = None
+        self._playwright = None
+        self._browser = None
+        self._context = None
+
+    def open(self):
+        self._playwright = sync_playwright().start()
+        self._browser = Util.launch_browser(self._playwright, self.is_headless)
+        self._context, self.capture, _ = Util.new_context(self._browser, self.output_dir)
+        self.capture.start(self._context, self.name)
+        self.page = self._context.new_page()
+        PageWait.track_network(self.page)
+        Util._session_local.session = self
+        return self.page
+
+    def close(self):
+        Util._session_local.session = None
+        try:
+            if self._context is not None:
+                self.capture.stop()
+                self._context.close()
+                self.capture.finish()
+            if self._browser is not None:
+                self._browser.close()
+        finally:
+            if self._playwright is not None:
+                self._playwright.stop()
+            self._context = self._browser = self._playwright = None
+
+class BrowserSessionManager:
+    """
+    Run tasks concurrently, each task gets the page of its own BrowserSession, at most max_sessions at the same time.
+
+    A task is a function which takes the page, setup (e.g. login, the saved login state makes it fast) runs on
+    the page before the task. Tasks must not logout, because the CP session is shared with the other tasks.
+
+    failed = BrowserSessionManager(2, login).run_all({"flogo": provision_flogo, "ems": provision_ems})
+    """
+    def __init__(self, max_sessions=None, setup=None):
+        self.max_sessions = max_sessions or ENV.TP_AUTO_MAX_BROWSER_SESSIONS
+        self.setup = setup
+
+    def run_all(self, tasks):
+        """Run all tasks, return the names of the failed tasks."""
+        if not tasks:
+            return []
+        ColorLogger.info(f"Running {list(tasks)} with at most {self.max_sessions} browser sessions at the same time...")
+        with ThreadPoolExecutor(max_workers=self.max_sessions, thread_name_prefix="browser-session") as executor:
+            futures = {name: executor.submit(self._run_task, name, task) for name, task in tasks.items()}
+        return [name for name, future in futures.items() if not future.result()]
+
+    def _run_task(self, name, task):
+        start_time = time.time()
+        session = BrowserSession(name)
+        is_success = False
+        try:
+            page = session.open()
+            if self.setup is not None:
+                self.setup(page)
+            task(page)
+            is_success = True
+        except SystemExit:
+            # Util.exit_error was called in the task, it already printed the error
+            pass
+        except Exception as e:
+            ColorLogger.error(f"Session {name} failed: {e}")
+            if session.page is not None and not session.page.is_closed():
+                Util.screenshot_page(session.page, f"error-unhandled_error_{session.name}.png")
+            if session.capture is not None:
+                session.capture.mark_failed()
+        finally:
+            try:
+                session.close()
+            except Exception as e:
+                ColorLogger.warning(f"Failed to close session {name}: {e}")
+
+        if is_success:
+            ColorLogger.success(f"Session {name} completed in {time.time() - start_time:.2f} seconds.")
+        return is_success
@@ -0,0 +1,268 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import asyncio
+import atexit
+import importlib
+import json
+import os
+import runpy
+import signal
+import site
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+
+# do not import env.py or util.py in this file, they read the environment of a job when they are imported
+PROJECT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class CaseWorker:
+    """
+    A pre-warmed Python process which runs automation cases (case.xxx, page_xxx) one after another with runpy.
+
+    The worker imports the slow third-party modules (Playwright, ...) once. The project modules are imported
+    again for every job, because utils.env reads the environment of the job when it is imported.
+    Every job gets its own environment variables, a clean sys.modules for the project, and the worker stdout.
+    The worker exits after max_jobs jobs to bound leaks, or right after a job which left something running
+    (a Playwright instance which was not stopped, a thread or a child process which could still write to the output),
+    start() replaces it with a new one.
+
+    worker = CaseWorker(20, ["playwright.sync_api"])
+    worker.start()
+    worker.submit("case.k8s_create_dp", env_vars)
+    for line in worker.read_output(): ...
+    print(worker.return_code)
+    """
+    def __init__(self, max_jobs, warm_modules=()):
+        self.max_jobs = max_jobs
+        self.warm_modules = list(warm_modules)
+        self.process = None
+        self.job_count = 0
+        self.return_code = None
+        self.is_recycle_requested = False
+        self._token = ""
+
+    def is_available(self):
+        return (self.process is not None and self.process.poll() is None
+                and self.job_count < self.max_jobs and not self.is_recycle_requested)
+
+    def start(self):
+        self.stop()
+        env_vars = os.environ.copy()
+        env_vars["PYTHONIOENCODING"] = "utf-8"
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", "-m", "utils.case_worker", str(self.max_jobs), ",".join(self.warm_modules)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env_vars,
+            cwd=PROJECT_PATH
+        )
+        self.job_count = 0
+        self.is_recycle_requested = False
+        print(f"[INFO] Started case worker (PID: {self.process.pid})")
+        return self.process
+
+    def stop(self, timeout=5):
+        """Close the job input of the worker and wait until it exits, kill it if it does not exit in time."""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+
+    def submit(self, case, env_vars):
+        # the end of the job output is marked by a random token, so the case output can not end the job
+        self._token = uuid.uuid4().hex
+        self.job_count += 1
+        self.return_code = None
+        self.process.stdin.write((json.dumps({"case": case, "env": env_vars, "token": self._token}) + "\n").encode("utf-8"))
+        self.process.stdin.flush()
+
+    def read_output(self):
+        """Yield the output lines of the submitted job, set return_code when the job is finished."""
+        token = self._token.encode("utf-8")
+        for line in iter(self.process.stdout.readline, b""):
+            if line.startswith(token):
+                fields = line.split()
+                self.return_code = int(fields[1])
+                self.is_recycle_requested = b"recycle" in fields[2:]
+                return
+            yield line
+        # the worker exited during the job, e.g. the job is cancelled
+        self.return_code = self.process.wait()
+
+def _get_library_paths():
+    """The folders of the installed packages, a virtual environment can be inside the project (e.g. .venv of uv sync)."""
+    paths = [sys.prefix, sys.base_prefix, sys.exec_prefix, *site.getsitepackages()]
+    if site.ENABLE_USER_SITE:
+        paths.append(site.getusersitepackages())
+    return tuple(os.path.abspath(path) + os.sep for path in paths if path)
+
+def _unload_project_modules():
+    """Remove the project modules from sys.modules, the installed packages (Playwright, ...) stay imported."""
+    library_paths = _get_library_paths()
+    for name, module in list(sys.modules.items()):
+        module_file = os.path.abspath(getattr(module, "__file__", None) or "")
+        if (name != "__main__" and module_file.startswith(PROJECT_PATH + os.sep)
+                and not module_file.startswith(library_paths)):
+            del sys.modules[name]
+
+def _get_leftovers(threads_before, grace_period=1):
+    """Return what the finished job left running in the worker, which could break or write to the next job."""
+    leftovers = []
+    try:
+        asyncio.get_running_loop()
+        leftovers.append("a running asyncio event loop (e.g. Playwright was not stopped)")
+    except RuntimeError:
+        pass
+
+    # a thread which is about to end (e.g. a cancelled timer) gets a short grace period
+    deadline = time.time() + grace_period
+    threads = [thread for thread in threading.enumerate() if thread not in threads_before]
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.time()))
+    threads = [thread.name for thread in threads if thread.is_alive()]
+    if threads:
+        leftovers.append(f"threads {', '.join(threads)}")
+
+    child_pids = _get_child_pids()
+    if child_pids:
+        leftovers.append(f"child processes {', '.join(map(str, child_pids))}")
+    return leftovers
+
+def _get_child_pids():
+    """
+    Running child processes of the worker in its session, detached ones (e.g. the browser server) are not counted.
+    It needs /proc, on other systems only the event loop and threads are checked.
+    """
+    pids = set()
+    task_folder = f"/proc/{os.getpid()}/task"
+    try:
+        for task in os.listdir(task_folder):
+            with open(os.path.join(task_folder, task, "children"), "r") as f:
+                pids.update(int(pid) for pid in f.read().split())
+    except OSError:
+        return []
+
+    session_id = os.getsid(0)
+    child_pids = []
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                # the fields after "pid (comm)": state, ppid, pgrp, session, ...
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if fields[0] != "Z" and int(fields[3]) == session_id:
+            child_pids.append(pid)
+    return sorted(child_pids)
+
+def _kill_processes(pids):
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+class _JobExitHandlers:
+    """
+    Collect the atexit.register() calls of a job and run them when the job ends, as if the job process exited,
+    e.g. the CommandTelemetry run summary and the KubernetesClient temp certificate files.
+    The atexit handlers of the worker (e.g. registered by the warm modules) still run when the worker exits.
+    """
+    def __init__(self):
+        self.handlers = []
+        self._register = atexit.register
+        self._unregister = atexit.unregister
+
+    def __enter__(self):
+        atexit.register = self.register
+        atexit.unregister = self.unregister
+        return self
+
+    def __exit__(self, *exc_info):
+        atexit.register = self._register
+        atexit.unregister = self._unregister
+        # same as atexit, the last registered handler runs first
+        while self.handlers:
+            func, args, kwargs = self.handlers.pop()
+            try:
+                func(*args, **kwargs)
+            except BaseException:
+                traceback.print_exc()
+
+    def register(self, func, *args, **kwargs):
+        self.handlers.append((func, args, kwargs))
+        return func
+
+    def unregister(self, func):
+        self.handlers = [handler for handler in self.handlers if handler[0] != func]
+
+def _run_job(case, env_vars):
+    os.environ.clear()
+    os.environ.update(env_vars)
+    _unload_project_modules()
+    sys.argv = [case]
+    exit_code = 0
+    try:
+        with _JobExitHandlers():
+            try:
+                runpy.run_module(case, run_name="__main__", alter_sys=True)
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    exit_code = e.code or 0
+                else:
+                    print(e.code)
+                    exit_code = 1
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        os.chdir(PROJECT_PATH)
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return exit_code
+
+def main(max_jobs, warm_modules):
+    # jobs are read from stdin, the jobs and their commands get /dev/null as stdin
+    control_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    devnull_fd = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull_fd, 0)
+    os.close(devnull_fd)
+
+    for module_name in warm_modules:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"[WARNING] Case worker failed to import {module_name}: {e}")
+
+    for _ in range(max_jobs):
+        line = control_in.readline()
+        if not line:
+            break
+        job = json.loads(line)
+        threads_before = set(threading.enumerate())
+        exit_code = _run_job(job["case"], job["env"])
+        leftovers = _get_leftovers(threads_before)
+        if leftovers:
+            print(f"[WARNING] Case worker is replaced after this job, it left {', '.join(leftovers)}")
+            # the output of a child process after the end of the job must not go to the next job
+            _kill_processes(_get_child_pids())
+            sys.stdout.flush()
+        os.write(1, f"\n{job['token']} {exit_code}{' recycle' if leftovers else ''}\n".encode("utf-8"))
+        if leftovers:
+            # do not wait for the leftovers, the server starts a new worker for the next job
+            os._exit(0)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]), [module_name for module_name in sys.argv[2].split(",") if module_name])
@@ -0,0 +1,242 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import json
+import os
+import tempfile
+import threading
+import time
+import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.color_logger import ColorLogger
+from utils.command_executor import AsyncCommandExecutor
+from utils.helper import Helper
+
+# do not import env.py or util.py in this file, env.py reads cluster facts from here
+class ClusterDiscovery:
+    """
+    Run the kubectl/helm probes for cluster facts concurrently, and keep the results for the current process.
+
+    ClusterDiscovery.discover() runs all probes at once with a per-probe timeout, the kubectl/helm commands
+    run with AsyncCommandExecutor, the native Kubernetes client queries (TP_AUTO_K8S_NATIVE_CLIENT) in a bounded thread pool.
+    ClusterDiscovery.get(name) returns one fact, and only runs that probe if it was not discovered yet.
+
+    When a cache file is set (see env.py), facts are shared on disk between the case processes and the server,
+    keyed by kubeconfig path and current context, and expire after the TTL.
+    """
+    MAX_WORKERS = int(os.environ.get("TP_AUTO_DISCOVERY_MAX_WORKERS") or 4)
+    PROBE_TIMEOUT = int(os.environ.get("TP_AUTO_DISCOVERY_TIMEOUT") or 30)
+
+    # fact name: (environment variable which skips the probe when it is set, probe function)
+    PROBES = {
+        "is_cluster_accessible": ("", Helper.is_cluster_accessible),
+        "cp_version": ("TP_AUTO_CP_VERSION", Helper.get_cp_version),
+        "cp_dns_domain": ("TP_AUTO_CP_DNS_DOMAIN", Helper.get_cp_dns_domain),
+        "elastic_password": ("TP_AUTO_ELASTIC_PASSWORD", Helper.get_elastic_password),
+        "storage_class": ("TP_AUTO_STORAGE_CLASS", Helper.get_storage_class),
+        "cp_platform_bootstrap_version": ("", Helper.get_cp_platform_bootstrap_version),
+        "cp_platform_base_version": ("", Helper.get_cp_platform_base_version),
+        "node_name": ("", Helper.get_node_name),
+    }
+    # fact name: (kubectl command, function which returns the fact from the command output, None if the command failed)
+    KUBECTL_PROBES = {
+        "is_cluster_accessible": (Helper.CLUSTER_INFO_COMMAND, lambda output: "Kubernetes control plane" in (output or "")),
+        "cp_dns_domain": (Helper.CP_DNS_DOMAIN_COMMAND, lambda output: output),
+        "elastic_password": (Helper.ELASTIC_PASSWORD_COMMAND, lambda output: output),
+        "storage_class": (Helper.STORAGE_CLASS_COMMAND, lambda output: output),
+        "node_name": (Helper.NODE_NAME_COMMAND, lambda output: output),
+    }
+    # facts which are read from the helm inventory, one helm list command for all of them
+    HELM_PROBES = ("cp_version", "cp_platform_bootstrap_version", "cp_platform_base_version")
+    # secrets are only kept in the memory of the process which discovered them, never in the cache file or /cluster-facts
+    SECRET_FACTS = ("elastic_password",)
+
+    _facts = {}
+    _lock = threading.Lock()
+    _cache_file = ""
+    _cache_ttl = 0
+
+    @staticmethod
+    def set_cache(cache_file, ttl):
+        """Share discovered facts in cache_file for ttl seconds, ttl 0 disables the cache."""
+        ClusterDiscovery._cache_file = cache_file
+        ClusterDiscovery._cache_ttl = ttl
+
+    @staticmethod
+    def discover(names=None, max_workers=None, timeout=None):
+        """Run the probes which are not discovered yet concurrently, return all known facts."""
+        max_workers = max_workers or ClusterDiscovery.MAX_WORKERS
+        timeout = timeout or ClusterDiscovery.PROBE_TIMEOUT
+        with ClusterDiscovery._lock:
+            pending = [
+                name for name in (names or ClusterDiscovery.PROBES)
+                if name not in ClusterDiscovery._facts and not ClusterDiscovery._is_overridden(name)
+            ]
+            if pending:
+                cached_facts = ClusterDiscovery._read_cache()
+                for name in [name for name in pending if name in cached_facts]:
+                    ClusterDiscovery._facts[name] = cached_facts[name]
+                    pending.remove(name)
+            if pending:
+                start_time = time.time()
+                ClusterDiscovery._run_command_probes(pending, max_workers, timeout)
+                # the other probes query the Kubernetes API in process
+                api_pending = [name for name in pending if name not in ClusterDiscovery._facts]
+                if api_pending:
+                    ClusterDiscovery._run_api_probes(api_pending, max_workers, timeout)
+                print(f"Cluster discovery finished {len(pending)} probes in {time.time() - start_time:.2f} seconds")
+                # only share successful results, an empty result (e.g. cluster not ready yet) is probed again next time
+                ClusterDiscovery._write_cache({
+                    name: ClusterDiscovery._facts[name] for name in pending
+                    if ClusterDiscovery._facts.get(name) and name not in ClusterDiscovery.SECRET_FACTS
+                })
+            return dict(ClusterDiscovery._facts)
+
+    @staticmethod
+    def _run_command_probes(names, max_workers, timeout):
+        """Run the kubectl/helm commands of the probes in names concurrently, the facts of the finished probes are set."""
+        commands = {}
+        if Helper.get_k8s_client() is None:
+            commands.update({name: ClusterDiscovery.KUBECTL_PROBES[name] for name in names if name in ClusterDiscovery.KUBECTL_PROBES})
+        helm_names = [name for name in names if name in ClusterDiscovery.HELM_PROBES]
+        if helm_names:
+            commands["helm"] = (Helper.HELM_LIST_COMMAND, Helper.set_helm_inventory)
+        if not commands:
+            return
+
+        executor = AsyncCommandExecutor(max_concurrency=max_workers, timeout=timeout)
+        results = executor.run_all_sync([command for command, _ in commands.values()])
+        for (name, (_, parse)), result in zip(commands.items(), results):
+            if not result.is_success:
+                reason = "timed out" if result.is_timeout else result.stderr or f"exit code {result.returncode}"
+                ColorLogger.warning(f"Cluster discovery probe '{name}' failed: {reason}")
+            output = result.stdout if result.is_success else None
+            if name != "helm":
+                ClusterDiscovery._facts[name] = parse(output)
+                continue
+            # the helm versions are read from the inventory in memory, a failed helm list is not kept in the inventory
+            if output is not None:
+                parse(output)
+            for helm_name in helm_names:
+                ClusterDiscovery._facts[helm_name] = ClusterDiscovery.PROBES[helm_name][1](timeout=timeout) if output is not None else ""
+
+    @staticmethod
+    def _run_api_probes(names, max_workers, timeout):
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names)), thread_name_prefix="discovery") as executor:
+            futures = {
+                executor.submit(ClusterDiscovery.PROBES[name][1], timeout=timeout): name
+                for name in names
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    ClusterDiscovery._facts[name] = future.result()
+                except Exception as e:
+                    ColorLogger.warning(f"Cluster discovery probe '{name}' failed: {e}")
+                    ClusterDiscovery._facts[name] = None
+
+    @staticmethod
+    def get(name):
+        if name not in ClusterDiscovery._facts:
+            ClusterDiscovery.discover([name])
+        return ClusterDiscovery._facts.get(name)
+
+    @staticmethod
+    def redact(facts):
+        """Return a copy of facts with the secret values masked."""
+        return {name: "******" if name in ClusterDiscovery.SECRET_FACTS and value else value for name, value in facts.items()}
+
+    @staticmethod
+    def invalidate():
+        """Forget the facts of the current cluster, in this process and in the cache file."""
+        with ClusterDiscovery._lock:
+            ClusterDiscovery._facts.clear()
+            if not ClusterDiscovery._cache_file:
+                return
+            cache = ClusterDiscovery._load_cache_file()
+            if cache.pop(ClusterDiscovery.get_cache_key(), None) is not None:
+                ClusterDiscovery._save_cache_file(cache)
+                ColorLogger.info(f"Cluster facts cache invalidated for {ClusterDiscovery.get_cache_key()}")
+
+    @staticmethod
+    def get_cache_key():
+        """The cache key is the kubeconfig path and its current context."""
+        kubeconfig = Helper.get_kubeconfig_path()
+        return f"{kubeconfig}#{ClusterDiscovery._get_current_context(kubeconfig)}"
+
+    @staticmethod
+    def _get_current_context(kubeconfig):
+        try:
+            with open(kubeconfig, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            return config.get("current-context") or ""
+        except (OSError, yaml.YAMLError, AttributeError):
+            return ""
+
+    @staticmethod
+    def _get_kubeconfig_mtime():
+        try:
+            return os.path.getmtime(Helper.get_kubeconfig_path())
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _read_cache():
+        if not ClusterDiscovery._cache_file or ClusterDiscovery._cache_ttl <= 0:
+            return {}
+        entry = ClusterDiscovery._load_cache_file().get(ClusterDiscovery.get_cache_key())
+        if not entry:
+            return {}
+        # the kubeconfig file was changed (e.g. re-installed cluster), the facts are stale
+        if entry.get("kubeconfigMtime") != ClusterDiscovery._get_kubeconfig_mtime():
+            return {}
+        if time.time() - entry.get("updated", 0) > ClusterDiscovery._cache_ttl:
+            return {}
+        print(f"Use cluster facts from cache file: {ClusterDiscovery._cache_file}")
+        facts = entry.get("facts") or {}
+        # a cache file written by an older version may still contain secrets
+        return {name: value for name, value in facts.items() if name not in ClusterDiscovery.SECRET_FACTS}
+
+    @staticmethod
+    def _write_cache(facts):
+        if not facts or not ClusterDiscovery._cache_file or ClusterDiscovery._cache_ttl <= 0:
+            return
+        cache_key = ClusterDiscovery.get_cache_key()
+        cache = ClusterDiscovery._load_cache_file()
+        entry = cache.get(cache_key) or {}
+        kubeconfig_mtime = ClusterDiscovery._get_kubeconfig_mtime()
+        is_valid = (entry.get("kubeconfigMtime") == kubeconfig_mtime
+                    and time.time() - entry.get("updated", 0) <= ClusterDiscovery._cache_ttl)
+        cache[cache_key] = {
+            "updated": entry.get("updated") if is_valid else time.time(),
+            "kubeconfigMtime": kubeconfig_mtime,
+            "facts": {**((entry.get("facts") or {}) if is_valid else {}), **facts},
+        }
+        ClusterDiscovery._save_cache_file(cache)
+
+    @staticmethod
+    def _load_cache_file():
+        try:
+            with open(ClusterDiscovery._cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _save_cache_file(cache):
+        cache_folder = os.path.dirname(ClusterDiscovery._cache_file)
+        try:
+            os.makedirs(cache_folder, exist_ok=True)
+            # mkstemp creates the file with mode 0600, os.replace keeps it
+            fd, tmp_path = tempfile.mkstemp(prefix=".cluster-facts-", suffix=".json", dir=cache_folder)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, ClusterDiscovery._cache_file)
+        except OSError as e:
+            ColorLogger.warning(f"Failed to save cluster facts cache file {ClusterDiscovery._cache_file}: {e}")
+
+    @staticmethod
+    def _is_overridden(name):
+        env_key = ClusterDiscovery.PROBES[name][0]
+        return bool(env_key and os.environ.get(env_key))
@@ -0,0 +1,138 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import asyncio
+import os
+import platform
+import signal
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from utils.command_telemetry import CommandTelemetry
+from utils.helper import Helper
+
+@dataclass(frozen=True)
+class CommandResult:
+    command: str
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+    is_timeout: bool = False
+    is_cancelled: bool = False
+
+    @property
+    def is_success(self):
+        return self.returncode == 0 and not self.is_timeout and not self.is_cancelled
+
+class AsyncCommandExecutor:
+    """
+    Run shell commands with asyncio, at most max_concurrency commands at the same time.
+
+    Every command has a timeout, on timeout or cancel the whole process group is killed,
+    and the result is a CommandResult (exit code, stdout, stderr, duration) instead of an exception.
+
+    results = AsyncCommandExecutor(max_concurrency=4, timeout=60).run_all_sync(["kubectl get nodes", "helm list -A"])
+    """
+    def __init__(self, max_concurrency=4, timeout=None, env=None):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout or Helper.COMMAND_TIMEOUT
+        self.env = env
+        # an asyncio.Semaphore belongs to one event loop, and run_all_sync() runs every call in a new loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._tasks = set()
+
+    async def run(self, command, timeout=None):
+        """Run one shell command, wait for a free slot if max_concurrency commands are running."""
+        timeout = timeout or self.timeout
+        async with self._get_semaphore():
+            return await self._run_process(command, timeout)
+
+    async def run_all(self, commands, timeout=None):
+        """Run all commands concurrently, return the results in the same order as commands."""
+        self._get_semaphore()
+        tasks = [asyncio.create_task(self.run(command, timeout)) for command in commands]
+        self._tasks.update(tasks)
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._tasks.difference_update(tasks)
+
+        return [
+            CommandResult(command, -1, "", "", 0, is_cancelled=True) if isinstance(result, asyncio.CancelledError)
+            else CommandResult(command, -1, "", str(result), 0) if isinstance(result, Exception)
+            else result
+            for command, result in zip(commands, results)
+        ]
+
+    def run_all_sync(self, commands, timeout=None):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run_all(commands, timeout))
+        # this thread already runs an event loop (e.g. Playwright sync API), run the commands in a new loop in another thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.run_all(commands, timeout)).result()
+
+    def cancel(self):
+        """Cancel all running commands, it can be called from another thread."""
+        for task in list(self._tasks):
+            try:
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # the event loop is already closed
+                pass
+
+    def _get_semaphore(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
+
+    async def _run_process(self, command, timeout):
+        start_time = time.time()
+        process = await asyncio.create_subprocess_exec(
+            *self._get_shell_command(command),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self.env or Helper.get_env_vars(),
+            start_new_session=platform.system() != "Windows"
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            await self._kill(process)
+            print(f"Command timed out after {timeout} seconds: {command}")
+            CommandTelemetry.record(command, time.time() - start_time, process.returncode)
+            return CommandResult(command, process.returncode, "", "", time.time() - start_time, is_timeout=True)
+        except asyncio.CancelledError:
+            await self._kill(process)
+            print(f"Command cancelled: {command}")
+            CommandTelemetry.record(command, time.time() - start_time, process.returncode)
+            raise
+        CommandTelemetry.record(command, time.time() - start_time, process.returncode, len(stdout))
+        return CommandResult(
+            command,
+            process.returncode,
+            stdout.decode("utf-8", errors="replace").strip(),
+            stderr.decode("utf-8", errors="replace").strip(),
+            time.time() - start_time
+        )
+
+    @staticmethod
+    def _get_shell_command(command):
+        if platform.system() == "Windows":
+            return [str(Helper.get_windows_bash()), "-c", command]
+        return ["/bin/sh", "-c", command]
+
+    @staticmethod
+    async def _kill(process):
+        try:
+            if platform.system() == "Windows":
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        await process.wait()
@@ -0,0 +1,137 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import atexit
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# do not import env.py or util.py in this file, helper.py records commands here
+class CommandTelemetry:
+    """
+    Record every shell-out (command class, duration, exit code, output size) of the current process.
+
+    When the process exits, the records are aggregated into per command class histograms,
+    and written to one json file per run in the telemetry folder next to report.yaml (see env.py).
+    """
+    # upper bounds in seconds of the duration histogram buckets, the last bucket is everything above
+    BUCKETS = [0.1, 0.5, 1, 5, 10, 30, 60, 300]
+    SLOWEST_RECORDS = 10
+
+    _records = []
+    _lock = threading.Lock()
+    _output_folder = ""
+    _start_time = time.time()
+
+    @staticmethod
+    def set_output_folder(output_folder):
+        """Write the run summary to output_folder when the process exits, an empty folder disables it."""
+        if output_folder and not CommandTelemetry._output_folder:
+            atexit.register(CommandTelemetry.save)
+        CommandTelemetry._output_folder = output_folder
+
+    @staticmethod
+    def get_command_class(command):
+        """The program name of a command, e.g. "kubectl get nodes | awk ..." -> "kubectl", ["/tmp/a.sh"] -> "script"."""
+        if isinstance(command, (list, tuple)):
+            command = " ".join(str(item) for item in command)
+        words = str(command or "").strip().split()
+        # skip Windows git bash: bash.exe -c "<command>"
+        if len(words) > 2 and words[0].endswith("bash.exe") and words[1] == "-c":
+            words = words[2:]
+        if not words:
+            return "unknown"
+        program = os.path.basename(words[0].strip("'\""))
+        if program.endswith(".sh") or program == "bash.exe":
+            return "script"
+        return program
+
+    @staticmethod
+    def record(command, duration, returncode=0, output_size=0, command_class=None):
+        with CommandTelemetry._lock:
+            CommandTelemetry._records.append({
+                "commandClass": command_class or CommandTelemetry.get_command_class(command),
+                "command": CommandTelemetry._get_command_summary(command),
+                "duration": round(duration, 3),
+                "exitCode": returncode,
+                "outputSize": output_size,
+            })
+
+    @staticmethod
+    def get_summary():
+        with CommandTelemetry._lock:
+            records = list(CommandTelemetry._records)
+
+        command_classes = {}
+        for record in records:
+            command_classes.setdefault(record["commandClass"], []).append(record)
+
+        return {
+            "run": " ".join(sys.argv),
+            "pid": os.getpid(),
+            "started": datetime.fromtimestamp(CommandTelemetry._start_time).isoformat(timespec="seconds"),
+            "wallTime": round(time.time() - CommandTelemetry._start_time, 3),
+            "commandTime": round(sum(record["duration"] for record in records), 3),
+            "commandClasses": {
+                command_class: CommandTelemetry._get_histogram(class_records)
+                for command_class, class_records in sorted(command_classes.items(), key=lambda item: -sum(r["duration"] for r in item[1]))
+            },
+            "slowest": sorted(records, key=lambda record: -record["duration"])[:CommandTelemetry.SLOWEST_RECORDS],
+        }
+
+    @staticmethod
+    def save():
+        if not CommandTelemetry._output_folder or not CommandTelemetry._records:
+            return
+        summary = CommandTelemetry.get_summary()
+        file_name = f"run-{datetime.fromtimestamp(CommandTelemetry._start_time).strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+        try:
+            os.makedirs(CommandTelemetry._output_folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".run-", suffix=".json", dir=CommandTelemetry._output_folder)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+            os.replace(tmp_path, os.path.join(CommandTelemetry._output_folder, file_name))
+        except OSError as e:
+            print(f"Failed to save command telemetry: {e}")
+
+    @staticmethod
+    def _get_command_summary(command, max_words=4):
+        """Only keep the first words of a command, option values (e.g. --from-literal=token=...) may contain secrets."""
+        if isinstance(command, (list, tuple)):
+            command = " ".join(str(item) for item in command)
+        words = [word.split("=", 1)[0] + "=..." if "=" in word else word for word in str(command or "").split()]
+        return " ".join(words[:max_words]) + (" ..." if len(words) > max_words else "")
+
+    @staticmethod
+    def _get_histogram(records):
+        durations = sorted(record["duration"] for record in records)
+        buckets = {f"<={bound}s": 0 for bound in CommandTelemetry.BUCKETS}
+        buckets[f">{CommandTelemetry.BUCKETS[-1]}s"] = 0
+        for duration in durations:
+            bound = next((bound for bound in CommandTelemetry.BUCKETS if duration <= bound), None)
+            buckets[f"<={bound}s" if bound is not None else f">{CommandTelemetry.BUCKETS[-1]}s"] += 1
+
+        exit_codes = {}
+        for record in records:
+            exit_codes[str(record["exitCode"])] = exit_codes.get(str(record["exitCode"]), 0) + 1
+
+        return {
+            "count": len(durations),
+            "total": round(sum(durations), 3),
+            "min": durations[0],
+            "max": durations[-1],
+            "mean": round(sum(durations) / len(durations), 3),
+            "p50": CommandTelemetry._get_percentile(durations, 50),
+            "p95": CommandTelemetry._get_percentile(durations, 95),
+            "outputSize": sum(record["outputSize"] for record in records),
+            "exitCodes": exit_codes,
+            "buckets": buckets,
+        }
+
+    @staticmethod
+    def _get_percentile(sorted_values, percentile):
+        index = max(0, int(round(percentile / 100 * len(sorted_values))) - 1)
+        return sorted_values[min(index, len(sorted_values) - 1)]
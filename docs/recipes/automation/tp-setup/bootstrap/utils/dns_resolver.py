@@ -0,0 +1,143 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import http.client
+import json
+import os
+import socket
+import ssl
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from utils.color_logger import ColorLogger
+
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, host, ip, port, timeout):
+        super().__init__(host, port, timeout=timeout)
+        self.ip = ip
+
+    def connect(self):
+        self.sock = socket.create_connection((self.ip, self.port), self.timeout)
+
+class _PinnedHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, host, ip, port, timeout):
+        super().__init__(host, port, timeout=timeout, context=ssl.create_default_context())
+        self.ip = ip
+
+    def connect(self):
+        # the url host name is still used for SNI and certificate verification
+        self.sock = self._context.wrap_socket(socket.create_connection((self.ip, self.port), self.timeout), server_hostname=self.host)
+
+# do not import env.py or util.py in this file, env.py sets the cache file
+class DnsResolver:
+    """
+    Resolve host names in process with socket.getaddrinfo, instead of running nslookup.
+
+    Results are kept for the TTL in memory, and in a cache file shared by the case processes of a run (see env.py),
+    so the browser host-resolver rules and the url checks use the same address during a job.
+    A failed lookup is not cached, and returns an empty list.
+    """
+    # a wildcard record answers for any name, it is used when the literal "*" label can not be resolved
+    WILDCARD_PROBE_LABEL = "tp-auto-dns-probe"
+
+    _cache = {}
+    _lock = threading.Lock()
+    _cache_file = ""
+    _cache_ttl = 300
+
+    @staticmethod
+    def set_cache(cache_file, ttl):
+        """Share resolved addresses in cache_file for ttl seconds, ttl 0 disables the cache."""
+        DnsResolver._cache_file = cache_file
+        DnsResolver._cache_ttl = ttl
+
+    @staticmethod
+    def resolve(host):
+        """Return the IP addresses of host, IPv4 first, empty list if it can not be resolved."""
+        cached_ips = DnsResolver._get_cached(host)
+        if cached_ips is not None:
+            return cached_ips
+        try:
+            address_infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+        except (socket.gaierror, UnicodeError) as e:
+            print(f"Unable to resolve {host}: {e}")
+            return []
+
+        ips = []
+        for family in (socket.AF_INET, socket.AF_INET6):
+            for address_info in address_infos:
+                ip = address_info[4][0]
+                if address_info[0] == family and ip not in ips:
+                    ips.append(ip)
+        DnsResolver._set_cached(host, ips)
+        return ips
+
+    @staticmethod
+    def resolve_wildcard(domain):
+        """Return the IP addresses of *.domain."""
+        ips = DnsResolver.resolve(f"*.{domain}")
+        if not ips:
+            ips = DnsResolver.resolve(f"{DnsResolver.WILDCARD_PROBE_LABEL}.{domain}")
+        if not ips:
+            ColorLogger.warning(f"Unable to resolve *.{domain}, the system resolver is used.")
+        return ips
+
+    @staticmethod
+    def get_url_status(url, ip, timeout=5):
+        """GET url from the given IP address, like the browser does with a host-resolver rule, return the HTTP status."""
+        parsed_url = urllib.parse.urlparse(url)
+        if parsed_url.scheme == "https":
+            connection = _PinnedHTTPSConnection(parsed_url.hostname, ip, parsed_url.port or 443, timeout)
+        else:
+            connection = _PinnedHTTPConnection(parsed_url.hostname, ip, parsed_url.port or 80, timeout)
+        path = (parsed_url.path or "/") + (f"?{parsed_url.query}" if parsed_url.query else "")
+        try:
+            connection.request("GET", path)
+            return connection.getresponse().status
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _get_cached(host):
+        if DnsResolver._cache_ttl <= 0:
+            return None
+        with DnsResolver._lock:
+            entry = DnsResolver._cache.get(host)
+            if entry is None:
+                entry = DnsResolver._load_cache_file().get(host)
+            if entry is None or time.time() - entry["time"] > DnsResolver._cache_ttl:
+                return None
+            DnsResolver._cache[host] = entry
+            return entry["ips"]
+
+    @staticmethod
+    def _set_cached(host, ips):
+        if DnsResolver._cache_ttl <= 0 or not ips:
+            return
+        with DnsResolver._lock:
+            entry = {"ips": ips, "time": time.time()}
+            DnsResolver._cache[host] = entry
+            if not DnsResolver._cache_file:
+                return
+            cache = DnsResolver._load_cache_file()
+            cache[host] = entry
+            cache_folder = os.path.dirname(DnsResolver._cache_file)
+            try:
+                os.makedirs(cache_folder, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=".dns-cache-", suffix=".json", dir=cache_folder)
+                with os.fdopen(fd, "w") as f:
+                    json.dump(cache, f)
+                os.replace(tmp_path, DnsResolver._cache_file)
+            except OSError as e:
+                print(f"Unable to write DNS cache {DnsResolver._cache_file}: {e}")
+
+    @staticmethod
+    def _load_cache_file():
+        if not DnsResolver._cache_file:
+            return {}
+        try:
+            with open(DnsResolver._cache_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
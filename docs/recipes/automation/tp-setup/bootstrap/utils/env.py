@@ -4,19 +4,28 @@ import socket
 import os
 import pytz
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
 from utils.color_logger import ColorLogger
 from utils.helper import Helper
+from utils.cluster_discovery import ClusterDiscovery
+from utils.command_telemetry import CommandTelemetry
+from utils.dns_resolver import DnsResolver
 
 @dataclass(frozen=True)
 class EnvConfig:
+    # Note: values that need kubectl/helm are cached_property, they are only computed on first access,
+    # so importing this module does not query the cluster. Environment variables still take precedence.
     IS_HEADLESS = Helper.is_headless()
-    IS_CLUSTER_ACCESSIBLE = "Kubernetes control plane" in (Helper.get_command_output("kubectl cluster-info", is_print_error=False) or "")
+
+    @cached_property
+    def IS_CLUSTER_ACCESSIBLE(self):
+        return bool(ClusterDiscovery.get("is_cluster_accessible"))
 
     GITHUB_TOKEN = os.getenv("GITHUB_TOKEN") or "" # GitHub token is not used for now
     TIME_ZONE = "America/Chicago"
     RETRY_TIME = datetime.now(pytz.timezone(TIME_ZONE))
-    RETRY_TIME_FOLDER = RETRY_TIME.strftime("%Y%m%d-%H%M%S")
+    RETRY_TIME_FOLDER = RETRY_TIME.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"  # cases started in the same second get their own folder
     DP_HOST_PREFIX = os.environ.get("DP_HOST_PREFIX") or "cp-sub1"
     DP_USER_EMAIL = os.environ.get("DP_USER_EMAIL") or "cp-sub1@tibco.com"
     DP_USER_PASSWORD = os.environ.get("DP_USER_PASSWORD") or "Tibco@123"
@@ -32,11 +41,43 @@ class EnvConfig:
     TP_CLUSTER_SERVICE_CIDR = os.environ.get("TP_CLUSTER_SERVICE_CIDR") or ""
 
     # automation setup
-    TP_AUTO_CP_VERSION = os.environ.get("TP_AUTO_CP_VERSION") or Helper.get_cp_version() or "1.4"
+    @cached_property
+    def TP_AUTO_CP_VERSION(self):
+        return os.environ.get("TP_AUTO_CP_VERSION") or ClusterDiscovery.get("cp_version") or "1.4"
+
     TP_AUTO_REPORT_PATH = os.environ.get("TP_AUTO_REPORT_PATH") or os.path.join(os.getcwd(), "report")
+    TP_AUTO_SHARED_REPORT_PATH = os.environ.get("TP_AUTO_SHARED_REPORT_PATH") or TP_AUTO_REPORT_PATH  # caches shared by all jobs: cluster facts, DNS, login state, telemetry
     TP_AUTO_REPORT_YAML_FILE = os.environ.get("TP_AUTO_REPORT_YAML_FILE") or "report.yaml"  # automation script will create this file
     TP_AUTO_REPORT_TXT_FILE = os.environ.get("TP_AUTO_REPORT_TXT_FILE") or "report.txt"    # this is the final report file for user to view
+    TP_AUTO_REPORT_JSON_FILE = os.environ.get("TP_AUTO_REPORT_JSON_FILE") or "report-env.json"  # same as report.txt, for other tools to read
+    TP_AUTO_REPORT_HTML_FILE = os.environ.get("TP_AUTO_REPORT_HTML_FILE") or "report-env.html"  # same as report.txt, for browser to view
+    TP_AUTO_CLUSTER_FACTS_FILE = os.environ.get("TP_AUTO_CLUSTER_FACTS_FILE") or ".cluster-facts.json"  # cluster facts shared by all case processes
+    TP_AUTO_CLUSTER_FACTS_TTL = int(os.environ.get("TP_AUTO_CLUSTER_FACTS_TTL") or 600)  # seconds, 0 disables the cluster facts cache
+    TP_AUTO_DNS_CACHE_FILE = os.environ.get("TP_AUTO_DNS_CACHE_FILE") or ".dns-cache.json"  # resolved CP addresses shared by all case processes
+    TP_AUTO_DNS_CACHE_TTL = int(os.environ.get("TP_AUTO_DNS_CACHE_TTL") or 300)  # seconds, 0 disables the DNS cache
+    TP_AUTO_TELEMETRY_FOLDER = os.environ.get("TP_AUTO_TELEMETRY_FOLDER", "telemetry")  # per run command telemetry, empty string disables it
     TP_AUTO_REPORT_TRACE = os.environ.get("TP_AUTO_REPORT_TRACE", "true").lower() == "true"
+    TP_AUTO_CAPTURE_POLICY = os.environ.get("TP_AUTO_CAPTURE_POLICY") or "always"  # video and trace: off, always, retain-on-failure
+    TP_AUTO_VIDEO_SIZE = os.environ.get("TP_AUTO_VIDEO_SIZE") or "2000x1080"
+    TP_AUTO_LOGIN_STATE_FOLDER = os.environ.get("TP_AUTO_LOGIN_STATE_FOLDER") or ".auth-state"  # saved login state per CP login URL and user
+    TP_AUTO_LOGIN_STATE_TTL = int(os.environ.get("TP_AUTO_LOGIN_STATE_TTL") or 1800)  # seconds, 0 disables reusing the saved login state
+    TP_AUTO_LOGIN_KEEP_SESSION = os.environ.get("TP_AUTO_LOGIN_KEEP_SESSION", "false").lower() == "true"  # logout() keeps a saved session for the next case
+    TP_AUTO_REQUEST_FILTER = os.environ.get("TP_AUTO_REQUEST_FILTER", "false").lower() == "true"  # drop requests automation does not need
+    TP_AUTO_REQUEST_FILTER_BLOCK_TYPES = os.environ.get("TP_AUTO_REQUEST_FILTER_BLOCK_TYPES") or "font,image,media"
+    TP_AUTO_REQUEST_FILTER_BLOCK_URLS = os.environ.get("TP_AUTO_REQUEST_FILTER_BLOCK_URLS") or "google-analytics.com,googletagmanager.com,doubleclick.net,pendo.io,segment.io,hotjar.com,nr-data.net,newrelic.com"
+    TP_AUTO_REQUEST_FILTER_ALLOW_URLS = os.environ.get("TP_AUTO_REQUEST_FILTER_ALLOW_URLS") or ".svg"
+    TP_AUTO_MAX_BROWSER_SESSIONS = int(os.environ.get("TP_AUTO_MAX_BROWSER_SESSIONS") or 1)  # capabilities provisioned at the same time, default 1 runs them one by one, >1 is experimental
+    TP_AUTO_MAX_JOBS = int(os.environ.get("TP_AUTO_MAX_JOBS") or max(1, (os.cpu_count() or 2) // 2))  # automation server: cases running at the same time, the others are queued
+    TP_AUTO_JOB_LOG_PATH = os.environ.get("TP_AUTO_JOB_LOG_PATH") or os.path.join(os.getcwd(), "job-logs")  # automation server: output of each job, <job id>.log
+    TP_AUTO_LOG_BATCH_BYTES = int(os.environ.get("TP_AUTO_LOG_BATCH_BYTES") or 65536)  # automation server: max bytes of job output sent at once
+    TP_AUTO_LOG_BATCH_INTERVAL = float(os.environ.get("TP_AUTO_LOG_BATCH_INTERVAL") or 0.2)  # automation server: seconds new job output is collected before it is sent
+    TP_AUTO_CASE_WORKER_MAX_JOBS = int(os.environ.get("TP_AUTO_CASE_WORKER_MAX_JOBS") or 20)  # automation server: jobs of one pre-warmed case worker process, 0 starts a new process per job
+    TP_AUTO_CASE_WORKER_WARM_MODULES = os.environ.get("TP_AUTO_CASE_WORKER_WARM_MODULES") or "playwright.sync_api,yaml,pytz"  # imported once by each case worker
+    TP_AUTO_JOB_WORKSPACE = os.environ.get("TP_AUTO_JOB_WORKSPACE", "true").lower() == "true"  # automation server: each job writes its report, screenshots, videos, traces, dp_commands to report/jobs/<job id>
+    TP_AUTO_JOB_REPORT_MERGE = os.environ.get("TP_AUTO_JOB_REPORT_MERGE", "true").lower() == "true"  # automation server: merge the report.yaml of each job into the shared report/report.yaml
+    TP_AUTO_JOB_HISTORY_SIZE = int(os.environ.get("TP_AUTO_JOB_HISTORY_SIZE") or 100)  # automation server: finished jobs kept for /jobs
+    TP_AUTO_JOB_HISTORY_TTL = int(os.environ.get("TP_AUTO_JOB_HISTORY_TTL", 7 * 24 * 3600))  # automation server: seconds, older job logs and workspaces are removed at startup, 0 means no age limit
+    TP_AUTO_BROWSER_SERVER = os.environ.get("TP_AUTO_BROWSER_SERVER", "false").lower() == "true"  # attach to a shared long-lived browser instead of launching one per case
     TP_AUTO_IS_CREATE_DP = os.environ.get("TP_AUTO_IS_CREATE_DP", "false").lower() == "true"
     TP_AUTO_IS_CREATE_BMDP = os.environ.get("TP_AUTO_IS_CREATE_BMDP", "true").lower() == "true"
     TP_AUTO_IS_ENABLE_RVDM = os.environ.get("TP_AUTO_IS_ENABLE_RVDM", "true").lower() == "true"
@@ -109,31 +150,68 @@ class EnvConfig:
     # CP_DNS_DOMAIN
     TP_AUTO_CP_INSTANCE_ID = os.environ.get("TP_AUTO_CP_INSTANCE_ID") or "cp1"
     TP_AUTO_CP_NAMESPACE = os.environ.get("TP_AUTO_CP_NAMESPACE") or f"{TP_AUTO_CP_INSTANCE_ID}-ns"
-    TP_AUTO_CP_DNS_DOMAIN = os.environ.get("TP_AUTO_CP_DNS_DOMAIN") or Helper.get_cp_dns_domain() or "localhost.dataplanes.pro"
-    TP_AUTO_CP_SERVICE_DNS_DOMAIN = os.environ.get("TP_AUTO_CP_SERVICE_DNS_DOMAIN") or f"{TP_AUTO_CP_INSTANCE_ID}-my.{TP_AUTO_CP_DNS_DOMAIN}"
     TP_AUTO_CP_DNS_DOMAIN_PREFIX_BWCE = os.environ.get("TP_AUTO_CP_DNS_DOMAIN_PREFIX_BWCE") or "bwce"
     TP_AUTO_CP_DNS_DOMAIN_PREFIX_BW5CE = os.environ.get("TP_AUTO_CP_DNS_DOMAIN_PREFIX_BW5CE") or "bw5ce"
     TP_AUTO_CP_DNS_DOMAIN_PREFIX_FLOGO = os.environ.get("TP_AUTO_CP_DNS_DOMAIN_PREFIX_FLOGO") or "flogo"
     TP_AUTO_CP_DNS_DOMAIN_PREFIX_TIBCOHUB = os.environ.get("TP_AUTO_CP_DNS_DOMAIN_PREFIX_TIBCOHUB") or "tibcohub"
 
-    TP_AUTO_LOGIN_URL = os.environ.get("TP_AUTO_LOGIN_URL") or f"https://{DP_HOST_PREFIX}.{TP_AUTO_CP_SERVICE_DNS_DOMAIN}/cp/login"
-    TP_AUTO_MAIL_URL = os.environ.get("TP_AUTO_MAIL_URL") or f"https://mail.{TP_AUTO_CP_DNS_DOMAIN}/#/"
-    TP_AUTO_ADMIN_URL = os.environ.get("TP_AUTO_ADMIN_URL") or f"https://admin.{TP_AUTO_CP_SERVICE_DNS_DOMAIN}/admin"
+    @cached_property
+    def TP_AUTO_CP_DNS_DOMAIN(self):
+        return os.environ.get("TP_AUTO_CP_DNS_DOMAIN") or ClusterDiscovery.get("cp_dns_domain") or "localhost.dataplanes.pro"
+
+    @cached_property
+    def TP_AUTO_CP_SERVICE_DNS_DOMAIN(self):
+        return os.environ.get("TP_AUTO_CP_SERVICE_DNS_DOMAIN") or f"{self.TP_AUTO_CP_INSTANCE_ID}-my.{self.TP_AUTO_CP_DNS_DOMAIN}"
+
+    @cached_property
+    def TP_AUTO_LOGIN_URL(self):
+        return os.environ.get("TP_AUTO_LOGIN_URL") or f"https://{self.DP_HOST_PREFIX}.{self.TP_AUTO_CP_SERVICE_DNS_DOMAIN}/cp/login"
+
+    @cached_property
+    def TP_AUTO_MAIL_URL(self):
+        return os.environ.get("TP_AUTO_MAIL_URL") or f"https://mail.{self.TP_AUTO_CP_DNS_DOMAIN}/#/"
+
+    @cached_property
+    def TP_AUTO_ADMIN_URL(self):
+        return os.environ.get("TP_AUTO_ADMIN_URL") or f"https://admin.{self.TP_AUTO_CP_SERVICE_DNS_DOMAIN}/admin"
 
     # elastic and prometheus
-    TP_AUTO_ELASTIC_URL = os.environ.get("TP_AUTO_ELASTIC_URL") or f"https://elastic.{TP_AUTO_CP_DNS_DOMAIN}/"
-    TP_AUTO_KIBANA_URL = f"https://kibana.{TP_AUTO_CP_DNS_DOMAIN}/"
     TP_AUTO_ELASTIC_USER = os.environ.get("TP_AUTO_ELASTIC_USER") or "elastic"
-    TP_AUTO_ELASTIC_PASSWORD = os.environ.get("TP_AUTO_ELASTIC_PASSWORD") or Helper.get_elastic_password()
-    TP_AUTO_PROMETHEUS_URL = os.environ.get("TP_AUTO_PROMETHEUS_URL") or f"https://prometheus-internal.{TP_AUTO_CP_DNS_DOMAIN}/"
     TP_AUTO_PROMETHEUS_USER = os.environ.get("TP_AUTO_PROMETHEUS_USER") or ""
     TP_AUTO_PROMETHEUS_PASSWORD = os.environ.get("TP_AUTO_PROMETHEUS_PASSWORD") or ""
 
+    @cached_property
+    def TP_AUTO_ELASTIC_URL(self):
+        return os.environ.get("TP_AUTO_ELASTIC_URL") or f"https://elastic.{self.TP_AUTO_CP_DNS_DOMAIN}/"
+
+    @cached_property
+    def TP_AUTO_KIBANA_URL(self):
+        return f"https://kibana.{self.TP_AUTO_CP_DNS_DOMAIN}/"
+
+    @cached_property
+    def TP_AUTO_ELASTIC_PASSWORD(self):
+        return os.environ.get("TP_AUTO_ELASTIC_PASSWORD") or ClusterDiscovery.get("elastic_password")
+
+    @cached_property
+    def TP_AUTO_PROMETHEUS_URL(self):
+        return os.environ.get("TP_AUTO_PROMETHEUS_URL") or f"https://prometheus-internal.{self.TP_AUTO_CP_DNS_DOMAIN}/"
+
     # fqdn
-    TP_AUTO_FQDN_BWCE = os.environ.get("TP_AUTO_FQDN_BWCE") or f"{TP_AUTO_CP_DNS_DOMAIN_PREFIX_BWCE}.{TP_AUTO_CP_DNS_DOMAIN}"
-    TP_AUTO_FQDN_BW5CE = os.environ.get("TP_AUTO_FQDN_BW5CE") or f"{TP_AUTO_CP_DNS_DOMAIN_PREFIX_BW5CE}.{TP_AUTO_CP_DNS_DOMAIN}"
-    TP_AUTO_FQDN_FLOGO = os.environ.get("TP_AUTO_FQDN_FLOGO") or f"{TP_AUTO_CP_DNS_DOMAIN_PREFIX_FLOGO}.{TP_AUTO_CP_DNS_DOMAIN}"
-    TP_AUTO_FQDN_TIBCOHUB = os.environ.get("TP_AUTO_FQDN_TIBCOHUB") or f"{TP_AUTO_CP_DNS_DOMAIN_PREFIX_TIBCOHUB}.{TP_AUTO_CP_DNS_DOMAIN}"
+    @cached_property
+    def TP_AUTO_FQDN_BWCE(self):
+        return os.environ.get("TP_AUTO_FQDN_BWCE") or f"{self.TP_AUTO_CP_DNS_DOMAIN_PREFIX_BWCE}.{self.TP_AUTO_CP_DNS_DOMAIN}"
+
+    @cached_property
+    def TP_AUTO_FQDN_BW5CE(self):
+        return os.environ.get("TP_AUTO_FQDN_BW5CE") or f"{self.TP_AUTO_CP_DNS_DOMAIN_PREFIX_BW5CE}.{self.TP_AUTO_CP_DNS_DOMAIN}"
+
+    @cached_property
+    def TP_AUTO_FQDN_FLOGO(self):
+        return os.environ.get("TP_AUTO_FQDN_FLOGO") or f"{self.TP_AUTO_CP_DNS_DOMAIN_PREFIX_FLOGO}.{self.TP_AUTO_CP_DNS_DOMAIN}"
+
+    @cached_property
+    def TP_AUTO_FQDN_TIBCOHUB(self):
+        return os.environ.get("TP_AUTO_FQDN_TIBCOHUB") or f"{self.TP_AUTO_CP_DNS_DOMAIN_PREFIX_TIBCOHUB}.{self.TP_AUTO_CP_DNS_DOMAIN}"
 
     # capabilities url
     TP_AUTO_EMS_CAPABILITY_SERVER_NAME = os.environ.get("TP_AUTO_EMS_CAPABILITY_SERVER_NAME") or "ems-sn"
@@ -150,7 +228,11 @@ class EnvConfig:
     TP_AUTO_INGRESS_CONTROLLER_TIBCOHUB = os.environ.get("TP_AUTO_INGRESS_CONTROLLER_TIBCOHUB") or f"{TP_AUTO_INGRESS_CONTROLLER}-{TP_AUTO_CP_DNS_DOMAIN_PREFIX_TIBCOHUB}"
     # TP_AUTO_INGRESS_CONTROLLER_KEYS = os.environ.get("TP_AUTO_INGRESS_CONTROLLER_KEYS") or ""
     # TP_AUTO_INGRESS_CONTROLLER_VALUES = os.environ.get("TP_AUTO_INGRESS_CONTROLLER_VALUES") or ""
-    TP_AUTO_STORAGE_CLASS = os.environ.get("TP_AUTO_STORAGE_CLASS") or Helper.get_storage_class()
+
+    @cached_property
+    def TP_AUTO_STORAGE_CLASS(self):
+        return os.environ.get("TP_AUTO_STORAGE_CLASS") or ClusterDiscovery.get("storage_class")
+
     # Due to the fuzzy matching of the dp name by Playwright
     # At most 0-9 dp are supported, if more dp is needed, the matching rule of dp selector is required
     TP_AUTO_MAX_DATA_PLANE = 9
@@ -165,6 +247,8 @@ class EnvConfig:
     FLOGO_APP_NAME = os.environ.get("FLOGO_APP_NAME") or Helper.get_app_name(FLOGO_APP_FILE_NAME)
 
     def pre_check(self):
+        # query all cluster facts concurrently once, instead of one by one on first access
+        ClusterDiscovery.discover()
         current_time = self.RETRY_TIME.strftime("%Y-%m-%d %H:%M:%S")
         ColorLogger.info(f"Current Retry time at '{current_time}'")
         ColorLogger.info(f"Current CP version is '{self.TP_AUTO_CP_VERSION}'")
@@ -200,3 +284,6 @@ class EnvConfig:
             ColorLogger.warning(f"CP_ADMIN_PASSWORD is not set, will use default: {self.CP_ADMIN_PASSWORD}")
 
 ENV = EnvConfig()
+ClusterDiscovery.set_cache(os.path.join(ENV.TP_AUTO_SHARED_REPORT_PATH, ENV.TP_AUTO_CLUSTER_FACTS_FILE), ENV.TP_AUTO_CLUSTER_FACTS_TTL)
+DnsResolver.set_cache(os.path.join(ENV.TP_AUTO_SHARED_REPORT_PATH, ENV.TP_AUTO_DNS_CACHE_FILE), ENV.TP_AUTO_DNS_CACHE_TTL)
+CommandTelemetry.set_output_folder(os.path.join(ENV.TP_AUTO_SHARED_REPORT_PATH, ENV.TP_AUTO_TELEMETRY_FOLDER) if ENV.TP_AUTO_TELEMETRY_FOLDER else "")
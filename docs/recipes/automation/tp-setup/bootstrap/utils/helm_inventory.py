@@ -0,0 +1,60 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import json
+import re
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class HelmRelease:
+    name: str
+    namespace: str
+    chart: str
+    chart_name: str
+    chart_version: str
+    app_version: str
+    status: str
+
+class HelmInventory:
+    """
+    All helm releases of the cluster, parsed from one `helm list -A -o json` call.
+    """
+    # chart is "<chart name>-<chart version>", e.g. "platform-base-1.13.0", "tibco-cp-base-1.13.0-rc.1"
+    CHART_PATTERN = re.compile(r"^(?P<name>.+?)-(?P<version>\d+\.\d+.*)$")
+
+    def __init__(self, releases=None):
+        self.releases = releases or []
+
+    @staticmethod
+    def parse(helm_list_json):
+        try:
+            items = json.loads(helm_list_json or "[]")
+        except json.JSONDecodeError:
+            print("Error: Invalid helm list JSON output.")
+            return HelmInventory()
+
+        releases = []
+        for item in items if isinstance(items, list) else []:
+            chart = item.get("chart") or ""
+            match = HelmInventory.CHART_PATTERN.match(chart)
+            releases.append(HelmRelease(
+                name=item.get("name") or "",
+                namespace=item.get("namespace") or "",
+                chart=chart,
+                chart_name=match.group("name") if match else chart,
+                chart_version=match.group("version") if match else "",
+                app_version=item.get("app_version") or "",
+                status=item.get("status") or "",
+            ))
+        return HelmInventory(releases)
+
+    def find_by_chart_name(self, chart_name):
+        return [release for release in self.releases if release.chart_name == chart_name]
+
+    def get_chart_version(self, chart_name):
+        """Return the chart version of the first release of chart_name, e.g. "1.13.0"."""
+        releases = self.find_by_chart_name(chart_name)
+        return releases[0].chart_version if releases else ""
+
+    def get_charts(self, keyword):
+        """Return all charts which contain keyword, e.g. "tibco-cp" -> ["tibco-cp-base-1.13.0", ...]."""
+        return [release.chart for release in self.releases if keyword in release.chart]
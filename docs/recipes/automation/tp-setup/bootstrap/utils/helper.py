@@ -2,15 +2,55 @@
 
 import subprocess
 import os
+import signal
 import sys
 import json
+import re
+import base64
 import platform
+import threading
+import time
+from collections import deque
 from pathlib import Path
 
 from utils.color_logger import ColorLogger
+from utils.command_telemetry import CommandTelemetry
+from utils.helm_inventory import HelmInventory
+from utils.k8s_client import KubernetesClient, KubernetesClientError
 
 # do not import env.py or util.py in this file
 class Helper:
+    # default timeout in seconds of get_command_output and AsyncCommandExecutor, 0 means no timeout
+    COMMAND_TIMEOUT = int(os.environ.get("TP_AUTO_COMMAND_TIMEOUT", 600)) or None
+    # timeout in seconds of run_shell_file, scripts install helm charts so they get more time, 0 means no timeout
+    SCRIPT_TIMEOUT = int(os.environ.get("TP_AUTO_SCRIPT_TIMEOUT", 3600)) or None
+    # run_shell_file prints the script output line by line, and only keeps the last lines in memory
+    IS_STREAM_SCRIPT_OUTPUT = os.environ.get("TP_AUTO_STREAM_SCRIPT_OUTPUT", "true").lower() == "true"
+    SCRIPT_OUTPUT_TAIL_LINES = int(os.environ.get("TP_AUTO_SCRIPT_OUTPUT_TAIL_LINES") or 200)
+    # read-only kubectl/helm query results are kept for COMMAND_CACHE_TTL seconds, 0 disables the cache
+    COMMAND_CACHE_TTL = int(os.environ.get("TP_AUTO_COMMAND_CACHE_TTL") or 60)
+    # global flags before the sub command, e.g. "kubectl -n my-ns get pods"
+    _FLAGS = r"\s+(?:-\S+\s+(?:[^-\s]\S*\s+)?)*"
+    READ_ONLY_COMMAND_PATTERN = re.compile(rf"^\s*(kubectl{_FLAGS}get|helm{_FLAGS}(list|ls))\b")
+    MUTATING_COMMAND_PATTERN = re.compile(
+        rf"\b(kubectl{_FLAGS}(create|apply|delete|patch|replace|label|annotate|scale|rollout|set|edit|expose|run|cordon|uncordon|drain|taint)"
+        rf"|helm{_FLAGS}(install|upgrade|uninstall|delete|rollback))\b"
+    )
+    # kubectl fallback commands of the cluster queries, ClusterDiscovery also runs them with AsyncCommandExecutor
+    CLUSTER_INFO_COMMAND = "kubectl cluster-info"
+    CP_DNS_DOMAIN_COMMAND = "kubectl get ingress -A | awk '$2 == \"router\" {print $4; exit}' | sed -E 's/^\\*?\\.//' | cut -d. -f2-"
+    ELASTIC_PASSWORD_COMMAND = "kubectl get secret -n elastic-system dp-config-es-es-elastic-user -o=jsonpath='{.data.elastic}' | base64 --decode; echo"
+    NODE_NAME_COMMAND = "kubectl get nodes | grep ' Ready ' | awk '{print $1}' | awk -F '.' '{print $1}'"
+    STORAGE_CLASS_COMMAND = "kubectl get sc | awk '/\\(default\\)/ {print $1}'"
+    HELM_LIST_COMMAND = "helm list --all-namespaces -o json"
+    _command_cache = {}
+    _command_cache_lock = threading.Lock()
+    _helm_inventory = None
+    _helm_inventory_lock = threading.Lock()
+    _k8s_client = None
+    _k8s_client_kubeconfig = None
+    _k8s_client_lock = threading.Lock()
+
     @staticmethod
     def is_headless():
         # headless mode is enabled in docker
@@ -27,7 +67,13 @@ class Helper:
         return bash_path
 
     @staticmethod
-    def run_shell_file(script_path, custom_env_dict=None):
+    def run_shell_file(script_path, custom_env_dict=None, is_stream=None, timeout=None):
+        """
+        Run a shell script file, it is killed after timeout seconds (default SCRIPT_TIMEOUT).
+        In stream mode (default, see TP_AUTO_STREAM_SCRIPT_OUTPUT), the output is printed as it arrives,
+        and only the last SCRIPT_OUTPUT_TAIL_LINES lines are returned, otherwise the whole stdout is returned when the script exits.
+        """
+        timeout = timeout or Helper.SCRIPT_TIMEOUT
         # Check if the script file exists
         if not os.path.exists(script_path):
             raise FileNotFoundError(f"Script file not found: {script_path}")
@@ -47,13 +93,16 @@ class Helper:
                 **Helper.get_env_vars(),
                 **(custom_env_dict or {})
             }
-            result = subprocess.run(
+            if Helper.is_mutating_script(script_path):
+                Helper.invalidate_command_cache()
+            if Helper.IS_STREAM_SCRIPT_OUTPUT if is_stream is None else is_stream:
+                return Helper.stream_process(command, env_vars, timeout=timeout)
+            result = Helper.run_process(
                 command,             # Path to the script
                 shell=False,               # Run without invoking the shell for added security
-                check=True,                # Raise an error if the script exits with a non-zero status
-                capture_output=True,       # Capture standard output and standard error
-                text=True,                 # Decode the output as text (not bytes)
-                env=env_vars
+                check=True,                # Raise CalledProcessError when the script fails
+                env=env_vars,
+                timeout=timeout
             )
             if result.stderr:
                 print(f"Command stderr: {result.stderr.strip()}")
@@ -64,15 +113,86 @@ class Helper:
             # Handle errors during script execution
             print(f"Error while executing script: {e}")
             print(f"Script stderr:\n{e.stderr}")
+        except subprocess.TimeoutExpired as e:
+            print(f"Script timed out after {timeout} seconds: {script_path}")
+            print(f"Script output:\n{e.output}")
         except Exception as e:
             # Handle any unexpected exceptions
             print(f"An unexpected error occurred: {e}")
         return ""
 
     @staticmethod
-    def get_command_output(command, is_print_cmd=False, is_print_error=True):
+    def stream_process(command, env=None, tail_lines=None, timeout=None):
+        """
+        Run command, print stdout and stderr line by line as they arrive, keep the last tail_lines lines in a ring buffer.
+        Return the tail as text, if the command fails or runs longer than timeout seconds, the tail is printed again for error reporting.
+        """
+        tail = deque(maxlen=tail_lines or Helper.SCRIPT_OUTPUT_TAIL_LINES)
+        output_size = 0
+        start_time = time.time()
+        process = subprocess.Popen(
+            command,
+            shell=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=env,
+            start_new_session=platform.system() != "Windows"
+        )
+        # the output is read line by line, so the timeout is a timer which kills the process group
+        is_timeout = threading.Event()
+
+        def kill_on_timeout():
+            is_timeout.set()
+            Helper.kill_process_tree(process)
+
+        timer = threading.Timer(timeout, kill_on_timeout) if timeout else None
+        if timer:
+            timer.daemon = True
+            timer.start()
+        try:
+            for line in process.stdout:
+                output_size += len(line)
+                line = line.rstrip("\n")
+                tail.append(line)
+                print(line, flush=True)
+            process.wait()
+        except BaseException:
+            Helper.kill_process_tree(process)
+            process.wait()
+            raise
+        finally:
+            if timer:
+                timer.cancel()
+            process.stdout.close()
+            CommandTelemetry.record(command, time.time() - start_time, process.returncode, output_size)
+
+        output = "\n".join(tail)
+        if is_timeout.is_set():
+            print(f"Error while executing script: {' '.join(map(str, command))} timed out after {timeout} seconds")
+            print(f"Script output (last {len(tail)} lines):\n{output}")
+            return ""
+        if process.returncode != 0:
+            print(f"Error while executing script: {' '.join(map(str, command))} returned non-zero exit status {process.returncode}")
+            print(f"Script output (last {len(tail)} lines):\n{output}")
+            return ""
+        return output
+
+    @staticmethod
+    def get_command_output(command, is_print_cmd=False, is_print_error=True, timeout=None):
         if command is None or command.strip() == "":
             return None
+        timeout = timeout or Helper.COMMAND_TIMEOUT
+        cache_key = Helper.get_command_cache_key(command)
+        if cache_key:
+            is_hit, output = Helper.get_cached_output(cache_key)
+            if is_hit:
+                if is_print_cmd:
+                    print(f"Use cached output of command: {command}")
+                return output
+        elif Helper.MUTATING_COMMAND_PATTERN.search(command):
+            Helper.invalidate_command_cache()
         try:
             if platform.system() == "Windows":
                 bash_path = Helper.get_windows_bash()
@@ -83,23 +203,109 @@ class Helper:
             else:
                 if is_print_cmd:
                     print(f"Run command: {command}")
-            result = subprocess.run(
+            result = Helper.run_process(
                 command,
                 shell=True,
-                capture_output=True,
-                text=True,
                 check=True,
-                env=Helper.get_env_vars()
+                env=Helper.get_env_vars(),
+                timeout=timeout
             )
             if result.stderr and is_print_error:
                 print(f"Run command: {command}")
                 print(f"Command stderr: {result.stderr.strip()}")
+            if cache_key:
+                Helper.set_cached_output(cache_key, result.stdout.strip())
             return result.stdout.strip()  # Return standard output
         except subprocess.CalledProcessError as e:
             if is_print_error:
                 print(f"Failed command: {command}")
                 print(f"Command failed with error: {e.stderr.strip()}")
             return None
+        except subprocess.TimeoutExpired:
+            if is_print_error:
+                print(f"Command timed out after {timeout} seconds: {command}")
+            return None
+
+    @staticmethod
+    def get_command_cache_key(command):
+        """Only read-only kubectl get/helm list commands are cached, the key is the command and the kubeconfig."""
+        if Helper.COMMAND_CACHE_TTL <= 0 or not isinstance(command, str):
+            return None
+        if not Helper.READ_ONLY_COMMAND_PATTERN.match(command) or Helper.MUTATING_COMMAND_PATTERN.search(command):
+            return None
+        return command.strip(), Helper.get_kubeconfig_path()
+
+    @staticmethod
+    def get_cached_output(cache_key):
+        """Return (is_hit, output) of a cached command."""
+        with Helper._command_cache_lock:
+            entry = Helper._command_cache.get(cache_key)
+            if entry is None:
+                return False, None
+            if time.time() - entry[0] > Helper.COMMAND_CACHE_TTL:
+                del Helper._command_cache[cache_key]
+                return False, None
+            return True, entry[1]
+
+    @staticmethod
+    def set_cached_output(cache_key, output):
+        with Helper._command_cache_lock:
+            Helper._command_cache[cache_key] = (time.time(), output)
+
+    @staticmethod
+    def invalidate_command_cache():
+        """Forget all cached query results, it is called when a command changes the cluster."""
+        with Helper._command_cache_lock:
+            Helper._command_cache.clear()
+        with Helper._helm_inventory_lock:
+            Helper._helm_inventory = None
+
+    @staticmethod
+    def is_mutating_script(script_path):
+        try:
+            with open(script_path, "r", encoding="utf-8", errors="replace") as f:
+                return bool(Helper.MUTATING_COMMAND_PATTERN.search(f.read()))
+        except OSError:
+            # unknown script content, assume it changes the cluster
+            return True
+
+    @staticmethod
+    def run_process(command, shell=False, env=None, timeout=None, check=False):
+        """
+        Same as subprocess.run(capture_output=True, text=True), but the command runs in its own process group,
+        so on timeout the whole pipeline (e.g. "kubectl ... | awk ...") is killed, not only the shell.
+        """
+        process = subprocess.Popen(
+            command,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env,
+            start_new_session=platform.system() != "Windows"
+        )
+        start_time = time.time()
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            Helper.kill_process_tree(process)
+            stdout, stderr = process.communicate()
+            CommandTelemetry.record(command, time.time() - start_time, process.returncode, len(stdout or ""))
+            raise subprocess.TimeoutExpired(process.args, timeout, output=stdout, stderr=stderr)
+        CommandTelemetry.record(command, time.time() - start_time, process.returncode, len(stdout or ""))
+        if check and process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args, output=stdout, stderr=stderr)
+        return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+
+    @staticmethod
+    def kill_process_tree(process):
+        try:
+            if platform.system() == "Windows":
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
 
     @staticmethod
     def get_env_vars():
@@ -111,32 +317,156 @@ class Helper:
         return env_vars
 
     @staticmethod
-    def get_cp_dns_domain():
-        return Helper.get_command_output("kubectl get ingress -A | awk '$2 == \"router\" {print $4; exit}' | sed -E 's/^\\*?\\.//' | cut -d. -f2-", is_print_error=False)
+    def get_kubeconfig_path():
+        kubeconfig = Helper.get_env_vars().get("KUBECONFIG") or os.path.join("~", ".kube", "config")
+        # only the first file is used if KUBECONFIG has a list of files
+        return os.path.abspath(os.path.expanduser(kubeconfig.split(os.pathsep)[0]))
+
+    @staticmethod
+    def get_k8s_client():
+        """
+        Return the in-process Kubernetes API client when TP_AUTO_K8S_NATIVE_CLIENT=true, otherwise None.
+        The client is created once per kubeconfig, and None is returned if the kubeconfig is not supported (e.g. exec auth).
+        """
+        if os.environ.get("TP_AUTO_K8S_NATIVE_CLIENT", "false").lower() != "true":
+            return None
+        kubeconfig = Helper.get_kubeconfig_path()
+        with Helper._k8s_client_lock:
+            if Helper._k8s_client_kubeconfig != kubeconfig:
+                if Helper._k8s_client is not None:
+                    Helper._k8s_client.close()
+                try:
+                    Helper._k8s_client = KubernetesClient.from_kubeconfig(kubeconfig)
+                    print(f"Use Kubernetes API client for {Helper._k8s_client.server}")
+                except KubernetesClientError as e:
+                    ColorLogger.warning(f"Kubernetes API client is not available, use kubectl instead: {e}")
+                    Helper._k8s_client = None
+                Helper._k8s_client_kubeconfig = kubeconfig
+            return Helper._k8s_client
+
+    @staticmethod
+    def query_cluster(native_query, command, timeout=None):
+        """
+        Run native_query(client) with the Kubernetes API client if it is enabled, otherwise run the kubectl command.
+        If the API request fails, fall back to the kubectl command, a not found resource returns None as kubectl does.
+        """
+        client = Helper.get_k8s_client()
+        if client is not None:
+            # the API result is cached with the same key as the kubectl command
+            cache_key = Helper.get_command_cache_key(command)
+            is_hit, output = Helper.get_cached_output(cache_key) if cache_key else (False, None)
+            if is_hit:
+                return output
+            start_time = time.time()
+            try:
+                output = native_query(client)
+                CommandTelemetry.record(command, time.time() - start_time, 0, len(output or "") if isinstance(output, str) else 0, "k8s-api")
+                if cache_key:
+                    Helper.set_cached_output(cache_key, output)
+                return output
+            except KubernetesClientError as e:
+                CommandTelemetry.record(command, time.time() - start_time, e.status or -1, 0, "k8s-api")
+                if e.status == 404:
+                    return None
+                print(f"Kubernetes API query failed, fall back to kubectl: {e}")
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                print(f"Unexpected Kubernetes API response, fall back to kubectl: {e!r}")
+        return Helper.get_command_output(command, is_print_error=False, timeout=timeout)
+
+    @staticmethod
+    def is_cluster_accessible(timeout=None):
+        # the API client checks /version, kubectl cluster-info prints "Kubernetes control plane is running at ..."
+        output = Helper.query_cluster(
+            lambda client: "Kubernetes control plane" if client.get_version(timeout) else "",
+            Helper.CLUSTER_INFO_COMMAND,
+            timeout
+        )
+        return "Kubernetes control plane" in (output or "")
+
+    @staticmethod
+    def get_cp_dns_domain(timeout=None):
+        def native_query(client):
+            for ingress in client.list_ingresses(timeout):
+                if ingress.get("metadata", {}).get("name") != "router":
+                    continue
+                # same as the HOSTS column of kubectl, e.g. "*.cp1-my.localhost.dataplanes.pro" -> "localhost.dataplanes.pro"
+                hosts = ",".join(rule.get("host") or "*" for rule in ingress.get("spec", {}).get("rules") or [])
+                hosts = re.sub(r"^\*?\.", "", hosts)
+                return hosts.split(".", 1)[1] if "." in hosts else hosts
+            return ""
+        return Helper.query_cluster(
+            native_query,
+            Helper.CP_DNS_DOMAIN_COMMAND,
+            timeout
+        )
+
+    @staticmethod
+    def get_elastic_password(timeout=None):
+        return Helper.query_cluster(
+            lambda client: Helper.decode_secret_data(client.get_secret("elastic-system", "dp-config-es-es-elastic-user", timeout), "elastic"),
+            Helper.ELASTIC_PASSWORD_COMMAND,
+            timeout
+        )
+
+    @staticmethod
+    def decode_secret_data(secret, key):
+        value = (secret.get("data") or {}).get(key)
+        return base64.b64decode(value).decode("utf-8").strip() if value else ""
 
     @staticmethod
-    def get_elastic_password():
-        return Helper.get_command_output("kubectl get secret -n elastic-system dp-config-es-es-elastic-user -o=jsonpath='{.data.elastic}' | base64 --decode; echo", is_print_error=False)
+    def get_helm_inventory(timeout=None, refresh=False):
+        """Run `helm list -A -o json` once per process, all helm version lookups read from this inventory."""
+        with Helper._helm_inventory_lock:
+            if Helper._helm_inventory is None or refresh:
+                output = Helper.get_command_output(Helper.HELM_LIST_COMMAND, is_print_error=False, timeout=timeout)
+                if output is None:
+                    # do not keep the failed result, try again next time
+                    return HelmInventory()
+                Helper._helm_inventory = HelmInventory.parse(output)
+            return Helper._helm_inventory
 
     @staticmethod
-    def get_cp_version():
-        return Helper.get_command_output("helm ls -A | grep platform-base | awk '{print $9}' | awk -F 'platform-base-' '{print $2}' | cut -d'.' -f1,2", is_print_error=False)
+    def set_helm_inventory(helm_list_json):
+        """Keep the inventory parsed from the output of HELM_LIST_COMMAND, e.g. when ClusterDiscovery ran it."""
+        with Helper._helm_inventory_lock:
+            Helper._helm_inventory = HelmInventory.parse(helm_list_json)
+            return Helper._helm_inventory
 
     @staticmethod
-    def get_cp_platform_bootstrap_version():
-        return Helper.get_command_output(r"helm list --all-namespaces | grep platform-bootstrap | sed -n 's/.*platform-bootstrap-\(.*\)[[:space:]].*/\1/p' | sed 's/[[:space:]].*//'", is_print_error=False)
+    def get_cp_version(timeout=None):
+        # only keep major.minor, e.g. 1.13.0 -> 1.13
+        version = Helper.get_cp_platform_base_version(timeout)
+        return ".".join(version.split(".")[:2]) if version else ""
 
     @staticmethod
-    def get_cp_platform_base_version():
-        return Helper.get_command_output(r"helm list --all-namespaces | grep platform-base | sed -n 's/.*platform-base-\(.*\)[[:space:]].*/\1/p' | sed 's/[[:space:]].*//'", is_print_error=False)
+    def get_cp_platform_bootstrap_version(timeout=None):
+        return Helper.get_helm_inventory(timeout).get_chart_version("platform-bootstrap")
 
     @staticmethod
-    def get_all_tibco_cp_version():
-        return Helper.get_command_output("helm list --all-namespaces -o json | jq -r '.[].chart' | grep tibco-cp", is_print_error=False)
+    def get_cp_platform_base_version(timeout=None):
+        return Helper.get_helm_inventory(timeout).get_chart_version("platform-base")
 
     @staticmethod
-    def get_node_name():
-        return Helper.get_command_output("kubectl get nodes | grep ' Ready ' | awk '{print $1}' | awk -F '.' '{print $1}'", is_print_error=False)
+    def get_all_tibco_cp_version(timeout=None):
+        return "\n".join(Helper.get_helm_inventory(timeout).get_charts("tibco-cp"))
+
+    @staticmethod
+    def get_node_name(timeout=None):
+        def native_query(client):
+            # same as the STATUS "Ready" of kubectl, not "NotReady" or "Ready,SchedulingDisabled"
+            return "\n".join(
+                node["metadata"]["name"].split(".")[0]
+                for node in client.list_nodes(timeout)
+                if not node.get("spec", {}).get("unschedulable") and any(
+                    condition.get("type") == "Ready" and condition.get("status") == "True"
+                    for condition in node.get("status", {}).get("conditions") or []
+                )
+            )
+        return Helper.query_cluster(
+            native_query,
+            Helper.NODE_NAME_COMMAND,
+            timeout
+        )
 
     @staticmethod
     def get_node_ip():
@@ -146,19 +476,40 @@ class Helper:
 
     @staticmethod
     def get_deployment_images(namespace):
-        return Helper.get_command_output(f"kubectl get deployment -n {namespace} -o json | jq -r '.items[] | .metadata.name as $name | .spec.template.spec.containers[0].image | (split(\"/\")[-1])'", is_print_error=False)
+        return Helper.query_cluster(
+            lambda client: "\n".join(
+                deployment["spec"]["template"]["spec"]["containers"][0]["image"].split("/")[-1]
+                for deployment in client.list_deployments(namespace)
+            ),
+            f"kubectl get deployment -n {namespace} -o json | jq -r '.items[] | .metadata.name as $name | .spec.template.spec.containers[0].image | (split(\"/\")[-1])'"
+        )
 
     @staticmethod
     def get_auto_token_creation():
-        return Helper.get_command_output("kubectl get secret auto-token -n automation -o jsonpath='{.metadata.creationTimestamp}'", is_print_error=False)
+        return Helper.query_cluster(
+            lambda client: client.get_secret("automation", "auto-token")["metadata"].get("creationTimestamp") or "",
+            "kubectl get secret auto-token -n automation -o jsonpath='{.metadata.creationTimestamp}'"
+        )
 
     @staticmethod
     def get_auto_token():
-        return Helper.get_command_output("kubectl get secret auto-token -n automation -o jsonpath=\"{.data['auto-token']}\" | base64 --decode", is_print_error=False)
+        return Helper.query_cluster(
+            lambda client: Helper.decode_secret_data(client.get_secret("automation", "auto-token"), "auto-token"),
+            "kubectl get secret auto-token -n automation -o jsonpath=\"{.data['auto-token']}\" | base64 --decode"
+        )
 
     @staticmethod
-    def get_storage_class():
-        return Helper.get_command_output("kubectl get sc | awk '/\\(default\\)/ {print $1}'", is_print_error=False)
+    def get_storage_class(timeout=None):
+        default_annotations = ["storageclass.kubernetes.io/is-default-class", "storageclass.beta.kubernetes.io/is-default-class"]
+        return Helper.query_cluster(
+            lambda client: "\n".join(
+                sc["metadata"]["name"]
+                for sc in client.list_storage_classes(timeout)
+                if any((sc["metadata"].get("annotations") or {}).get(key) == "true" for key in default_annotations)
+            ),
+            Helper.STORAGE_CLASS_COMMAND,
+            timeout
+        )
 
     @staticmethod
     def get_app_file_fullpath(app_file_name):
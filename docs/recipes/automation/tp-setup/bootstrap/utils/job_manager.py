@@ -0,0 +1,323 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import heapq
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from utils.case_worker import CaseWorker
+from utils.color_logger import ColorLogger
+from utils.util import Util
+
+class Job:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+    def __init__(self, case, env_vars, log_folder, priority=0, prepare=None, finish=None):
+        self.id = str(uuid.uuid4())
+        self.case = case
+        self.env_vars = env_vars
+        self.priority = priority
+        self.prepare = prepare
+        self.finish = finish
+        self.workspace = ""  # report and artifact folder of the job, removed together with the job log
+        self.state = Job.QUEUED
+        self.is_cancel_requested = False
+        self.return_code = None
+        self.process = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.log_file = JobManager.get_log_file(log_folder, self.id)
+        self.log_size = 0
+        self.changed = threading.Condition()
+        os.makedirs(log_folder, exist_ok=True)
+        open(self.log_file, "wb").close()
+
+    def is_finished(self):
+        return self.state in Job.FINISHED_STATES
+
+    def append_line(self, line):
+        data = f"{line}\n".encode("utf-8")
+        with self.changed:
+            with open(self.log_file, "ab") as f:
+                f.write(data)
+            self.log_size += len(data)
+            self.changed.notify_all()
+
+    def iter_log(self, offset, batch_bytes=65536, batch_interval=0.2, heartbeat_interval=15):
+        """
+        Yield the log from byte offset in batches of complete lines until the job is finished and the whole log is read.
+
+        New output is collected for up to batch_interval seconds or batch_bytes, b"" is yielded after heartbeat_interval
+        seconds without output. The log is read at the pace of the consumer, so a slow client gets bigger batches
+        but never blocks the job or holds its output in memory.
+        Only complete lines are visible, log_size is updated after a line is written.
+        """
+        while True:
+            with self.changed:
+                if offset >= self.log_size and not self.is_finished():
+                    self.changed.wait(heartbeat_interval)
+                batch_deadline = time.time() + batch_interval
+                while offset < self.log_size < offset + batch_bytes and not self.is_finished() and time.time() < batch_deadline:
+                    self.changed.wait(batch_deadline - time.time())
+                log_size, is_finished = self.log_size, self.is_finished()
+            data = JobManager.read_log_file(self.log_file, offset, min(log_size, offset + batch_bytes))
+            if offset + len(data) < log_size and b"\n" in data:
+                data = data[:data.rindex(b"\n") + 1]
+            if data or not is_finished:
+                yield data
+            offset += len(data)
+            if is_finished and offset >= log_size:
+                return
+
+    def set_state(self, state):
+        with self.changed:
+            self.state = state
+            if state in Job.FINISHED_STATES:
+                self.finished_at = time.time()
+            self.changed.notify_all()
+
+    def to_dict(self):
+        end_time = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "case": self.case,
+            "state": self.state,
+            "priority": self.priority,
+            "pid": self.process.pid if self.process else None,
+            "returnCode": self.return_code,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "duration": round(end_time - self.started_at, 2) if self.started_at else None,
+            "workspace": self.workspace,
+        }
+
+class JobManager:
+    """
+    Run automation cases (python -u -m case.xxx) in at most max_workers processes at the same time,
+    the other jobs wait in a queue, a lower priority runs first, jobs with the same priority run in FIFO order.
+
+    A job keeps running when the client which submitted it disconnects, only cancel() stops it.
+    The output of a job is appended to <log_folder>/<job id>.log, so a client can read it again from any offset.
+    The last history_size finished jobs and their logs are kept for the /jobs endpoints.
+    The logs and workspaces (<workspace_folder>/<job id>) of earlier server runs are removed at startup,
+    except the newest history_size which are not older than history_ttl seconds.
+
+    With worker_max_jobs > 0, every worker thread keeps a pre-warmed CaseWorker process which runs the jobs,
+    and is replaced after worker_max_jobs jobs, otherwise every job starts a new Python process.
+    """
+    def __init__(self, max_workers, log_folder, history_size=100, worker_max_jobs=0, worker_warm_modules=(),
+                 workspace_folder="", history_ttl=0):
+        self.max_workers = max(1, max_workers)
+        self.log_folder = log_folder
+        self.workspace_folder = workspace_folder
+        self.history_size = history_size
+        self.history_ttl = history_ttl
+        self.worker_max_jobs = worker_max_jobs
+        self.worker_warm_modules = worker_warm_modules
+        self.jobs = {}
+        self._queue = []
+        self._sequence = itertools.count()
+        self._lock = threading.Condition()
+        JobManager.remove_old_files(self.log_folder, ".log", self.history_size, self.history_ttl)
+        if self.workspace_folder:
+            JobManager.remove_old_files(self.workspace_folder, "", self.history_size, self.history_ttl)
+        for index in range(self.max_workers):
+            threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True).start()
+
+    def submit(self, case, env_vars, priority=0, prepare=None, finish=None):
+        """Queue a job, prepare(job) is called right before the job process starts, finish(job) after it exits."""
+        job = Job(case, env_vars, self.log_folder, priority, prepare, finish)
+        with self._lock:
+            self.jobs[job.id] = job
+            heapq.heappush(self._queue, (priority, next(self._sequence), job))
+            running_count = sum(1 for other_job in self.jobs.values() if other_job.state == Job.RUNNING)
+            position = self._get_position(job.id) - (self.max_workers - running_count)
+            self._remove_old_jobs()
+            self._lock.notify()
+        print(f"[INFO] Job {job.id} {case} queued")
+        if position > 0:
+            job.append_line(f"Job {job.id} is queued at position {position}, at most {self.max_workers} jobs run at the same time")
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def get_position(self, job_id):
+        """1 based position of a queued job, 0 if the job is not queued."""
+        with self._lock:
+            return self._get_position(job_id)
+
+    @staticmethod
+    def get_log_file(log_folder, job_id):
+        # job_id comes from the url, only accept a uuid so it can not point outside the log folder
+        return os.path.join(log_folder, f"{uuid.UUID(job_id)}.log")
+
+    @staticmethod
+    def read_log_file(log_file, offset, end=None):
+        """Return the bytes of log_file from offset up to end (default the end of file), empty bytes if it does not exist."""
+        try:
+            with open(log_file, "rb") as f:
+                f.seek(max(0, offset))
+                return f.read() if end is None else f.read(max(0, end - offset))
+        except OSError:
+            return b""
+
+    @staticmethod
+    def remove_old_files(folder, suffix, history_size, history_ttl=0):
+        """
+        Remove the <job id><suffix> files and folders in folder, except the newest history_size
+        which are not older than history_ttl seconds (0 means no age limit), return the number of removed entries.
+        """
+        try:
+            names = [name for name in os.listdir(folder) if name.endswith(suffix) and JobManager._is_job_id(name[:len(name) - len(suffix)])]
+        except OSError:
+            return 0
+        entries = []
+        for name in names:
+            try:
+                entries.append((os.path.getmtime(os.path.join(folder, name)), name))
+            except OSError:
+                pass
+        entries.sort(reverse=True)
+        now = time.time()
+        removed_count = 0
+        for index, (mtime, name) in enumerate(entries):
+            if index < history_size and (history_ttl <= 0 or now - mtime <= history_ttl):
+                continue
+            file_path = os.path.join(folder, name)
+            if os.path.isdir(file_path):
+                shutil.rmtree(file_path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    continue
+            removed_count += 1
+        if removed_count:
+            print(f"[INFO] Removed {removed_count} old job files from {folder}")
+        return removed_count
+
+    @staticmethod
+    def _is_job_id(name):
+        try:
+            return str(uuid.UUID(name)) == name
+        except ValueError:
+            return False
+
+    def list(self):
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return [dict(job.to_dict(), position=self.get_position(job.id)) for job in jobs]
+
+    def cancel(self, job_id):
+        """Cancel a queued job, or terminate the process of a running job, return False if there is nothing to cancel."""
+        job = self.jobs.get(job_id)
+        if job is None or job.is_finished():
+            return False
+        with self._lock:
+            if job.state == Job.QUEUED:
+                job.set_state(Job.CANCELLED)
+                return True
+            # the job stays running until its process exits, so the output is still read to the end
+            job.is_cancel_requested = True
+            process = job.process
+        if process and process.poll() is None:
+            print(f"[INFO] Stopping process (PID: {process.pid})...")
+            process.terminate()  # Try to terminate gracefully
+            try:
+                process.wait(timeout=2)  # Wait up to 2 seconds
+            except subprocess.TimeoutExpired:
+                process.kill()  # Force kill if termination fails
+        return True
+
+    def _worker(self):
+        case_worker = None
+        if self.worker_max_jobs > 0:
+            # start the worker before the first job, so it is warm when the job comes
+            case_worker = CaseWorker(self.worker_max_jobs, self.worker_warm_modules)
+            case_worker.start()
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._lock.wait()
+                _, _, job = heapq.heappop(self._queue)
+                if job.state != Job.QUEUED:
+                    continue
+                job.state = Job.RUNNING
+            self._run(job, case_worker)
+            if case_worker is not None and not case_worker.is_available():
+                case_worker.start()
+
+    def _run(self, job, case_worker=None):
+        job.started_at = time.time()
+        try:
+            if job.prepare is not None:
+                job.prepare(job)
+            with self._lock:
+                if job.is_cancel_requested:
+                    job.set_state(Job.CANCELLED)
+                    return
+                if case_worker is None:
+                    # Start the script using unbuffered output
+                    print(f'[INFO] Job {job.id}: {sys.executable}, "-u", "-m", {job.case}')
+                    job.process = subprocess.Popen(
+                        [sys.executable, "-u", "-m", job.case],  # `-u` ensures unbuffered output
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,
+                        env=job.env_vars
+                    )
+                else:
+                    job.process = case_worker.process if case_worker.is_available() else case_worker.start()
+                    print(f'[INFO] Job {job.id}: {job.case} in case worker (PID: {job.process.pid})')
+                    case_worker.submit(job.case, job.env_vars)
+            if case_worker is None:
+                # read until EOF, so the output printed right before the process exits is not lost
+                output_lines = iter(job.process.stdout.readline, b"")
+            else:
+                output_lines = case_worker.read_output()
+            for line in output_lines:
+                if line.strip():
+                    job.append_line(Util.clean_ansi_escape(line))
+            if case_worker is None:
+                job.process.stdout.close()
+                job.return_code = job.process.wait()
+            else:
+                job.return_code = case_worker.return_code
+        except Exception as e:
+            ColorLogger.error(f"Job {job.id} {job.case} failed to run: {e}")
+            job.append_line(f"[ERROR] Job failed to run: {e}")
+        if job.finish is not None:
+            try:
+                job.finish(job)
+            except Exception as e:
+                ColorLogger.error(f"Job {job.id} {job.case} failed to finish: {e}")
+        if job.is_cancel_requested:
+            job.set_state(Job.CANCELLED)
+        else:
+            job.set_state(Job.SUCCEEDED if job.return_code == 0 else Job.FAILED)
+        print(f"[INFO] Job {job.id} {job.case} {job.state} in {job.finished_at - job.started_at:.2f} seconds")
+
+    def _get_position(self, job_id):
+        queued_ids = [job.id for _, _, job in sorted(self._queue) if job.state == Job.QUEUED]
+        return queued_ids.index(job_id) + 1 if job_id in queued_ids else 0
+
+    def _remove_old_jobs(self):
+        finished_jobs = [job for job in self.jobs.values() if job.is_finished()]
+        for job in finished_jobs[:max(0, len(finished_jobs) - self.history_size)]:
+            self.jobs.pop(job.id, None)
+            if os.path.exists(job.log_file):
+                os.remove(job.log_file)
+            if job.workspace:
+                shutil.rmtree(job.workspace, ignore_errors=True)
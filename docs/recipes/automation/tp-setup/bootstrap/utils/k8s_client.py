@@ -0,0 +1,194 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import atexit
+import base64
+import binascii
+import http.client
+import json
+import os
+import queue
+import ssl
+import tempfile
+from urllib.parse import urlparse, urlencode
+
+import yaml
+
+class KubernetesClientError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        # HTTP status of the API response, None if the request did not get a response
+        self.status = status
+
+class KubernetesClient:
+    """
+    A small in-process Kubernetes API client, it keeps a pool of keep-alive connections,
+    so a query does not start a kubectl process and does not do a new TLS handshake every time.
+
+    Only static credentials from kubeconfig are supported (client certificate, token, basic auth).
+    For exec/auth-provider users (e.g. EKS, GKE), from_kubeconfig() raises KubernetesClientError,
+    and the caller should use kubectl instead.
+    The server can also be a plain http:// URL, e.g. a local fake API server for testing.
+    """
+    def __init__(self, server, ssl_context=None, headers=None, max_connections=4, timeout=30):
+        parsed = urlparse(server)
+        if parsed.scheme not in ("http", "https"):
+            raise KubernetesClientError(f"Unsupported Kubernetes API server URL: {server}")
+        self.server = server
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.ssl_context = ssl_context
+        self.headers = {"Accept": "application/json", **(headers or {})}
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=max_connections)
+        self._temp_files = []
+
+    @staticmethod
+    def from_kubeconfig(kubeconfig_path, context_name=None, **kwargs):
+        try:
+            with open(kubeconfig_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            raise KubernetesClientError(f"Cannot read kubeconfig {kubeconfig_path}: {e}")
+
+        context_name = context_name or config.get("current-context")
+        context = KubernetesClient._find_named(config.get("contexts"), context_name, "context")
+        cluster = KubernetesClient._find_named(config.get("clusters"), context.get("cluster"), "cluster")
+        user = KubernetesClient._find_named(config.get("users"), context.get("user"), "user") if context.get("user") else {}
+        if "exec" in user or "auth-provider" in user:
+            raise KubernetesClientError(f"Kubeconfig user '{context.get('user')}' uses exec/auth-provider, it is not supported")
+
+        server = cluster.get("server") or ""
+        base_dir = os.path.dirname(os.path.abspath(kubeconfig_path))
+        client = KubernetesClient(server, **kwargs)
+
+        headers = {}
+        if user.get("token"):
+            headers["Authorization"] = f"Bearer {user['token']}"
+        elif user.get("username") and user.get("password"):
+            credentials = base64.b64encode(f"{user['username']}:{user['password']}".encode()).decode()
+            headers["Authorization"] = f"Basic {credentials}"
+        client.headers.update(headers)
+
+        if client.scheme == "https":
+            try:
+                client.ssl_context = KubernetesClient._create_ssl_context(client, cluster, user, base_dir)
+            except (ssl.SSLError, OSError, binascii.Error) as e:
+                # e.g. a malformed or missing certificate, the caller falls back to kubectl
+                client.close()
+                raise KubernetesClientError(f"Invalid TLS settings in kubeconfig {kubeconfig_path}: {e}")
+        return client
+
+    @staticmethod
+    def _create_ssl_context(client, cluster, user, base_dir):
+        ssl_context = ssl.create_default_context()
+        if cluster.get("insecure-skip-tls-verify"):
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+        else:
+            ca_file = client._get_file(cluster, "certificate-authority", base_dir)
+            if ca_file:
+                ssl_context.load_verify_locations(cafile=ca_file)
+        cert_file = client._get_file(user, "client-certificate", base_dir)
+        key_file = client._get_file(user, "client-key", base_dir)
+        if cert_file and key_file:
+            ssl_context.load_cert_chain(cert_file, key_file)
+        return ssl_context
+
+    def get(self, path, params=None, timeout=None):
+        """GET an API path, e.g. "/api/v1/nodes", and return the parsed JSON body."""
+        url = f"{self.base_path}{path}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+
+        # a pooled keep-alive connection may be closed by the server, retry once with a new connection
+        for attempt in range(2):
+            connection = self._get_connection(timeout)
+            try:
+                connection.request("GET", url, headers=self.headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError, OSError) as e:
+                connection.close()
+                if attempt == 0 and not isinstance(e, TimeoutError):
+                    continue
+                raise KubernetesClientError(f"GET {path} failed: {e}")
+            self._release_connection(connection, response)
+
+            if response.status >= 400:
+                raise KubernetesClientError(f"GET {path} returned HTTP {response.status}: {body[:200]!r}", response.status)
+            try:
+                return json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                raise KubernetesClientError(f"GET {path} returned invalid JSON: {e}")
+        return None
+
+    def get_version(self, timeout=None):
+        return self.get("/version", timeout=timeout)
+
+    def list_ingresses(self, timeout=None):
+        return self.get("/apis/networking.k8s.io/v1/ingresses", timeout=timeout).get("items") or []
+
+    def list_nodes(self, timeout=None):
+        return self.get("/api/v1/nodes", timeout=timeout).get("items") or []
+
+    def list_deployments(self, namespace, timeout=None):
+        return self.get(f"/apis/apps/v1/namespaces/{namespace}/deployments", timeout=timeout).get("items") or []
+
+    def list_storage_classes(self, timeout=None):
+        return self.get("/apis/storage.k8s.io/v1/storageclasses", timeout=timeout).get("items") or []
+
+    def get_secret(self, namespace, name, timeout=None):
+        return self.get(f"/api/v1/namespaces/{namespace}/secrets/{name}", timeout=timeout)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        for file_path in self._temp_files:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        self._temp_files = []
+
+    def _get_connection(self, timeout=None):
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            if self.scheme == "https":
+                connection = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.ssl_context)
+            else:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        connection.timeout = timeout or self.timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(connection.timeout)
+        return connection
+
+    def _release_connection(self, connection, response):
+        if response.will_close:
+            connection.close()
+            return
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _get_file(self, item, key, base_dir):
+        """Return the file path of item[key], or write item[key-data] to a temp file."""
+        if item.get(f"{key}-data"):
+            fd, file_path = tempfile.mkstemp(prefix="tp-auto-k8s-", suffix=".pem")
+            with os.fdopen(fd, "wb") as f:
+                f.write(base64.b64decode(item[f"{key}-data"]))
+            if not self._temp_files:
+                atexit.register(self.close)
+            self._temp_files.append(file_path)
+            return file_path
+        if item.get(key):
+            return os.path.join(base_dir, os.path.expanduser(item[key]))
+        return ""
+
+    @staticmethod
+    def _find_named(items, name, key):
+        for item in items or []:
+            if item.get("name") == name:
+                return item.get(key) or {}
+        raise KubernetesClientError(f"Kubeconfig {key} '{name}' is not found")
@@ -0,0 +1,110 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import time
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+class NetworkTracker:
+    """Count the in-flight requests of a page, websocket and event stream requests are ignored."""
+    IGNORED_RESOURCE_TYPES = ("websocket", "eventsource")
+
+    def __init__(self, page):
+        self.requests = set()
+        self.last_activity = time.time()
+        page.on("request", self.on_request_start)
+        page.on("requestfinished", self.on_request_end)
+        page.on("requestfailed", self.on_request_end)
+
+    def on_request_start(self, request):
+        if request.resource_type not in self.IGNORED_RESOURCE_TYPES:
+            self.requests.add(id(request))
+            self.last_activity = time.time()
+
+    def on_request_end(self, request):
+        if id(request) in self.requests:
+            self.requests.discard(id(request))
+            self.last_activity = time.time()
+
+class PageWait:
+    """
+    Condition based waits for page objects, use them instead of a fixed page.wait_for_timeout().
+
+    Every wait takes a timeout in seconds, returns True as soon as the condition is met,
+    or False when the timeout is reached, it does not raise.
+    So a fixed sleep of N seconds can be replaced by a condition with timeout N, and it is never slower.
+    """
+    # the page is quiet when there is no request in flight for this many milliseconds
+    NETWORK_QUIET_MS = 300
+
+    _trackers = {}
+
+    @staticmethod
+    def visible(dom_selector, timeout=5):
+        return PageWait._wait_for_state(dom_selector, "visible", timeout)
+
+    @staticmethod
+    def hidden(dom_selector, timeout=5):
+        return PageWait._wait_for_state(dom_selector, "hidden", timeout)
+
+    @staticmethod
+    def enabled(page, dom_selector, timeout=5):
+        return PageWait._wait_for_element(page, dom_selector, "(element) => element && !element.disabled", timeout)
+
+    @staticmethod
+    def has_value(page, dom_selector, timeout=5):
+        """Wait until an input has a non empty value, e.g. a dropdown which is filled after a request."""
+        return PageWait._wait_for_element(page, dom_selector, "(element) => element && element.value.trim() !== ''", timeout)
+
+    @staticmethod
+    def url(page, url_part, timeout=5):
+        try:
+            page.wait_for_url(lambda url: url_part in url, timeout=timeout * 1000)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    @staticmethod
+    def network_quiet(page, timeout=3, quiet_ms=None):
+        """Wait until the page has no request in flight for quiet_ms, e.g. after a click which loads data."""
+        quiet_seconds = (quiet_ms or PageWait.NETWORK_QUIET_MS) / 1000
+        tracker = PageWait.track_network(page)
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            if not tracker.requests and time.time() - max(tracker.last_activity, start_time) >= quiet_seconds:
+                return True
+            # a short wait lets playwright dispatch the request events
+            page.wait_for_timeout(50)
+        return False
+
+    @staticmethod
+    def is_api_response(response):
+        """A successful xhr/fetch response, e.g. the status API which a page polls by itself."""
+        return response.request.resource_type in ("xhr", "fetch") and response.ok
+
+    @staticmethod
+    def track_network(page):
+        """Start counting the requests of page, it is called in Util.browser_launch, and on first use for other pages."""
+        if page not in PageWait._trackers:
+            PageWait._trackers[page] = NetworkTracker(page)
+            page.on("close", lambda closed_page: PageWait._trackers.pop(closed_page, None))
+        return PageWait._trackers[page]
+
+    @staticmethod
+    def _wait_for_state(dom_selector, state, timeout):
+        try:
+            # .first avoids a strict mode error when the selector matches several elements
+            dom_selector.first.wait_for(state=state, timeout=timeout * 1000)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    @staticmethod
+    def _wait_for_element(page, dom_selector, expression, timeout):
+        start_time = time.time()
+        if not PageWait.visible(dom_selector, timeout):
+            return False
+        remaining = max(timeout - (time.time() - start_time), 0.001)
+        try:
+            page.wait_for_function(expression, arg=dom_selector.first.element_handle(), timeout=remaining * 1000)
+            return True
+        except PlaywrightTimeoutError:
+            return False
@@ -1,9 +1,23 @@
 import os
-import subprocess
+import copy
 import json
+import contextlib
+import tempfile
+import threading
+import time
+import yaml
+from utils.command_telemetry import CommandTelemetry
 from utils.env import ENV
 
 class ReportYamlHandler:
+    """
+    In-process report store for report.yaml.
+
+    The document is parsed once and kept in memory, every get/set works on the python dict,
+    and every mutation is flushed back to disk atomically (temp file + os.replace).
+    If another process rewrites report.yaml, the file stat changes and the document is reloaded.
+    Use transaction() to group several set_* calls into one write.
+    """
     def __init__(self, env):
         self.yaml_folder = env.TP_AUTO_REPORT_PATH
         self.yaml_file_path = os.path.join(self.yaml_folder, env.TP_AUTO_REPORT_YAML_FILE)
@@ -13,156 +27,172 @@ class ReportYamlHandler:
             with open(self.yaml_file_path, "w") as f:
                 f.write("\n")
 
+        self._lock = threading.RLock()
+        self._data = {}
+        self._file_stat = None
+        self._transaction_depth = 0
+        self._is_dirty = False
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Collect all set_* calls in this scope and write report.yaml once on exit.
+        If an exception is raised inside the scope, the changes of this scope are discarded,
+        a nested scope is rolled back to its start, the changes of the outer scope are kept.
+
+        with ReportYaml.transaction():
+            ReportYaml.set(".ENV.CP_URL", url)
+            ReportYaml.set(".ENV.CP_USER", user)
+        """
+        with self._lock:
+            # the outermost scope reloads report.yaml on rollback, a nested scope restores a snapshot
+            snapshot = copy.deepcopy(self._load()) if self._transaction_depth > 0 else None
+            is_dirty = self._is_dirty
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self._discard()
+                else:
+                    self._data = snapshot
+                    self._is_dirty = is_dirty
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0 and self._is_dirty:
+                self._flush()
+
     def set(self, key, value=None):
-        command = key if value is None else f'{key}={self.format_value(value)}'
-        print(f"Setting YAML key-value pair: {command}")
-        self._run_yq_command(["-i", command])
+        """Set the value of a dotted key, e.g. set(".ENV.CP_URL", "https://...")."""
+        print(f"Setting YAML key-value pair: {key}={self.format_value(value)}")
+        with self._lock:
+            data = self._load()
+            keys = self._split_key(key)
+            node = data
+            for k in keys[:-1]:
+                if not isinstance(node.get(k), dict):
+                    node[k] = {}
+                node = node[k]
+            node[keys[-1]] = value
+            self._flush()
 
     def get(self, key):
         """Retrieve the value of a given key from the YAML file."""
-        output = self._run_yq_command([key])
-        if not output or output.strip() == "null":
-            return None
-        return output.strip()
+        with self._lock:
+            node = self._load()
+            for k in self._split_key(key):
+                if not isinstance(node, dict) or node.get(k) is None:
+                    return None
+                node = node[k]
+            return self._to_text(node)
+
+    def get_report(self):
+        """Return a snapshot of the whole report document."""
+        with self._lock:
+            return copy.deepcopy(self._load())
+
+    def merge_file(self, yaml_file_path):
+        """
+        Merge another report.yaml (e.g. of one job) into this report, its values win,
+        dataPlane, capability and app lists are merged by name, so reports of different dataplanes are combined.
+        """
+        with self._lock:
+            print(f"Merging {yaml_file_path} into {self.yaml_file_path}")
+            self._merge_node(self._load(), self._read_yaml(yaml_file_path))
+            self._flush()
 
     def set_dataplane(self, dp_name):
-        if dp_name in self.get_dataplanes():
-            return
-        self.set(f"""
-            .dataPlane |= (
-                map(select(.name != "{dp_name}")) + [{{"name": "{dp_name}"}} | select(map(.name))]
-            )
-        """)
+        with self._lock:
+            if dp_name in self.get_dataplanes():
+                return
+            self._dataplanes(create=True).append({"name": dp_name})
+            self._flush()
 
     def remove_dataplane(self, dp_name):
-        if dp_name not in self.get_dataplanes():
-            return
-        self.set(f"""
-            .dataPlane |= map(select(.name != "{dp_name}"))
-        """)
+        with self._lock:
+            if dp_name not in self.get_dataplanes():
+                return
+            data = self._load()
+            data["dataPlane"] = [dp for dp in self._dataplanes() if dp.get("name") != dp_name]
+            self._flush()
 
     def get_dataplanes(self):
-        dps = self.get("(.dataPlane[].name)")
-        return dps.split("\n") if dps else []
+        return [str(dp.get("name")) for dp in self._dataplanes() if dp.get("name") is not None]
 
     def set_dataplane_info(self, dp_name, dp_key, dp_value):
-        dp_value = self.format_value(dp_value)
-        self.set(f"""
-            (.dataPlane[]
-                | select(.name == "{dp_name}")
-            ) += {{"{dp_key}": {dp_value}}}
-        """)
+        with self._lock:
+            dp = self._find_dataplane(dp_name)
+            if dp is None:
+                return
+            dp[dp_key] = dp_value
+            self._flush()
 
     # check if the dataplane exists
     def is_dataplane_created(self, dp_name):
         return dp_name in self.get_dataplanes()
 
     def get_dataplane_info(self, dp_name, dp_key):
-        return self.get(f"""
-            (.dataPlane[]
-               | select(.name == "{dp_name}").{dp_key}
-            )
-        """)
+        return self._get_field(self._find_dataplane(dp_name), dp_key)
 
     def set_capability(self, dp_name, capability):
-        if capability in self.get_capabilities(dp_name):
-            return
-        self.set(f"""
-            (.dataPlane[]
-                | select(.name == "{dp_name}")
-                | .capability
-            ) |= (map(select(.name != "{capability}")) + [{{"name": "{capability}"}}])
-        """)
+        with self._lock:
+            dp = self._find_dataplane(dp_name)
+            if dp is None or capability in self.get_capabilities(dp_name):
+                return
+            self._children(dp, "capability", create=True).append({"name": capability})
+            self._flush()
 
     def get_capabilities(self, dp_name):
-        capabilities = self.get(f"""
-            (.dataPlane[]
-                | select(.name == "{dp_name}")
-                | .capability[].name
-            )
-        """)
-        return capabilities.split("\n") if capabilities else []
+        return self._names(self._children(self._find_dataplane(dp_name), "capability"))
 
     # check if the capability of dataplane exists
     def is_capability_for_dataplane_created(self, dp_name, capability):
         return capability in self.get_capabilities(dp_name)
 
     def set_capability_info(self, dp_name, capability, capability_key, capability_value):
-        capability_value = self.format_value(capability_value)
-        self.set(f"""
-            (.dataPlane[]
-                | select(.name == "{dp_name}")
-                | .capability[]
-                | select(.name == "{capability}")
-            ) += {{"{capability_key}": {capability_value}}}
-        """)
+        with self._lock:
+            cap = self._find_capability(dp_name, capability)
+            if cap is None:
+                return
+            cap[capability_key] = capability_value
+            self._flush()
 
     def get_capability_info(self, dp_name, capability, capability_key):
-        return self.get(f"""
-            (.dataPlane[]
-                | select(.name == "{dp_name}")
-                | .capability[]
-                | select(.name == "{capability}").{capability_key}
-            )
-        """)
+        return self._get_field(self._find_capability(dp_name, capability), capability_key)
 
     def set_capability_app(self, dp_name, capability, app_name):
-        if app_name in self.get_capability_apps(dp_name, capability):
-            return
-        self.set(f"""
-           (.dataPlane[]
-               | select(.name == "{dp_name}")
-               | .capability[]
-               | select(.name == "{capability}").app
-           ) |= (map(select(.name != "{app_name}")) + [{{"name": "{app_name}"}}])
-        """)
+        with self._lock:
+            cap = self._find_capability(dp_name, capability)
+            if cap is None or app_name in self.get_capability_apps(dp_name, capability):
+                return
+            self._children(cap, "app", create=True).append({"name": app_name})
+            self._flush()
 
     def get_capability_apps(self, dp_name, capability):
-        apps = self.get(f"""
-           (.dataPlane[]
-               | select(.name == "{dp_name}")
-               | .capability[]
-               | select(.name == "{capability}").app[].name
-           )
-        """)
-        return apps.split("\n") if apps else []
+        return self._names(self._children(self._find_capability(dp_name, capability), "app"))
 
     def remove_capability_app(self, dp_name, capability, app_name):
-        if app_name not in self.get_capability_apps(dp_name, capability):
-            return
-        self.set(f"""
-            .dataPlane[] |= (
-                select(.name == "{dp_name}").capability[] |= (
-                    select(.name == "{capability}").app |= map(select(.name != "{app_name}"))
-                )
-            )
-        """)
+        with self._lock:
+            if app_name not in self.get_capability_apps(dp_name, capability):
+                return
+            cap = self._find_capability(dp_name, capability)
+            cap["app"] = [app for app in self._children(cap, "app") if app.get("name") != app_name]
+            self._flush()
 
     def is_app_created(self, dp_name, capability, app_name):
         return app_name in self.get_capability_apps(dp_name, capability)
 
     def set_capability_app_info(self, dp_name, capability, app_name, app_key, app_value):
-        app_value = self.format_value(app_value)
-        self.set(f"""
-            (.dataPlane[]
-                | select(.name == "{dp_name}")
-                | .capability[]
-                | select(.name == "{capability}")
-                | .app[]
-                | select(.name == "{app_name}")
-            ) |= . + {{"{app_key}": {app_value}}}
-        """)
+        with self._lock:
+            app = self._find_app(dp_name, capability, app_name)
+            if app is None:
+                return
+            app[app_key] = app_value
+            self._flush()
 
     def get_capability_app_info(self, dp_name, capability, app_name, app_key):
-        return self.get(f"""
-            (.dataPlane[]
-                | select(.name == "{dp_name}")
-                | .capability[]
-                | select(.name == "{capability}")
-                | .app[]
-                | select(.name == "{app_name}").{app_key}
-            )
-        """)
+        return self._get_field(self._find_app(dp_name, capability, app_name), app_key)
 
     @staticmethod
     def format_value(value):
@@ -182,30 +212,162 @@ class ReportYamlHandler:
         return value
 
     def sort_yaml_order(self):
-        self.set(f"""
-            {{"ENV": .ENV, "dataPlane": .dataPlane}}
-        """)
-        self.set(f"""
-            .dataPlane[] |= ({{
-                "name": .name, "storage": .storage, "o11yConfig": .o11yConfig,
-                "{ENV.TP_AUTO_INGRESS_CONTROLLER_FLOGO}": .{ENV.TP_AUTO_INGRESS_CONTROLLER_FLOGO},
-                "{ENV.TP_AUTO_INGRESS_CONTROLLER_BWCE}": .{ENV.TP_AUTO_INGRESS_CONTROLLER_BWCE},
-                "capability": .capability
-            }})
-        """)
-
-    def _run_yq_command(self, args):
-        """Run a yq command with the given arguments."""
+        with self._lock:
+            data = self._load()
+            sorted_data = {"ENV": data.get("ENV"), "dataPlane": data.get("dataPlane")}
+            dp_keys = [
+                "name", "storage", "o11yConfig",
+                ENV.TP_AUTO_INGRESS_CONTROLLER_FLOGO,
+                ENV.TP_AUTO_INGRESS_CONTROLLER_BWCE,
+                "capability",
+            ]
+            for dp in self._dataplanes():
+                ordered = {key: dp.get(key) for key in dp_keys}
+                dp.clear()
+                dp.update(ordered)
+            data.clear()
+            data.update(sorted_data)
+            self._flush()
+
+    def _load(self):
+        """Return the in-memory document, reload it only when report.yaml was changed on disk."""
+        with self._lock:
+            if self._is_dirty:
+                # keep pending transaction changes until they are flushed or discarded
+                return self._data
+            file_stat = self._get_file_stat()
+            if file_stat != self._file_stat:
+                self._data = self._read_file()
+                self._file_stat = file_stat
+            return self._data
+
+    def _flush(self):
+        """Write the in-memory document to report.yaml atomically."""
+        with self._lock:
+            if self._transaction_depth > 0:
+                self._is_dirty = True
+                return
+            self._is_dirty = False
+            start_time = time.time()
+            content = yaml.safe_dump(self._data, sort_keys=False, allow_unicode=True, default_flow_style=False)
+            fd, tmp_path = tempfile.mkstemp(prefix=".report-", suffix=".yaml", dir=self.yaml_folder)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(content)
+                os.replace(tmp_path, self.yaml_file_path)
+            except Exception as e:
+                print(f"Error writing report yaml file: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            self._file_stat = self._get_file_stat()
+            CommandTelemetry.record(f"write {self.yaml_file_path}", time.time() - start_time, 0, len(content), "report-yaml")
+
+    def _discard(self):
+        """Drop uncommitted changes, the next _load() reads report.yaml again."""
+        print("Discard uncommitted report yaml changes")
+        self._data = {}
+        self._file_stat = None
+        self._is_dirty = False
+
+    def _read_file(self):
+        return self._read_yaml(self.yaml_file_path)
+
+    @staticmethod
+    def _read_yaml(yaml_file_path):
         try:
-            result = subprocess.run(
-                ["yq", *args, self.yaml_file_path],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            print(f"Error running yq command: {e}")
+            with open(yaml_file_path, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f)
+        except FileNotFoundError:
+            return {}
+        except yaml.YAMLError as e:
+            print(f"Error parsing report yaml file: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _get_file_stat(self):
+        try:
+            stat = os.stat(self.yaml_file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _dataplanes(self, create=False):
+        data = self._load()
+        dps = data.get("dataPlane")
+        if not isinstance(dps, list):
+            dps = []
+            if create:
+                data["dataPlane"] = dps
+        return dps
+
+    def _find_dataplane(self, dp_name):
+        return self._find_by_name(self._dataplanes(), dp_name)
+
+    def _find_capability(self, dp_name, capability):
+        return self._find_by_name(self._children(self._find_dataplane(dp_name), "capability"), capability)
+
+    def _find_app(self, dp_name, capability, app_name):
+        return self._find_by_name(self._children(self._find_capability(dp_name, capability), "app"), app_name)
+
+    @staticmethod
+    def _children(node, key, create=False):
+        if node is None:
+            return []
+        children = node.get(key)
+        if not isinstance(children, list):
+            children = []
+            if create:
+                node[key] = children
+        return children
+
+    @staticmethod
+    def _merge_node(node, other):
+        for key, value in other.items():
+            current = node.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                ReportYamlHandler._merge_node(current, value)
+            elif ReportYamlHandler._is_named_list(current) and ReportYamlHandler._is_named_list(value):
+                for item in value:
+                    existing = ReportYamlHandler._find_by_name(current, item["name"])
+                    if existing is None:
+                        current.append(copy.deepcopy(item))
+                    else:
+                        ReportYamlHandler._merge_node(existing, item)
+            else:
+                node[key] = copy.deepcopy(value)
+
+    @staticmethod
+    def _is_named_list(value):
+        return isinstance(value, list) and all(isinstance(item, dict) and "name" in item for item in value)
+
+    @staticmethod
+    def _find_by_name(items, name):
+        for item in items:
+            if isinstance(item, dict) and item.get("name") == name:
+                return item
+        return None
+
+    @staticmethod
+    def _names(items):
+        return [str(item.get("name")) for item in items if isinstance(item, dict) and item.get("name") is not None]
+
+    def _get_field(self, node, key):
+        if node is None or node.get(key) is None:
             return None
+        return self._to_text(node[key])
+
+    @staticmethod
+    def _to_text(value):
+        """Keep the same string output as the yq command line, e.g. True -> "true"."""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (dict, list)):
+            return yaml.safe_dump(value, sort_keys=False, allow_unicode=True, default_flow_style=False).strip()
+        return str(value).strip()
+
+    @staticmethod
+    def _split_key(key):
+        return [k for k in key.strip().split(".") if k]
 
 ReportYaml = ReportYamlHandler(ENV)
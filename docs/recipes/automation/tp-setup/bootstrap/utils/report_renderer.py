@@ -0,0 +1,136 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+import html
+import json
+from utils.env import ENV
+
+class ReportRenderer:
+    """
+    Render the Data Plane, Capability, App section of report.yaml.
+
+    The report tree is walked once in __init__, then the same summary is emitted as text, JSON or HTML.
+    """
+    CAPABILITY_FIELDS = [
+        ("provisionConnector", "Provision connector"),
+        ("appBuild", "Create App Build"),
+    ]
+    APP_FIELDS = [
+        ("status", "Status"),
+        ("endpointPublic", "Set endpoint to Public"),
+        ("enableTrace", "Enabled trace"),
+        ("testedEndpoint", "Tested Endpoint"),
+    ]
+
+    def __init__(self, report_tree):
+        self.dataplanes = self.collect(report_tree or {})
+
+    @staticmethod
+    def get_dataplane_fields():
+        return [
+            ("o11yConfig", "DataPlane O11y Configured", "true"),
+            ("o11yWidget", "Observability Widget", "true"),
+            ("storage", "DataPlane storage", ENV.TP_AUTO_STORAGE_CLASS),
+            (ENV.TP_AUTO_INGRESS_CONTROLLER_BWCE, "DataPlane ingress", ENV.TP_AUTO_INGRESS_CONTROLLER_BWCE),
+            (ENV.TP_AUTO_INGRESS_CONTROLLER_FLOGO, "DataPlane ingress", ENV.TP_AUTO_INGRESS_CONTROLLER_FLOGO),
+            (ENV.TP_AUTO_INGRESS_CONTROLLER_TIBCOHUB, "DataPlane ingress", ENV.TP_AUTO_INGRESS_CONTROLLER_TIBCOHUB),
+        ]
+
+    @staticmethod
+    def collect(report_tree):
+        """Walk dataplanes -> capabilities -> apps once and return a plain summary list."""
+        dataplane_fields = ReportRenderer.get_dataplane_fields()
+        dataplanes = []
+        for dp in ReportRenderer._items(report_tree.get("dataPlane")):
+            dp_summary = {"name": ReportRenderer._text(dp.get("name")), "fields": [], "capabilities": []}
+            for field_key, field_label, field_value in dataplane_fields:
+                if ReportRenderer._text(dp.get(field_key)) == "true":
+                    dp_summary["fields"].append({"label": field_label, "value": field_value})
+
+            for cap in ReportRenderer._items(dp.get("capability")):
+                cap_summary = {
+                    "name": ReportRenderer._text(cap.get("name")),
+                    "fields": ReportRenderer._collect_fields(cap, ReportRenderer.CAPABILITY_FIELDS),
+                    "apps": [],
+                }
+                for app in ReportRenderer._items(cap.get("app")):
+                    cap_summary["apps"].append({
+                        "name": ReportRenderer._text(app.get("name")),
+                        "fields": ReportRenderer._collect_fields(app, ReportRenderer.APP_FIELDS),
+                    })
+                dp_summary["capabilities"].append(cap_summary)
+            dataplanes.append(dp_summary)
+        return dataplanes
+
+    def to_text(self, str_num=90, col_space=30):
+        if not self.dataplanes:
+            return ""
+        lines = [f"{'Data Plane, Capability, App': ^{str_num}}", "-" * str_num]
+        for dp in self.dataplanes:
+            lines.append(f"{'DataPlane Name':<{col_space}}{dp['name']}")
+            for field in dp["fields"]:
+                lines.append(f"{field['label']:<{col_space}}{field['value']}")
+
+            if dp["capabilities"]:
+                lines.append(f"{'Provisioned capabilities':<{col_space}}"
+                             f"{[cap['name'].upper() for cap in dp['capabilities']]}")
+
+            for cap in dp["capabilities"]:
+                if cap["apps"] or cap["fields"]:
+                    lines.append(f"{cap['name'].capitalize()}")
+                for field in cap["fields"]:
+                    lines.append(f"    {field['label']:<{col_space}}{field['value']}")
+                for app in cap["apps"]:
+                    lines.append(f"{'  App Name':<{col_space}}{app['name']}")
+                    for field in app["fields"]:
+                        lines.append(f"    {field['label']:<{col_space}}{field['value']}")
+        return "\n".join(lines)
+
+    def to_json(self, indent=2):
+        return json.dumps({"dataPlane": self.dataplanes}, indent=indent, ensure_ascii=False)
+
+    def to_html(self):
+        rows = []
+        for dp in self.dataplanes:
+            rows.append(self._html_row("DataPlane Name", dp["name"], "dp"))
+            for field in dp["fields"]:
+                rows.append(self._html_row(field["label"], field["value"]))
+            for cap in dp["capabilities"]:
+                rows.append(self._html_row("Capability", cap["name"].upper(), "capability"))
+                for field in cap["fields"]:
+                    rows.append(self._html_row(field["label"], field["value"]))
+                for app in cap["apps"]:
+                    rows.append(self._html_row("App Name", app["name"], "app"))
+                    for field in app["fields"]:
+                        rows.append(self._html_row(field["label"], field["value"]))
+        return (
+            "<table class=\"report\">\n"
+            "<caption>Data Plane, Capability, App</caption>\n"
+            + "\n".join(rows) +
+            "\n</table>\n"
+        )
+
+    @staticmethod
+    def _html_row(label, value, css_class=""):
+        class_attr = f" class=\"{css_class}\"" if css_class else ""
+        return f"<tr{class_attr}><th>{html.escape(str(label))}</th><td>{html.escape(str(value))}</td></tr>"
+
+    @staticmethod
+    def _collect_fields(node, fields):
+        result = []
+        for field_key, field_label in fields:
+            field_value = ReportRenderer._text(node.get(field_key))
+            if field_value:
+                result.append({"label": field_label, "value": field_value})
+        return result
+
+    @staticmethod
+    def _items(items):
+        return [item for item in items or [] if isinstance(item, dict)]
+
+    @staticmethod
+    def _text(value):
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return str(value).strip()
@@ -0,0 +1,41 @@
+#  Copyright (c) 2025. Cloud Software Group, Inc. All Rights Reserved. Confidential & Proprietary
+
+class RequestFilter:
+    """
+    Playwright route handler which drops the requests automation does not need, e.g. fonts, images, analytics beacons.
+
+    - a request whose url contains an allow pattern is always sent
+    - a request whose url contains a block pattern gets an empty 204 response, so beacons do not retry
+    - a request of a blocked resource type is aborted, document, script, xhr and fetch requests are never blocked by type
+
+    Note: Playwright disables the browser http cache of a context which has a route.
+    """
+    ALWAYS_ALLOWED_RESOURCE_TYPES = ("document", "script", "xhr", "fetch", "websocket", "eventsource")
+
+    def __init__(self, block_resource_types=(), block_url_patterns=(), allow_url_patterns=()):
+        self.block_resource_types = set(block_resource_types) - set(RequestFilter.ALWAYS_ALLOWED_RESOURCE_TYPES)
+        self.block_url_patterns = tuple(block_url_patterns)
+        self.allow_url_patterns = tuple(allow_url_patterns)
+        self.blocked_count = 0
+
+    @staticmethod
+    def split_patterns(value):
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    def attach(self, context):
+        context.route("**/*", self.handle)
+        print(f"Request filter blocks resource types: {sorted(self.block_resource_types)}, url patterns: {list(self.block_url_patterns)}, allows: {list(self.allow_url_patterns)}")
+
+    def handle(self, route):
+        request = route.request
+        url = request.url
+        if any(pattern in url for pattern in self.allow_url_patterns):
+            route.continue_()
+        elif any(pattern in url for pattern in self.block_url_patterns):
+            self.blocked_count += 1
+            route.fulfill(status=204, body="")
+        elif request.resource_type in self.block_resource_types:
+            self.blocked_count += 1
+            route.abort()
+        else:
+            route.continue_()
@@ -2,7 +2,9 @@
 import inspect
 import os
 import subprocess
+import time
 from utils.color_logger import ColorLogger
+from utils.command_telemetry import CommandTelemetry
 from utils.env import ENV
 from utils.helper import Helper
 from utils.util import Util
@@ -59,7 +61,9 @@ class TibcopCliHandler:
         
         print(f"Running script:")
         print(command)
+        start_time = time.time()
         result = subprocess.run(command, shell=True,capture_output=True, text=True, env=env_vars)
+        CommandTelemetry.record(command, time.time() - start_time, result.returncode, len(result.stdout or ""))
         if result.returncode != 0:
             print(f"Command failed with return code {result.returncode}")
             if result.stderr:
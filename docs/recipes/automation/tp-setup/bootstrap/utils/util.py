@@ -4,84 +4,138 @@ import json
 import os
 import sys
 import re
+import threading
 
 import pytz
 import html
+import http.client
 import time
+import urllib.parse
 import urllib.request
 from urllib.error import URLError, HTTPError
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from datetime import datetime
 from utils.color_logger import ColorLogger
 from utils.env import ENV
 from utils.helper import Helper
+from utils.artifact_capture import ArtifactCapture
+from utils.browser_server import BrowserServer
+from utils.cluster_discovery import ClusterDiscovery
+from utils.dns_resolver import DnsResolver
+from utils.page_wait import PageWait
 from utils.report import ReportYaml
+from utils.report_renderer import ReportRenderer
+from utils.request_filter import RequestFilter
 from playwright.sync_api import ViewportSize
 
 class Util:
     _page = None
+    _playwright = None
     _browser = None
     _context = None
     _run_start_time = None
-    _is_trace = False
+    _capture = None
+    # the BrowserSession of the current worker thread, see utils/browser_session.py
+    _session_local = threading.local()
+    _request_filter = None
 
     @staticmethod
     def get_dns_ip():
-        awk_script = '/^Name:/ {getline; if ($1=="Address:") print $2}'
-        result = Helper.get_command_output(f"nslookup *.{ENV.TP_AUTO_CP_DNS_DOMAIN} | awk '{awk_script}'", True)
+        ips = DnsResolver.resolve_wildcard(ENV.TP_AUTO_CP_DNS_DOMAIN)
         # Only return the first IP address if multiple are found
-        return result.strip().split('\n')[0] if result else ""
+        return ips[0] if ips else ""
+
+    @staticmethod
+    def get_host_ip(host):
+        """The IP address the browser host-resolver rule maps host to, empty string for hosts outside the CP DNS domain."""
+        if host and host.endswith(f".{ENV.TP_AUTO_CP_DNS_DOMAIN}"):
+            return Util.get_dns_ip()
+        return ""
 
     @staticmethod
     def browser_launch(is_headless=ENV.IS_HEADLESS):
         if Util._browser is None:
-            dns_ip = Util.get_dns_ip()
-            # PCP-15474: Fix browser launch failure due to --single-process issue in windows VDI environment
-            args = [
-            ]
-            if dns_ip:
-                args.append(f"--host-resolver-rules=MAP *.{ENV.TP_AUTO_CP_DNS_DOMAIN} {dns_ip}")
             Util._run_start_time = time.time()
-            playwright = sync_playwright().start()
-            Util._browser = playwright.chromium.launch(
-                headless=is_headless,
-                args=args
-            )
-            ColorLogger.success("Browser Launched Successfully.")
+            Util._playwright = sync_playwright().start()
+            Util._browser = Util.launch_browser(Util._playwright, is_headless)
 
         videos_dir = os.path.join(
             ENV.TP_AUTO_REPORT_PATH,
             str(ENV.RETRY_TIME_FOLDER)
         )
-        print(f"Record video to {videos_dir}")
-        Util._context = Util._browser.new_context(
+        Util._context, Util._capture, Util._request_filter = Util.new_context(Util._browser, videos_dir)
+        # the first trace step is named after the running case
+        Util._capture.start(Util._context, os.path.splitext(os.path.basename(sys.argv[0]))[0])
+        Util._page = Util._context.new_page()
+        PageWait.track_network(Util._page)
+        return Util._page
+
+    @staticmethod
+    def launch_browser(playwright, is_headless=ENV.IS_HEADLESS):
+        dns_ip = Util.get_dns_ip()
+        # PCP-15474: Fix browser launch failure due to --single-process issue in windows VDI environment
+        args = [
+        ]
+        if dns_ip:
+            args.append(f"--host-resolver-rules=MAP *.{ENV.TP_AUTO_CP_DNS_DOMAIN} {dns_ip}")
+        # attach to the long-lived browser server, only a new context is opened for this run
+        endpoint = BrowserServer.get_endpoint(args, is_headless) if ENV.TP_AUTO_BROWSER_SERVER else ""
+        if endpoint:
+            browser = playwright.chromium.connect_over_cdp(endpoint)
+            ColorLogger.success(f"Browser Connected Successfully to browser server {endpoint}.")
+        else:
+            browser = playwright.chromium.launch(
+                headless=is_headless,
+                args=args
+            )
+            ColorLogger.success("Browser Launched Successfully.")
+        return browser
+
+    @staticmethod
+    def new_context(browser, output_dir):
+        """Open a browser context with the video, trace and request filter settings, trace is started by the caller."""
+        capture = ArtifactCapture(output_dir, ENV.TP_AUTO_CAPTURE_POLICY, ENV.TP_AUTO_REPORT_TRACE, ENV.TP_AUTO_VIDEO_SIZE)
+        if capture.video_dir:
+            print(f"Record video to {capture.video_dir}, capture policy: {capture.policy}")
+        context = browser.new_context(
             viewport=ViewportSize(width=2000, height=1080),
-            record_video_size=ViewportSize(width=2000, height=1080),
-            record_video_dir=videos_dir,
             ignore_https_errors=True,
-            accept_downloads=True
+            accept_downloads=True,
+            **capture.get_context_options()
         )
-        if ENV.TP_AUTO_REPORT_TRACE:
-            Util._is_trace = True
-            ColorLogger.info("Start tracing with screenshots, snapshots, and sources.")
-            Util._context.tracing.start(screenshots=True, snapshots=True, sources=True)
-        Util._page = Util._context.new_page()
-        return Util._page
+        request_filter = None
+        if ENV.TP_AUTO_REQUEST_FILTER:
+            request_filter = RequestFilter(
+                RequestFilter.split_patterns(ENV.TP_AUTO_REQUEST_FILTER_BLOCK_TYPES),
+                RequestFilter.split_patterns(ENV.TP_AUTO_REQUEST_FILTER_BLOCK_URLS),
+                RequestFilter.split_patterns(ENV.TP_AUTO_REQUEST_FILTER_ALLOW_URLS)
+            )
+            request_filter.attach(context)
+        return context, capture, request_filter
 
     @staticmethod
     def browser_close():
         if Util._context is not None:
             Util.stop_tracing()
             Util._context.close()
-            if Util._page and Util._page.video:
+            Util._context = None
+            if Util._capture.policy == ArtifactCapture.POLICY_ALWAYS and Util._page and Util._page.video:
                 video_path = Util._page.video.path()
                 ColorLogger.info(f"Video file saved to: {video_path}")
+            Util._capture.finish()
+            if Util._request_filter is not None:
+                print(f"Request filter blocked {Util._request_filter.blocked_count} requests.")
 
         if Util._browser is not None:
             Util._browser.close()
             Util._browser = None
             ColorLogger.success("Browser Closed Successfully.")
 
+        # stop the Playwright driver and its event loop, a case worker runs the next job in the same process
+        if Util._playwright is not None:
+            Util._playwright.stop()
+            Util._playwright = None
+
         if Util._run_start_time is not None:
             chicago_time = datetime.now(pytz.timezone(ENV.TIME_ZONE)).strftime('%m/%d/%Y %H:%M:%S')
             total_seconds = time.time() - Util._run_start_time
@@ -92,14 +146,21 @@ class Util:
 
     @staticmethod
     def stop_tracing():
-        if Util._context is not None and Util._is_trace and ENV.TP_AUTO_REPORT_TRACE:
-            trace_path = os.path.join(
-                ENV.TP_AUTO_REPORT_PATH,
-                str(ENV.RETRY_TIME_FOLDER),
-                "trace.zip"
-            )
-            Util._context.tracing.stop(path=trace_path)
-            ColorLogger.info(f"Save tracing to file: {trace_path}")
+        if Util._capture is not None:
+            Util._capture.stop()
+
+    @staticmethod
+    def start_step(step_name):
+        """Mark the start of a step, tracing is split into one chunk per step."""
+        print(f"Start step: {step_name}")
+        capture = Util.get_capture()
+        if capture is not None:
+            capture.start_step(step_name)
+
+    @staticmethod
+    def get_capture():
+        session = getattr(Util._session_local, "session", None)
+        return session.capture if session is not None else Util._capture
 
     @staticmethod
     def screenshot_page(page, filename):
@@ -190,7 +251,18 @@ class Util:
     def exit_error(message, page=None, filename=""):
         if page is not None:
             Util.screenshot_page(page, f"error-{filename}")
-        Util.stop_tracing()
+        if getattr(Util._session_local, "session", None) is not None:
+            # in a worker thread, only end the worker, its session is closed by BrowserSessionManager
+            Util._session_local.session.capture.mark_failed()
+            ColorLogger.error(f"Exiting session {Util._session_local.session.name}: {message}")
+            sys.exit(1)
+        if Util._capture is not None:
+            Util._capture.mark_failed()
+        try:
+            # close the context, so the trace of the failed step and the video are saved
+            Util.browser_close()
+        except Exception as e:
+            ColorLogger.warning(f"Failed to close browser: {e}")
         ColorLogger.error(f"Exiting program: {message}")
         sys.exit(1)
 
@@ -208,30 +280,32 @@ class Util:
 
     @staticmethod
     def set_cp_env():
-        ReportYaml.set(".ENV.CP_MAIL_URL", ENV.TP_AUTO_MAIL_URL)
-        ReportYaml.set(".ENV.CP_ADMIN_URL", ENV.TP_AUTO_ADMIN_URL)
-        ReportYaml.set(".ENV.CP_ADMIN_USER", ENV.CP_ADMIN_EMAIL)
-        ReportYaml.set(".ENV.CP_ADMIN_PASSWORD", ENV.CP_ADMIN_PASSWORD)
-        ReportYaml.set(".ENV.CP_URL", ENV.TP_AUTO_LOGIN_URL)
-        ReportYaml.set(".ENV.CP_USER", ENV.DP_USER_EMAIL)
-        ReportYaml.set(".ENV.CP_PASSWORD", ENV.DP_USER_PASSWORD)
-        ReportYaml.set(".ENV.ELASTIC_URL", ENV.TP_AUTO_ELASTIC_URL)
-        ReportYaml.set(".ENV.KIBANA_URL", ENV.TP_AUTO_KIBANA_URL)
-        ReportYaml.set(".ENV.ELASTIC_USER", ENV.TP_AUTO_ELASTIC_USER)
-        ReportYaml.set(".ENV.ELASTIC_PASSWORD", ENV.TP_AUTO_ELASTIC_PASSWORD)
-        ReportYaml.set(".ENV.PROMETHEUS_URL", ENV.TP_AUTO_PROMETHEUS_URL)
-        ReportYaml.set(".ENV.PROMETHEUS_USER", ENV.TP_AUTO_PROMETHEUS_USER)
-        ReportYaml.set(".ENV.PROMETHEUS_PASSWORD", ENV.TP_AUTO_PROMETHEUS_PASSWORD)
+        with ReportYaml.transaction():
+            ReportYaml.set(".ENV.CP_MAIL_URL", ENV.TP_AUTO_MAIL_URL)
+            ReportYaml.set(".ENV.CP_ADMIN_URL", ENV.TP_AUTO_ADMIN_URL)
+            ReportYaml.set(".ENV.CP_ADMIN_USER", ENV.CP_ADMIN_EMAIL)
+            ReportYaml.set(".ENV.CP_ADMIN_PASSWORD", ENV.CP_ADMIN_PASSWORD)
+            ReportYaml.set(".ENV.CP_URL", ENV.TP_AUTO_LOGIN_URL)
+            ReportYaml.set(".ENV.CP_USER", ENV.DP_USER_EMAIL)
+            ReportYaml.set(".ENV.CP_PASSWORD", ENV.DP_USER_PASSWORD)
+            ReportYaml.set(".ENV.ELASTIC_URL", ENV.TP_AUTO_ELASTIC_URL)
+            ReportYaml.set(".ENV.KIBANA_URL", ENV.TP_AUTO_KIBANA_URL)
+            ReportYaml.set(".ENV.ELASTIC_USER", ENV.TP_AUTO_ELASTIC_USER)
+            ReportYaml.set(".ENV.ELASTIC_PASSWORD", ENV.TP_AUTO_ELASTIC_PASSWORD)
+            ReportYaml.set(".ENV.PROMETHEUS_URL", ENV.TP_AUTO_PROMETHEUS_URL)
+            ReportYaml.set(".ENV.PROMETHEUS_USER", ENV.TP_AUTO_PROMETHEUS_USER)
+            ReportYaml.set(".ENV.PROMETHEUS_PASSWORD", ENV.TP_AUTO_PROMETHEUS_PASSWORD)
         # ReportYaml.sort_yaml_order()
 
     @staticmethod
     def print_cp_info():
         str_num = 90
         space_nums = 45
+        ClusterDiscovery.discover()
         print("=" * str_num)
         print(f"{'Control Plane information': ^{str_num}}")
         print("Is cluster accessible:", "√" if ENV.IS_CLUSTER_ACCESSIBLE else "X")
-        node_name = Helper.get_node_name()
+        node_name = ClusterDiscovery.get("node_name")
         ip = Helper.get_node_ip()
         if ENV.TP_AUTO_KUBECONFIG:
             # get ip from KUBECONFIG file name
@@ -244,13 +318,13 @@ class Util:
             print("{:<{}} {}".format(node_name, space_nums, ip))
             print("-" * str_num)
 
-        cp_platform_bootstrap_version = Helper.get_cp_platform_bootstrap_version()
+        cp_platform_bootstrap_version = ClusterDiscovery.get("cp_platform_bootstrap_version")
         if cp_platform_bootstrap_version:
             print("platform-bootstrap: ", cp_platform_bootstrap_version)
 
-        cp_platform_base_version = Helper.get_cp_platform_base_version()
+        cp_platform_base_version = ClusterDiscovery.get("cp_platform_base_version")
         if cp_platform_base_version:
-            print("platform-base: ", cp_platform_bootstrap_version)
+            print("platform-base: ", cp_platform_base_version)
 
         all_tibco_cp_version = Helper.get_all_tibco_cp_version()
         if all_tibco_cp_version:
@@ -318,67 +392,21 @@ class Util:
                 print(f"{'User Password:':<{col_space}}{ENV.TP_AUTO_PROMETHEUS_PASSWORD}")
             print("-" * str_num)
 
-            dataplane_fields = [
-                ("o11yConfig", "DataPlane O11y Configured", "true"),
-                ("o11yWidget", "Observability Widget", "true"),
-                ("storage", "DataPlane storage", ENV.TP_AUTO_STORAGE_CLASS),
-                (ENV.TP_AUTO_INGRESS_CONTROLLER_BWCE, "DataPlane ingress", ENV.TP_AUTO_INGRESS_CONTROLLER_BWCE),
-                (ENV.TP_AUTO_INGRESS_CONTROLLER_FLOGO, "DataPlane ingress", ENV.TP_AUTO_INGRESS_CONTROLLER_FLOGO),
-                (ENV.TP_AUTO_INGRESS_CONTROLLER_TIBCOHUB, "DataPlane ingress", ENV.TP_AUTO_INGRESS_CONTROLLER_TIBCOHUB),
-            ]
-            capability_fields = [
-                ("provisionConnector", "Provision connector"),
-                ("appBuild", "Create App Build"),
-            ]
-            app_fields = [
-                ("status", "Status"),
-                ("endpointPublic", "Set endpoint to Public"),
-                ("enableTrace", "Enabled trace"),
-                ("testedEndpoint", "Tested Endpoint"),
-            ]
-            dp_names = ReportYaml.get_dataplanes()
-            if len(dp_names) > 0:
-                print(f"{'Data Plane, Capability, App': ^{str_num}}")
-                print("-" * str_num)
-                for dp_name in dp_names:
-                    print(f"{'DataPlane Name':<{col_space}}{dp_name}")
-
-                    for field_key, field_label, field_value in dataplane_fields:
-                        if ReportYaml.get_dataplane_info(dp_name, field_key) == "true":
-                            print(f"{field_label:<{col_space}}{field_value}")
-
-                    dp_capabilities = ReportYaml.get_capabilities(dp_name)
-                    if len(dp_capabilities) > 0:
-                        print(f"{'Provisioned capabilities':<{col_space}}"
-                              f"{[cap.upper() for cap in dp_capabilities]}"
-                              )
-
-                    for dp_capability in dp_capabilities:
-                        app_names = ReportYaml.get_capability_apps(dp_name, dp_capability)
-                        provision_connector = ReportYaml.get_capability_info(dp_name, dp_capability, "provisionConnector")
-                        app_build = ReportYaml.get_capability_info(dp_name, dp_capability, "appBuild")
-                        if len(app_names) > 0 or provision_connector or app_build:
-                            print(f"{dp_capability.capitalize()}")
-
-                        for field_key, field_label in capability_fields:
-                            field_value = ReportYaml.get_capability_info(dp_name, dp_capability, field_key)
-                            if field_value:
-                                print(f"    {field_label:<{col_space}}{field_value}")
-
-                        for app_name in app_names:
-                            print(f"{'  App Name':<{col_space}}{app_name}")
-                            for field_key, field_label in app_fields:
-                                field_value = ReportYaml.get_capability_app_info(dp_name, dp_capability, app_name, field_key)
-                                if field_value:
-                                    print(f"    {field_label:<{col_space}}{field_value}")
+            dp_report = ReportRenderer(ReportYaml.get_report()).to_text(str_num, col_space)
+            if dp_report:
+                print(dp_report)
         print("=" * str_num)
 
     @staticmethod
     def is_url_accessible(url, timeout=5):
+        # check CP urls with the same address as the browser
+        host_ip = Util.get_host_ip(urllib.parse.urlparse(url).hostname)
         try:
+            if host_ip:
+                return DnsResolver.get_url_status(url, host_ip, timeout) < 400
             with urllib.request.urlopen(url, timeout=timeout) as response:
                 return response.status < 400
-        except (HTTPError, URLError):
+        except (HTTPError, URLError, OSError, http.client.HTTPException):
             return False
 
     @staticmethod
@@ -401,8 +429,8 @@ class Util:
     def check_dom_visibility(page, dom_selector, interval=10, max_wait=180, is_refresh=False):
         total_attempts = max_wait // interval
         timeout = interval if interval < 5 else 5
-        print(f"Check dom visibility, wait {timeout} seconds first, then loop to check for {max_wait} seconds.")
-        page.wait_for_timeout(timeout * 1000)
+        print(f"Check dom visibility, wait up to {timeout} seconds first, then loop to check for {max_wait} seconds.")
+        PageWait.visible(dom_selector, timeout)
         for attempt in range(total_attempts):
             if dom_selector.is_visible():
                 print("Dom is now visible.")
@@ -413,8 +441,52 @@ class Util:
                 if is_refresh:
                     print(f"Page reload {attempt + 1}")
                     Util.refresh_page(page)
-                print(f"Dom not visible. Waiting for {interval} seconds before retrying...")
-                page.wait_for_timeout(interval * 1000)
+                print(f"Dom not visible. Waiting up to {interval} seconds before retrying...")
+                PageWait.visible(dom_selector, interval)
+
+        ColorLogger.warning(f"Dom is still not visible after waiting for {max_wait} seconds.")
+        return False
+
+    @staticmethod
+    def wait_for_dom(page, dom_selector, max_wait=180, reload_after=0, response_predicate=None):
+        """
+        Wait until dom_selector is visible, return True as soon as it is, or False after max_wait seconds.
+        The DOM change is watched by Playwright, there is no sleep between checks.
+
+        reload_after: reload the page as a last resort if the dom is still not visible after this many seconds,
+        0 means never reload.
+        response_predicate: only reload if the page did not receive a response for which response_predicate(response)
+        is True in the last reload_after seconds, the page is polling the status by itself then, e.g. PageWait.is_api_response.
+        """
+        print(f"Wait for dom visibility up to {max_wait} seconds" + (f", reload after {reload_after} seconds." if reload_after else "."))
+        deadline = time.time() + max_wait
+        responses = []
+
+        def on_response(response):
+            if response_predicate(response):
+                responses.append(response.url)
+
+        if response_predicate is not None:
+            page.on("response", on_response)
+        try:
+            while (remaining := deadline - time.time()) > 0:
+                wait_seconds = min(reload_after, remaining) if reload_after > 0 else remaining
+                try:
+                    dom_selector.wait_for(state="visible", timeout=wait_seconds * 1000)
+                    print("Dom is now visible.")
+                    return True
+                except PlaywrightTimeoutError:
+                    pass
+                if reload_after <= 0 or deadline - time.time() <= 0:
+                    continue
+                if responses:
+                    print(f"Page received {len(responses)} status responses in {reload_after} seconds, keep waiting without reload.")
+                    responses.clear()
+                    continue
+                Util.refresh_page(page)
+        finally:
+            if response_predicate is not None:
+                page.remove_listener("response", on_response)
 
         ColorLogger.warning(f"Dom is still not visible after waiting for {max_wait} seconds.")
         return False
@@ -442,7 +514,7 @@ class Util:
             waiting_selector.wait_for(state="visible")
             if message:
                 print(message)
-            page.wait_for_timeout(3000)
+            PageWait.visible(retry_selector, 3)
             current_condition = retry_selector.is_visible()
 
         return current_condition